@@ -3,6 +3,7 @@ from datetime import datetime
 from typing import Optional, Type, Union
 from .extensions import db, login_manager, migrate, csrf, babel
 from .config import Config
+from .cli import register_commands
 
 
 def create_app(
@@ -32,6 +33,7 @@ def create_app(
     register_extensions(app)
     register_blueprints(app)
     register_context_processors(app)
+    register_commands(app)
 
     return app
 
@@ -40,6 +42,18 @@ def register_extensions(app: Flask) -> None:
     db.init_app(app)
     migrate.init_app(app, db)
     csrf.init_app(app)
+
+    from .utils.session_store import init_session_store
+    init_session_store(app)
+
+    from .utils.catalog import catalog_loader
+    catalog_loader.init_app(app)
+
+    from .utils.irradiance import tmy_store
+    tmy_store.init_app(app)
+
+    from .utils.write_behind import energy_write_queue
+    energy_write_queue.init_app(app)
     
     from .models import User
 
@@ -84,6 +98,7 @@ def register_blueprints(app: Flask) -> None:
     from .dashboard.routes import dashboard_bp
     from .tracker.routes import tracker_bp
     from .finance.routes import finance_bp
+    from .api.routes import api_bp
 
     app.register_blueprint(main_bp)
     app.register_blueprint(auth_bp)
@@ -94,6 +109,7 @@ def register_blueprints(app: Flask) -> None:
     app.register_blueprint(dashboard_bp)
     app.register_blueprint(tracker_bp)
     app.register_blueprint(finance_bp)
+    app.register_blueprint(api_bp)
 
 
 def register_context_processors(app: Flask) -> None:
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+import click
+from flask import Blueprint, current_app, g, jsonify, request
+
+from ..extensions import csrf, db
+from ..models import ApiToken, User
+from ..utils.telemetry import authenticate_token, ingest_readings, issue_api_token
+
+api_bp = Blueprint("api", __name__, url_prefix="/api/v1")
+csrf.exempt(api_bp)
+
+
+def _error(message: str, status: int):
+    return jsonify({"error": message}), status
+
+
+@api_bp.before_request
+def require_token():
+    header = request.headers.get("Authorization", "")
+    scheme, _, token = header.partition(" ")
+    api_token = authenticate_token(token.strip() if scheme.lower() == "bearer" else None)
+    if api_token is None:
+        response, status = _error("A valid bearer token is required.", 401)
+        response.headers["WWW-Authenticate"] = 'Bearer realm="solaris"'
+        return response, status
+    g.api_token = api_token
+
+
+@api_bp.route("/telemetry", methods=["POST"])
+def ingest_telemetry():
+    """Accept ``{"readings": [...]}`` from a data logger or inverter.
+
+    Each reading carries an ``idempotency_key`` so retries are harmless.
+    """
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict) or not isinstance(payload.get("readings"), list):
+        return _error('Body must be a JSON object with a "readings" list.', 400)
+
+    readings = payload["readings"]
+    max_batch = current_app.config.get("TELEMETRY_MAX_BATCH", 5000)
+    if not readings:
+        return _error("No readings supplied.", 400)
+    if len(readings) > max_batch:
+        return _error(f"At most {max_batch} readings are accepted per request.", 413)
+
+    api_token: ApiToken = g.api_token
+    api_token.last_used_at = datetime.utcnow()
+    result = ingest_readings(
+        api_token.user_id,
+        readings,
+        default_entry_type=str(payload.get("entry_type") or "generation"),
+    )
+    status = 422 if len(result["rejected"]) == len(readings) else 200
+    return jsonify(result), status
+
+
+@api_bp.cli.command("create-token")
+@click.option("--email", required=True, help="Account the token writes readings for.")
+@click.option("--name", required=True, help="Label for the site or device.")
+def create_token(email, name):
+    """Issue an API token. The token is only shown once."""
+    user = User.query.filter_by(email=email.strip().lower()).first()
+    if user is None:
+        raise click.ClickException(f"No user with email {email}.")
+    record, token = issue_api_token(user.id, name)
+    db.session.commit()
+    click.echo(f"Token #{record.id} ({name}) for {user.email}:")
+    click.echo(token)
+
+
+@api_bp.cli.command("revoke-token")
+@click.argument("token_id", type=int)
+def revoke_token(token_id):
+    """Revoke an API token by id."""
+    record = db.session.get(ApiToken, token_id)
+    if record is None:
+        raise click.ClickException(f"No API token with id {token_id}.")
+    if record.revoked_at is None:
+        record.revoked_at = datetime.utcnow()
+        db.session.commit()
+    click.echo(f"Token #{record.id} ({record.name}) revoked.")
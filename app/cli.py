@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import click
+from flask import Flask
+
+
+def register_commands(app: Flask) -> None:
+    @app.cli.command("explain-routes")
+    @click.option("--user-id", type=int, default=1, show_default=True)
+    def explain_routes(user_id: int) -> None:
+        """EXPLAIN each per-user list query and fail on full table scans."""
+        from .utils.query_plans import explain_route_queries
+
+        failures = 0
+        for report in explain_route_queries(user_id):
+            status = "index" if report["uses_index"] else "FULL SCAN"
+            if report["sorts_in_memory"]:
+                status += " + in-memory sort"
+            click.echo(f"[{status}] {report['endpoint']}")
+            for line in report["plan"]:
+                click.echo(f"    {line}")
+            if not report["uses_index"]:
+                failures += 1
+
+        if failures:
+            click.echo(f"{failures} route quer{'y' if failures == 1 else 'ies'} fall back to a full table scan.")
+            raise SystemExit(1)
+
+    @app.cli.command("purge-sessions")
+    def purge_sessions() -> None:
+        """Delete expired rows from the server-side session store."""
+        store = getattr(app.session_interface, "store", None)
+        if store is None:
+            click.echo("Sessions are cookie-based; nothing to purge.")
+            return
+        click.echo(f"Purged {store.purge_expired()} expired session(s).")
+
+    @app.cli.command("import-tmy")
+    @click.argument("csv_files", nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False))
+    @click.option("--output", "-o", type=click.Path(file_okay=False), default=None, help="Dataset directory (default: TMY_DIR).")
+    @click.option("--step", type=float, default=0.1, show_default=True, help="Lookup grid spacing in degrees.")
+    @click.option("--max-distance-km", type=float, default=75.0, show_default=True)
+    def import_tmy(csv_files, output, step: float, max_distance_km: float) -> None:
+        """Convert PVGIS/NSRDB TMY CSV files into the memory-mapped irradiance dataset."""
+        from .utils.irradiance import TmyFormatError, read_tmy_csv, write_tmy_dataset
+
+        stations = []
+        for path in csv_files:
+            try:
+                stations.append(read_tmy_csv(path))
+            except TmyFormatError as exc:
+                raise click.ClickException(str(exc))
+        summary = write_tmy_dataset(
+            stations, output or app.config["TMY_DIR"], step=step, max_distance_km=max_distance_km
+        )
+        click.echo(f"Wrote {summary['cells']} cells covering {summary['grid_nodes']} grid nodes.")
+        click.echo("Restart the app workers to load the new dataset.")
+
+    @app.cli.command("estimate-batch")
+    @click.argument("input_file", type=click.File("rb"))
+    @click.option("--output", "-o", type=click.File("w"), default="-", help="Output CSV (default: stdout).")
+    @click.option("--workers", type=int, default=None, help="Worker processes (default: BULK_ESTIMATE_WORKERS).")
+    @click.option("--chunk-size", type=int, default=None, help="Rows per worker task.")
+    def estimate_batch(input_file, output, workers, chunk_size) -> None:
+        """Estimate a CSV of prospective rooftops and write the results as CSV."""
+        from .utils.bulk_estimates import BULK_CHUNK_SIZE, iter_bulk_estimates
+
+        if workers is None:
+            workers = app.config.get("BULK_ESTIMATE_WORKERS")
+        for chunk in iter_bulk_estimates(input_file, chunk_size=chunk_size or BULK_CHUNK_SIZE, workers=workers):
+            output.write(chunk)
+
+    @app.cli.command("benchmark-scoring")
+    @click.option("--schemes", "scheme_count", type=int, default=1000, show_default=True)
+    @click.option("--repeat", type=int, default=20, show_default=True)
+    def benchmark_scoring(scheme_count: int, repeat: int) -> None:
+        """Time batch scheme scoring against the per-scheme loop."""
+        import random
+        import time
+
+        from .utils.ml_scoring import calculate_subsidy_match_score, calculate_subsidy_match_scores
+        from .utils.catalog import current_catalog
+
+        rng = random.Random(42)
+        schemes = [rng.choice(current_catalog().scheme_index.schemes) for _ in range(scheme_count)]
+        ease = [0.7 if scheme.application_url else 0.5 for scheme in schemes]
+        profile = dict(
+            user_system_size_kw=4.2,
+            user_annual_consumption_kwh=4_800.0,
+            user_state="maharashtra",
+            user_consumer_segment="residential",
+            gross_cost_inr=273_000.0,
+            subsidy_amount_inr=78_000.0,
+        )
+
+        def loop():
+            return [
+                calculate_subsidy_match_score(
+                    scheme={
+                        "match_score": scheme.match_score,
+                        "benefit": scheme.benefit,
+                        "states": scheme.states,
+                        "coverage": scheme.coverage,
+                        "consumer_segments": scheme.consumer_segments,
+                    },
+                    ease_of_claim=scheme_ease,
+                    **profile,
+                )
+                for scheme, scheme_ease in zip(schemes, ease)
+            ]
+
+        def batch():
+            return calculate_subsidy_match_scores(schemes=schemes, ease_of_claim=ease, **profile)
+
+        for label, runner in (("per-scheme loop", loop), ("batch", batch)):
+            started = time.perf_counter()
+            for _ in range(repeat):
+                runner()
+            elapsed = (time.perf_counter() - started) / repeat
+            click.echo(f"{label:>16}: {elapsed * 1000:8.3f} ms per {scheme_count} schemes")
@@ -17,6 +17,18 @@ class Config:
     )
     MAX_CONTENT_LENGTH = 10 * 1024 * 1024  # 10 MB
     ENABLE_HTMX = False
+    CHART_MAX_POINTS = int(os.environ.get("SOLARIS_CHART_MAX_POINTS", 180))
+    CHART_DOWNSAMPLE_MODE = os.environ.get("SOLARIS_CHART_DOWNSAMPLE_MODE", "lttb")  # or "mean"
+    PANEL_UNDERPERFORMANCE_PERCENT = float(os.environ.get("SOLARIS_PANEL_UNDERPERFORMANCE_PERCENT", 15))
+    TELEMETRY_MAX_BATCH = int(os.environ.get("SOLARIS_TELEMETRY_MAX_BATCH", 5000))
+    BULK_ESTIMATE_WORKERS = int(os.environ.get("SOLARIS_BULK_ESTIMATE_WORKERS", os.cpu_count() or 1))  # estimate-batch CLI
+    ENERGY_WRITE_BEHIND = os.environ.get("SOLARIS_ENERGY_WRITE_BEHIND", "1") != "0"
+    ENERGY_WRITE_BATCH_SIZE = int(os.environ.get("SOLARIS_ENERGY_WRITE_BATCH_SIZE", 500))
+    ENERGY_WRITE_FLUSH_INTERVAL = float(os.environ.get("SOLARIS_ENERGY_WRITE_FLUSH_INTERVAL", 0.2))  # seconds
+    ENERGY_WRITE_WAIT_TIMEOUT = float(os.environ.get("SOLARIS_ENERGY_WRITE_WAIT_TIMEOUT", 5.0))  # seconds
+    CATALOG_DIR = os.environ.get("SOLARIS_CATALOG_DIR", str(BASE_DIR / "data" / "catalog"))
+    CATALOG_RELOAD_INTERVAL = float(os.environ.get("SOLARIS_CATALOG_RELOAD_INTERVAL", 2.0))  # seconds between mtime checks
+    TMY_DIR = os.environ.get("SOLARIS_TMY_DIR", str(BASE_DIR / "data" / "tmy"))
     BABEL_DEFAULT_LOCALE = "en"
     BABEL_DEFAULT_TIMEZONE = "UTC"
     GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY", "")
@@ -24,6 +36,8 @@ class Config:
     BABEL_TRANSLATION_DIRECTORIES = str(BASE_DIR / "translations")
     SESSION_PERMANENT = True
     PERMANENT_SESSION_LIFETIME = 86400  # 24 hours
+    SESSION_BACKEND = os.environ.get("SOLARIS_SESSION_BACKEND", "sqlite")  # "sqlite", "memory" or "cookie"
+    SESSION_SQLITE_PATH = os.environ.get("SOLARIS_SESSION_SQLITE_PATH")  # default: <instance_path>/sessions.db
     LANGUAGES = {
         "en": "English",
         "hi": "हिंदी",
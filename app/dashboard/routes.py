@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-from flask import Blueprint, render_template, redirect, url_for
+from flask import Blueprint, current_app, render_template, redirect, url_for
 from flask_login import current_user, login_required
 
-from ..utils.energy import build_energy_context
-from ..utils.projects import build_projects_context
+from ..utils.dashboard import load_dashboard_data
+from ..utils.downsample import downsample_series
 
 dashboard_bp = Blueprint("dashboard", __name__, url_prefix="/dashboard")
 
@@ -20,13 +20,8 @@ def require_journey():
 @dashboard_bp.route("/", methods=["GET"])
 @login_required
 def index():
-    projects_context = build_projects_context(current_user.id)
-    recent_projects = projects_context["projects"][:3]
-    projects_simulated = not projects_context["has_real_projects"]
-
-    energy_context = build_energy_context(current_user.id)
-    total_generation = energy_context["totals"]["generation"]
-    recent_energy = energy_context["logs"][:3]
+    dashboard_data = load_dashboard_data(current_user.id)
+    energy_context = dashboard_data["energy"]
 
     estimate_summary = {
         "system_kw": current_user.last_system_kw,
@@ -35,24 +30,34 @@ def index():
         "updated_at": current_user.last_estimate_updated_at,
     }
     estimate_stats = None
-    if estimate_summary["system_kw"]:
+    if estimate_summary["system_kw"] and current_user.last_lifetime_savings_inr is not None:
+        # Simulated once when the journey inputs last changed.
         estimate_stats = {
-            "monthly_savings": 8200,
-            "lifetime_savings": 152000,
-            "co2_offset": 1.8,
+            "monthly_savings": current_user.last_monthly_savings_inr,
+            "lifetime_savings": current_user.last_lifetime_savings_inr,
+            "npv": current_user.last_npv_inr,
+            "irr_percent": current_user.last_irr_percent,
+            "payback_years": current_user.last_payback_years,
+            "co2_offset": current_user.last_co2_tonnes_per_year,
         }
 
     return render_template(
         "dashboard/index.html",
         title="Dashboard",
-        recent_projects=recent_projects,
-        projects_simulated=projects_simulated,
-        total_generation=total_generation,
-        recent_energy=recent_energy,
+        recent_projects=dashboard_data["recent_projects"],
+        project_count=dashboard_data["project_count"],
+        projects_simulated=dashboard_data["projects_simulated"],
+        total_generation=energy_context["totals"]["generation"],
+        recent_energy=dashboard_data["recent_energy"],
         estimate_summary=estimate_summary,
         estimate_stats=estimate_stats,
         show_tracker_cta=True,
-        energy_chart_series=energy_context["daily_series"],
+        energy_chart_series=downsample_series(
+            energy_context["daily_series"],
+            current_app.config["CHART_MAX_POINTS"],
+            mode=current_app.config["CHART_DOWNSAMPLE_MODE"],
+        ),
+        energy_day_count=len(energy_context["daily_series"]),
         energy_insights=energy_context["insights"],
         energy_simulated=not energy_context["has_real_logs"],
         energy_totals=energy_context["totals"],
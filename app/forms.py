@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import date
 from flask_wtf import FlaskForm
-from flask_wtf.file import FileAllowed, FileField
+from flask_wtf.file import FileAllowed, FileField, FileRequired
 from wtforms import (
     BooleanField,
     DateField,
@@ -16,7 +16,7 @@ from wtforms import (
 )
 from wtforms.validators import DataRequired, Email, EqualTo, Length, Optional, NumberRange
 
-from .utils import ELECTRICITY_PROVIDER_CHOICES
+from .utils import get_provider_choices
 
 
 class LoginForm(FlaskForm):
@@ -117,7 +117,7 @@ class SubsidyNumbersForm(FlaskForm):
     )
     provider = SelectField(
         "Electricity provider / DISCOM",
-        choices=ELECTRICITY_PROVIDER_CHOICES,
+        choices=get_provider_choices,
         validators=[DataRequired(message="Select your electricity provider.")],
     )
     submit = SubmitField("Next: Preview savings")
@@ -198,21 +198,55 @@ class SubsidySiteForm(FlaskForm):
     submit = SubmitField("Check eligibility & estimate")
 
 
+TRACKER_ENTRY_TYPE_CHOICES = [
+    ("generation", "Generation"),
+    ("consumption", "Consumption"),
+    ("export", "Export"),
+    ("other", "Other"),
+]
+TRACKER_PANEL_ID_MAX_LENGTH = 120
+TRACKER_NOTE_MAX_LENGTH = 500
+
+
 class TrackerEntryForm(FlaskForm):
     entry_type = SelectField(
         "Entry type",
-        choices=[
-            ("generation", "Generation"),
-            ("consumption", "Consumption"),
-            ("export", "Export"),
-            ("other", "Other"),
-        ],
+        choices=TRACKER_ENTRY_TYPE_CHOICES,
         validators=[DataRequired()],
     )
     kwh = DecimalField("kWh", validators=[DataRequired()], places=2, rounding=None)
     revenue = DecimalField("Monetary value (₹)", validators=[Optional()], places=2, rounding=None)
-    panel_id = StringField("Panel ID", validators=[Optional(), Length(max=120)])
+    panel_id = StringField(
+        "Panel ID", validators=[Optional(), Length(max=TRACKER_PANEL_ID_MAX_LENGTH)]
+    )
     date = DateField("Entry date", validators=[DataRequired()])
-    note = TextAreaField("Note", validators=[Optional(), Length(max=500)])
+    note = TextAreaField("Note", validators=[Optional(), Length(max=TRACKER_NOTE_MAX_LENGTH)])
     submit = SubmitField("Save entry")
 
+
+class TrackerImportForm(FlaskForm):
+    file = FileField(
+        "Inverter export (CSV or JSONL)",
+        validators=[
+            FileRequired(message="Choose a CSV or JSONL file to import."),
+            FileAllowed(["csv", "jsonl", "ndjson"], "Upload a .csv or .jsonl file."),
+        ],
+    )
+    default_entry_type = SelectField(
+        "Entry type for rows without one",
+        choices=TRACKER_ENTRY_TYPE_CHOICES,
+        default="generation",
+        validators=[DataRequired()],
+    )
+    submit = SubmitField("Import readings")
+
+
+class BulkEstimateForm(FlaskForm):
+    file = FileField(
+        "Rooftop list (CSV)",
+        validators=[
+            FileRequired(message="Choose a CSV file of rooftops to estimate."),
+            FileAllowed(["csv"], "Upload a .csv file."),
+        ],
+    )
+    submit = SubmitField("Download estimates")
@@ -46,6 +46,12 @@ class User(db.Model, UserMixin):
         lazy="dynamic",
         cascade="all, delete-orphan",
     )
+    api_tokens = db.relationship(
+        "ApiToken",
+        backref="user",
+        lazy="dynamic",
+        cascade="all, delete-orphan",
+    )
     subsidy_submissions = db.relationship(
         "SubsidySubmission",
         backref="user",
@@ -56,6 +62,12 @@ class User(db.Model, UserMixin):
     last_system_kw = db.Column(db.Float)
     last_net_cost_inr = db.Column(db.Float)
     last_estimated_savings_inr = db.Column(db.Float)
+    last_monthly_savings_inr = db.Column(db.Float)
+    last_lifetime_savings_inr = db.Column(db.Float)
+    last_npv_inr = db.Column(db.Float)
+    last_irr_percent = db.Column(db.Float)
+    last_payback_years = db.Column(db.Float)
+    last_co2_tonnes_per_year = db.Column(db.Float)
     last_estimate_updated_at = db.Column(db.DateTime)
 
     def set_password(self, password: str) -> None:
@@ -66,6 +78,10 @@ class User(db.Model, UserMixin):
 
 
 class Reminder(db.Model):
+    __table_args__ = (
+        db.Index("ix_reminder_user_id_due_date_due_time", "user_id", "due_date", "due_time"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
     name = db.Column(db.String(140), nullable=False)
@@ -87,6 +103,8 @@ class Reminder(db.Model):
 
 
 class Project(db.Model):
+    __table_args__ = (db.Index("ix_project_user_id_created_at", "user_id", "created_at"),)
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
     name = db.Column(db.String(160), nullable=False)
@@ -99,6 +117,8 @@ class Project(db.Model):
 
 
 class HealthStat(db.Model):
+    __table_args__ = (db.Index("ix_health_stat_user_id_created_at", "user_id", "created_at"),)
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
     label = db.Column(db.String(120), nullable=False)
@@ -107,6 +127,8 @@ class HealthStat(db.Model):
 
 
 class HealthLog(db.Model):
+    __table_args__ = (db.Index("ix_health_log_user_id_created_at", "user_id", "created_at"),)
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
     note = db.Column(db.Text, nullable=False)
@@ -114,6 +136,14 @@ class HealthLog(db.Model):
 
 
 class EnergyLog(db.Model):
+    __table_args__ = (
+        db.Index("ix_energy_log_user_id_date_created_at", "user_id", "date", "created_at"),
+        db.Index("ix_energy_log_user_id_panel_id_date", "user_id", "panel_id", "date"),
+        db.Index(
+            "uq_energy_log_user_id_idempotency_key", "user_id", "idempotency_key", unique=True
+        ),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
     entry_type = db.Column(db.String(40), nullable=False)
@@ -122,10 +152,15 @@ class EnergyLog(db.Model):
     panel_id = db.Column(db.String(120))
     date = db.Column(db.Date, nullable=False)
     note = db.Column(db.Text)
+    idempotency_key = db.Column(db.String(120))
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
 
 
 class SubsidySubmission(db.Model):
+    __table_args__ = (
+        db.Index("ix_subsidy_submission_user_id_created_at", "user_id", "created_at"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
     roof_area = db.Column(db.Numeric(10, 2))
@@ -135,4 +170,30 @@ class SubsidySubmission(db.Model):
     consumer_segment = db.Column(db.String(80))
     grid_connection = db.Column(db.String(80))
     roof_type = db.Column(db.String(80))
+    input_hash = db.Column(db.String(64))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+
+class EnergyDailyRollup(db.Model):
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), primary_key=True)
+    date = db.Column(db.Date, primary_key=True)
+    generation = db.Column(db.Numeric(12, 2), nullable=False, default=0)
+    consumption = db.Column(db.Numeric(12, 2), nullable=False, default=0)
+    export = db.Column(db.Numeric(12, 2), nullable=False, default=0)
+    revenue = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+
+class ApiToken(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False, index=True)
+    name = db.Column(db.String(120), nullable=False)
+    token_hash = db.Column(db.String(64), unique=True, nullable=False, index=True)
+    token_prefix = db.Column(db.String(12), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    last_used_at = db.Column(db.DateTime)
+    revoked_at = db.Column(db.DateTime)
+
+    @property
+    def is_active(self) -> bool:
+        return self.revoked_at is None
@@ -7,33 +7,46 @@ from pypdf import PdfReader
 
 from flask import (
     Blueprint,
+    Response,
     flash,
     jsonify,
     redirect,
     render_template,
     request,
     session,
+    stream_with_context,
     url_for,
     current_app,
 )
 from flask_login import current_user, login_required
 
 from ..extensions import db, csrf
-from ..forms import SubsidyNumbersForm, SubsidySiteForm
+from ..forms import BulkEstimateForm, SubsidyNumbersForm, SubsidySiteForm
 from ..models import SubsidySubmission
 from ..utils import (
-    estimate_subsidy,
     estimate_system_size_kw,
-    match_subsidy_schemes,
     estimate_monthly_units_from_bill,
     get_provider_label,
     get_provider_tariff,
-    get_scheme_filter_options,
 )
+from ..utils.bulk_estimates import BULK_INPUT_COLUMNS, iter_bulk_estimates
+from ..utils.scenarios import sensitivity_sweep
+from ..utils.solar_yield import annual_yield_per_kw
+from ..utils.subsidy import DEFAULT_COST_PER_KW
+from ..utils.subsidy_results import SubsidyResultBundle, bundle_payload, load_result_bundle, results_etag
 from ..utils.vendors import get_recommended_vendors
 
 subsidy_bp = Blueprint("subsidy", __name__, url_prefix="/subsidy")
 
+RESULT_REQUIRED_KEYS = {
+    "roof_area",
+    "state",
+    "consumer_segment",
+    "grid_connection",
+    "provider",
+    "monthly_bill",
+}
+
 
 def _reset_journey() -> None:
     session.pop("subsidy_journey", None)
@@ -47,6 +60,50 @@ def _ensure_session() -> dict:
     return data
 
 
+def _record_submission(journey: dict, bundle: SubsidyResultBundle) -> None:
+    """Store the estimate and a submission row, once per distinct set of inputs.
+
+    Only the HTML results view records submissions. results.json and
+    what-if.json are revalidated and prefetched by the page, so they stay
+    read-only.
+    """
+    latest = (
+        SubsidySubmission.query.filter_by(user_id=current_user.id)
+        .order_by(SubsidySubmission.created_at.desc())
+        .first()
+    )
+    if latest is None or latest.input_hash != bundle.fingerprint:
+        current_user.last_system_kw = bundle.recommended_kw
+        current_user.last_net_cost_inr = bundle.result.net_cost
+        current_user.last_estimated_savings_inr = bundle.estimated_annual_savings
+        lifetime = bundle.lifetime.summary()
+        current_user.last_monthly_savings_inr = lifetime["monthly_savings_inr"]
+        current_user.last_lifetime_savings_inr = lifetime["lifetime_savings_inr"]
+        current_user.last_npv_inr = lifetime["npv_inr"]
+        current_user.last_irr_percent = lifetime["irr_percent"]
+        current_user.last_payback_years = lifetime["payback_years"]
+        current_user.last_co2_tonnes_per_year = lifetime["co2_tonnes_per_year"]
+        current_user.last_estimate_updated_at = datetime.utcnow()
+        db.session.add(
+            SubsidySubmission(
+                user_id=current_user.id,
+                roof_area=float(journey.get("roof_area", 0)) if journey.get("roof_area") else None,
+                monthly_bill=float(journey.get("monthly_bill", 0)) if journey.get("monthly_bill") else None,
+                provider=journey.get("provider"),
+                state=journey.get("state"),
+                consumer_segment=journey.get("consumer_segment"),
+                grid_connection=journey.get("grid_connection"),
+                roof_type=journey.get("roof_type"),
+                input_hash=bundle.fingerprint,
+            )
+        )
+    if not current_user.journey_completed:
+        current_user.journey_completed = True
+    db.session.commit()
+    journey["submitted_fingerprint"] = bundle.fingerprint
+    session.modified = True
+
+
 @subsidy_bp.route("/", methods=["GET", "POST"])
 @login_required
 def eligibility():
@@ -110,63 +167,13 @@ def site():
 @login_required
 def results():
     journey = _ensure_session()
-    required_keys = {
-        "roof_area",
-        "state",
-        "consumer_segment",
-        "grid_connection",
-        "provider",
-        "monthly_bill",
-    }
-    if not required_keys.issubset(journey.keys()):
+    if not RESULT_REQUIRED_KEYS.issubset(journey.keys()):
         flash("Complete the subsidy journey before viewing matches.", "error")
         return redirect(url_for("subsidy.eligibility"))
 
-    roof_area = journey.get("roof_area", 0.0)
-    monthly_bill = journey.get("monthly_bill", 0.0)
+    bundle = load_result_bundle(journey)
     provider_key = journey.get("provider")
-
-    estimated_monthly_units = estimate_monthly_units_from_bill(monthly_bill, provider_key)
-    annual_consumption = estimated_monthly_units * 12 if estimated_monthly_units else None
-
-    recommended_kw = estimate_system_size_kw(
-        roof_area=roof_area or None,
-        annual_consumption_kwh=annual_consumption or None,
-    )
-
-    result = estimate_subsidy(recommended_kw)
-    matches = match_subsidy_schemes(
-        state=journey.get("state") or "",
-        consumer_segment=journey.get("consumer_segment") or "residential",
-        owns_property=journey.get("ownership") if "ownership" in journey else None,
-        is_grid_connected=journey.get("grid_connection") == "grid",
-        roof_area=roof_area or None,
-        annual_consumption=annual_consumption or None,
-    )
-    
-    # Apply ML-based scoring to matches
-    from app.utils.ml_scoring import calculate_subsidy_match_score
-    
-    for match in matches:
-        # Calculate ML match score
-        ml_score = calculate_subsidy_match_score(
-            scheme={
-                'match_score': match.match_score,
-                'benefit': match.benefit,
-                'states': match.states,
-                'coverage': match.coverage,
-                'consumer_segments': match.consumer_segments,
-            },
-            user_system_size_kw=recommended_kw,
-            user_annual_consumption_kwh=annual_consumption,
-            user_state=journey.get("state") or "",
-            user_consumer_segment=journey.get("consumer_segment") or "residential",
-            gross_cost_inr=result.gross_cost,
-            subsidy_amount_inr=result.central + result.state_subsidy,
-            ease_of_claim=0.7 if match.application_url else 0.5,  # Higher if online portal available
-        )
-        # Update match score with ML score
-        match.match_score = ml_score / 10.0  # Convert back to 0-10 scale for compatibility
+    matches = bundle.matches
 
     coverage_filter = request.args.get("coverage", "all")
     ownership_filter = request.args.get("ownership", "all")
@@ -177,7 +184,7 @@ def results():
         "grid": grid_filter,
     }
 
-    filter_options = get_scheme_filter_options(matches)
+    filter_options = bundle.filter_options
 
     def build_filter_links(name: str, options: list[str], label_map: dict[str, str]):
         links = []
@@ -241,54 +248,13 @@ def results():
             return False
         return True
 
-    filtered_matches = [scheme for scheme in matches if passes_filters(scheme)]
-    
-    # Sort matches by ML score (highest first)
-    filtered_matches.sort(key=lambda x: x.match_score, reverse=True)
+    # Bundle matches are already sorted by ML score (highest first). All
+    # of them are rendered; the ones outside the filters start hidden so
+    # the page script can re-filter from results.json without a reload.
+    visible_ids = {scheme.id for scheme in matches if passes_filters(scheme)}
 
-    # Calculate financial and CO₂ predictions using ML model
-    from app.utils.ml_scoring import calculate_financial_predictions
-    
-    estimated_annual_output = recommended_kw * 1100
-    tariff = get_provider_tariff(provider_key)
-    
-    financial_predictions = calculate_financial_predictions(
-        system_size_kw=recommended_kw,
-        annual_generation_kwh=estimated_annual_output,
-        tariff_rate_inr_per_kwh=tariff,
-        gross_cost_inr=result.gross_cost,
-        subsidy_amount_inr=result.central + result.state_subsidy,
-        self_consumption_ratio=0.8,
-    )
-    
-    if annual_consumption:
-        offset_kwh = min(annual_consumption, estimated_annual_output)
-        estimated_annual_savings = offset_kwh * tariff
-    elif monthly_bill:
-        estimated_annual_savings = monthly_bill * 12 * 0.6
-    else:
-        estimated_annual_savings = financial_predictions['annual_savings_inr']
-
-    current_user.last_system_kw = recommended_kw
-    current_user.last_net_cost_inr = result.net_cost
-    current_user.last_estimated_savings_inr = estimated_annual_savings
-    current_user.last_estimate_updated_at = datetime.utcnow()
-    if not current_user.journey_completed:
-        current_user.journey_completed = True
-    
-    # Save subsidy submission data
-    submission = SubsidySubmission(
-        user_id=current_user.id,
-        roof_area=float(journey.get("roof_area", 0)) if journey.get("roof_area") else None,
-        monthly_bill=float(journey.get("monthly_bill", 0)) if journey.get("monthly_bill") else None,
-        provider=journey.get("provider"),
-        state=journey.get("state"),
-        consumer_segment=journey.get("consumer_segment"),
-        grid_connection=journey.get("grid_connection"),
-        roof_type=journey.get("roof_type"),
-    )
-    db.session.add(submission)
-    db.session.commit()
+    if journey.get("submitted_fingerprint") != bundle.fingerprint:
+        _record_submission(journey, bundle)
 
     state_label = journey.get("state") or ""
     consumer_segment = journey.get("consumer_segment") or "residential"
@@ -307,24 +273,26 @@ def results():
     )
     if provider_label:
         profile_tags.append(provider_label)
-    if estimated_monthly_units:
-        profile_tags.append(f"{round(estimated_monthly_units):,} units / month")
+    if bundle.estimated_monthly_units:
+        profile_tags.append(f"{round(bundle.estimated_monthly_units):,} units / month")
 
     return render_template(
         "subsidy/step4_results.html",
         title="Subsidy Journey — Results",
         step=3,
-        recommended_kw=recommended_kw,
-        roof_area=roof_area,
-        annual_consumption=annual_consumption,
-        monthly_bill=monthly_bill,
-        estimated_monthly_units=estimated_monthly_units,
+        recommended_kw=bundle.recommended_kw,
+        estimated_annual_output=bundle.estimated_annual_output,
+        roof_area=bundle.roof_area,
+        annual_consumption=bundle.annual_consumption,
+        monthly_bill=bundle.monthly_bill,
+        estimated_monthly_units=bundle.estimated_monthly_units,
         provider_label=provider_label,
-        result=result,
-        matches=filtered_matches,
+        result=bundle.result,
+        matches=matches,
+        visible_ids=visible_ids,
         total_matches=len(matches),
         profile_tags=profile_tags,
-        estimated_annual_savings=estimated_annual_savings,
+        estimated_annual_savings=bundle.estimated_annual_savings,
         coverage_links=coverage_links,
         ownership_links=ownership_links,
         grid_links=grid_links,
@@ -333,6 +301,66 @@ def results():
     )
 
 
+@subsidy_bp.route("/results.json", methods=["GET"])
+@login_required
+def results_json():
+    # Read-only: revalidation and prefetches must not create sessions or
+    # record submissions; the HTML results view does that.
+    journey = session.get("subsidy_journey") or {}
+    if not RESULT_REQUIRED_KEYS.issubset(journey.keys()):
+        return jsonify({"error": "Complete the subsidy journey first."}), 400
+
+    etag = results_etag(journey)
+    if etag in request.if_none_match:
+        response = current_app.response_class(status=304)
+    else:
+        response = jsonify(bundle_payload(load_result_bundle(journey)))
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "private, no-cache"
+    response.vary.add("Cookie")
+    return response
+
+
+@subsidy_bp.route("/results/what-if.json", methods=["GET"])
+@login_required
+def what_if():
+    # Read-only like results.json: fetching the panel must not create a session.
+    journey = session.get("subsidy_journey") or {}
+    if not RESULT_REQUIRED_KEYS.issubset(journey.keys()):
+        return jsonify({"error": "Complete the subsidy journey first."}), 400
+
+    bundle = load_result_bundle(journey)
+    payload = sensitivity_sweep(
+        system_kw=bundle.recommended_kw,
+        tariff=get_provider_tariff(journey.get("provider")),
+        cost_per_kw=DEFAULT_COST_PER_KW,
+        annual_production_per_kw=bundle.annual_yield_per_kw,
+    )
+    return jsonify(payload)
+
+
+@subsidy_bp.route("/bulk", methods=["GET", "POST"])
+@login_required
+def bulk_estimate():
+    form = BulkEstimateForm()
+    if form.validate_on_submit():
+        # In-process: a per-request process pool costs more to start and
+        # feed than it saves on upload-sized files. The estimate-batch CLI
+        # uses the pool for large runs.
+        body = iter_bulk_estimates(form.file.data.stream, workers=1)
+        return Response(
+            stream_with_context(body),
+            mimetype="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="solaris-estimates.csv"'},
+        )
+    return render_template(
+        "subsidy/bulk.html",
+        title="Bulk Site Estimates",
+        form=form,
+        input_columns=BULK_INPUT_COLUMNS,
+    )
+
+
 @subsidy_bp.route("/vendors", methods=["GET"])
 @login_required
 def vendors():
@@ -348,11 +376,13 @@ def vendors():
     provider_label = get_provider_label(provider_key)
 
     if roof_area or annual_consumption:
+        yield_per_kw = annual_yield_per_kw(journey.get("state"), journey.get("roof_type"))
         recommended_kw = estimate_system_size_kw(
             roof_area=roof_area or None,
             annual_consumption_kwh=annual_consumption or None,
+            annual_production_per_kw=yield_per_kw,
         )
-        estimated_annual_output = recommended_kw * 1100
+        estimated_annual_output = recommended_kw * yield_per_kw
         if annual_consumption:
             tariff = get_provider_tariff(provider_key)
             offset_kwh = min(annual_consumption, estimated_annual_output)
@@ -608,6 +638,7 @@ def view_data():
         recommended_kw = estimate_system_size_kw(
             roof_area=form_data["roof_area"] or None,
             annual_consumption_kwh=annual_consumption or None,
+            annual_production_per_kw=annual_yield_per_kw(journey.get("state"), journey.get("roof_type")),
         )
     
     return render_template(
@@ -1,14 +1,33 @@
 from __future__ import annotations
 
-from datetime import date
+from datetime import date, datetime
 
-from flask import Blueprint, render_template, redirect, url_for, flash
+import click
+from flask import (
+    Blueprint,
+    Response,
+    abort,
+    current_app,
+    flash,
+    jsonify,
+    redirect,
+    render_template,
+    request,
+    stream_with_context,
+    url_for,
+)
 from flask_login import current_user, login_required
 
 from ..extensions import db
-from ..forms import TrackerEntryForm
-from ..models import EnergyLog
-from ..utils.energy import build_energy_context
+from ..forms import TRACKER_ENTRY_TYPE_CHOICES, TrackerEntryForm, TrackerImportForm
+from ..utils.downsample import downsample_series
+from ..utils.energy import ENERGY_WINDOWS, build_energy_context, load_log_page, resolve_window
+from ..utils.energy_export import EXPORT_FORMATS, iter_energy_export
+from ..utils.energy_insights import ROLLING_FIELDS, SERIES_FIELDS
+from ..utils.energy_import import detect_format, import_energy_file
+from ..utils.energy_rollup import find_rollup_drift, rebuild_energy_rollup
+from ..utils.panels import build_panel_performance
+from ..utils.write_behind import energy_write_queue
 
 tracker_bp = Blueprint("tracker", __name__, url_prefix="/tracker")
 
@@ -24,18 +43,38 @@ def require_journey():
 @tracker_bp.route("/", methods=["GET"])
 @login_required
 def index():
-    energy_context = build_energy_context(current_user.id)
+    window, start = resolve_window(request.args.get("window"))
+    cursor = request.args.get("after")
+    energy_context = build_energy_context(current_user.id, start=start, recent_limit=0)
+
+    next_cursor = None
+    if energy_context["has_real_logs"]:
+        logs, next_cursor = load_log_page(current_user.id, start=start, cursor=cursor)
+    else:
+        logs = energy_context["logs"]
 
     return render_template(
         "tracker/index.html",
         title="Energy Tracker",
-        logs=energy_context["logs"],
+        logs=logs,
+        next_cursor=next_cursor,
+        is_first_page=not cursor,
+        window=window,
+        window_options=[(key, label) for key, (label, _days) in ENERGY_WINDOWS.items()],
         total_generation=energy_context["totals"]["generation"],
         total_export=energy_context["totals"]["export"],
         total_revenue=energy_context["totals"]["revenue"],
-        chart_daily_series=energy_context["daily_series"],
+        chart_daily_series=downsample_series(
+            energy_context["daily_series"],
+            current_app.config["CHART_MAX_POINTS"],
+            mode=current_app.config["CHART_DOWNSAMPLE_MODE"],
+            fields=SERIES_FIELDS + ROLLING_FIELDS,
+        ),
+        chart_day_count=len(energy_context["daily_series"]),
+        chart_totals=energy_context["totals"],
         simulated_data=not energy_context["has_real_logs"],
         automation_insights=energy_context["insights"],
+        energy_analytics=energy_context["analytics"],
     )
 
 
@@ -46,17 +85,24 @@ def add_entry():
     if not form.date.data:
         form.date.data = date.today()
     if form.validate_on_submit():
-        log = EnergyLog(
-            user_id=current_user.id,
-            entry_type=form.entry_type.data,
-            kwh=form.kwh.data,
-            revenue=form.revenue.data,
-            panel_id=form.panel_id.data or None,
-            date=form.date.data,
-            note=form.note.data,
-        )
-        db.session.add(log)
-        db.session.commit()
+        row = {
+            "user_id": current_user.id,
+            "entry_type": form.entry_type.data,
+            "kwh": form.kwh.data,
+            "revenue": form.revenue.data,
+            "panel_id": form.panel_id.data or None,
+            "date": form.date.data,
+            "note": form.note.data,
+            "created_at": datetime.utcnow(),
+        }
+        # Group-committed with concurrent writers; wait so the redirect
+        # below already sees the new entry.
+        try:
+            energy_write_queue.submit([row], wait=True)
+        except TimeoutError:
+            current_app.logger.error("Tracker entry for user %s was not confirmed in time.", current_user.id)
+            flash("Your entry is taking longer than usual to save. Check the tracker before re-adding it.", "error")
+            return redirect(url_for("tracker.index"))
         flash("Tracker entry saved!", "success")
         return redirect(url_for("tracker.index"))
     return render_template(
@@ -64,3 +110,143 @@ def add_entry():
         title="Add Tracker Entry",
         form=form,
     )
+
+
+@tracker_bp.route("/import", methods=["GET", "POST"])
+@login_required
+def import_entries():
+    form = TrackerImportForm()
+    report = None
+    if form.validate_on_submit():
+        upload = form.file.data
+        report = import_energy_file(
+            upload.stream,
+            user_id=current_user.id,
+            fmt=detect_format(upload.filename),
+            default_entry_type=form.default_entry_type.data,
+        )
+        if report.inserted:
+            flash(f"Imported {report.inserted:,} readings.", "success")
+        if report.stopped:
+            flash("The import stopped early; see details below.", "error")
+        elif report.failed:
+            flash(f"{report.failed:,} rows were skipped; see details below.", "error")
+    return render_template(
+        "tracker/import.html",
+        title="Import Tracker Data",
+        form=form,
+        report=report,
+    )
+
+
+def _parse_date_arg(name: str) -> date | None:
+    value = request.args.get(name)
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        abort(400, description=f"'{name}' must be a date in YYYY-MM-DD format.")
+
+
+@tracker_bp.route("/export", methods=["GET"])
+@login_required
+def export_entries():
+    fmt = request.args.get("format", "csv").lower()
+    if fmt not in EXPORT_FORMATS:
+        abort(400, description="format must be 'csv' or 'jsonl'.")
+
+    start = _parse_date_arg("start")
+    end = _parse_date_arg("end")
+    entry_type = request.args.get("entry_type") or None
+    if entry_type and entry_type not in {value for value, _label in TRACKER_ENTRY_TYPE_CHOICES}:
+        abort(400, description="Unknown entry_type.")
+
+    filename_parts = ["solaris-energy"]
+    if start:
+        filename_parts.append(start.isoformat())
+    if end:
+        filename_parts.append(end.isoformat())
+    if entry_type:
+        filename_parts.append(entry_type)
+    filename = f"{'_'.join(filename_parts)}.{fmt}"
+
+    body = iter_energy_export(
+        current_user.id, fmt, start=start, end=end, entry_type=entry_type
+    )
+    return Response(
+        stream_with_context(body),
+        mimetype=EXPORT_FORMATS[fmt],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "Cache-Control": "no-store",
+            "X-Content-Type-Options": "nosniff",
+        },
+    )
+
+
+def _panel_performance_from_args():
+    start = _parse_date_arg("start")
+    end = _parse_date_arg("end")
+    if start is None and end is None:
+        _window, start = resolve_window(request.args.get("window"))
+    try:
+        capacity_kwp = float(request.args.get("capacity_kwp", 1.0))
+        threshold = float(
+            request.args.get("threshold", current_app.config["PANEL_UNDERPERFORMANCE_PERCENT"])
+        )
+    except ValueError:
+        abort(400, description="capacity_kwp and threshold must be numbers.")
+    return build_panel_performance(
+        current_user.id,
+        start=start,
+        end=end,
+        capacity_kwp=capacity_kwp,
+        threshold_percent=threshold,
+    )
+
+
+@tracker_bp.route("/panels", methods=["GET"])
+@login_required
+def panels():
+    performance = _panel_performance_from_args()
+    return render_template(
+        "tracker/panels.html",
+        title="Panel Performance",
+        performance=performance,
+        window=resolve_window(request.args.get("window"))[0],
+        window_options=[(key, label) for key, (label, _days) in ENERGY_WINDOWS.items()],
+    )
+
+
+@tracker_bp.route("/panels.json", methods=["GET"])
+@login_required
+def panels_json():
+    return jsonify(_panel_performance_from_args())
+
+
+@tracker_bp.cli.command("check-rollup")
+@click.option("--user-id", type=int, default=None, help="Only check this user's rollup rows.")
+@click.option("--repair", is_flag=True, help="Rebuild drifted rollups from energy_log.")
+def check_rollup(user_id, repair):
+    """Verify energy_daily_rollup against a fresh aggregate of energy_log."""
+    drift = find_rollup_drift(user_id)
+    if not drift:
+        click.echo("Energy rollup is consistent.")
+        return
+
+    for item in drift:
+        click.echo(
+            f"user={item['user_id']} date={item['date']:%Y-%m-%d} "
+            f"expected={ {k: str(v) for k, v in item['expected'].items()} } "
+            f"actual={ {k: str(v) for k, v in item['actual'].items()} }"
+        )
+    click.echo(f"{len(drift)} rollup day(s) out of sync.")
+
+    if not repair:
+        raise SystemExit(1)
+
+    for drifted_user in sorted({item["user_id"] for item in drift}):
+        rebuilt = rebuild_energy_rollup(drifted_user)
+        click.echo(f"Rebuilt {rebuilt} rollup day(s) for user {drifted_user}.")
+    db.session.commit()
@@ -4,13 +4,13 @@ from .subsidy import (
     EstimateResult,
     Scheme,
     StatePolicy,
-    ELECTRICITY_PROVIDER_CHOICES,
+    get_provider_choices,
     estimate_monthly_units_from_bill,
     get_provider_label,
     get_provider_tariff,
 )
 from .schemes import match_subsidy_schemes, get_scheme_filter_options
-from .vendors import solar_vendors
+from .catalog import catalog_version, current_catalog
 
 __all__ = [
     "estimate_subsidy",
@@ -18,12 +18,13 @@ __all__ = [
     "EstimateResult",
     "Scheme",
     "StatePolicy",
-    "ELECTRICITY_PROVIDER_CHOICES",
+    "get_provider_choices",
     "estimate_monthly_units_from_bill",
     "get_provider_label",
     "get_provider_tariff",
     "match_subsidy_schemes",
     "get_scheme_filter_options",
-    "solar_vendors",
+    "catalog_version",
+    "current_catalog",
 ]
 
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import csv
+import io
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from .ml_scoring import financial_prediction_arrays
+from .schemes import match_subsidy_schemes
+from .solar_yield import annual_yield_per_kw
+from .subsidy import (
+    DEFAULT_AREA_PER_KW,
+    DEFAULT_PROVIDER_TARIFF,
+    estimate_monthly_units_from_bills,
+    estimate_subsidy_arrays,
+    get_provider_tariffs,
+)
+
+BULK_CHUNK_SIZE = 2_000
+BULK_INPUT_COLUMNS = ("roof_area", "monthly_bill", "provider", "state", "segment", "grid", "roof_type")
+BULK_OUTPUT_COLUMNS = (
+    "row",
+    *BULK_INPUT_COLUMNS,
+    "estimated_monthly_units",
+    "system_kw",
+    "gross_cost_inr",
+    "central_subsidy_inr",
+    "state_subsidy_inr",
+    "net_cost_inr",
+    "annual_generation_kwh",
+    "annual_savings_inr",
+    "monthly_savings_inr",
+    "payback_period_years",
+    "co2_avoided_kg_per_year",
+    "matched_scheme_count",
+    "matched_scheme_ids",
+    "error",
+)
+_BLANK_RESULTS = [""] * (len(BULK_OUTPUT_COLUMNS) - len(BULK_INPUT_COLUMNS) - 2)
+SELF_CONSUMPTION_RATIO = 0.8
+
+_COLUMN_ALIASES = {
+    "consumer_segment": "segment",
+    "grid_connection": "grid",
+    "roof_area_sqm": "roof_area",
+    "bill": "monthly_bill",
+    "monthly_bill_inr": "monthly_bill",
+    "discom": "provider",
+}
+
+
+def _normalise_header(header: List[str]) -> List[str]:
+    names = [key.strip().lower().replace(" ", "_") for key in header]
+    return [_COLUMN_ALIASES.get(name, name) for name in names]
+
+
+def _to_float(value: str) -> float:
+    if not value:
+        return 0.0
+    try:
+        return float(value.replace(",", ""))
+    except ValueError:
+        return np.nan
+
+
+def _format_column(values: np.ndarray) -> List[str]:
+    # tolist() hands back Python floats, which format far faster than
+    # NumPy scalars; NaN (value != value) becomes an empty cell.
+    return ["" if value != value else f"{value:.2f}" for value in values.tolist()]
+
+
+def estimate_chunk(rows: List[Dict[str, str]], first_row: int = 1) -> str:
+    """Estimate one chunk of normalised CSV rows and return its CSV text.
+
+    Array form of the journey pipeline: ``estimate_monthly_units_from_bills``,
+    the site yield, ``estimate_system_size_kw``, ``estimate_subsidy`` (built-in schemes,
+    no state policy) and ``calculate_financial_predictions`` at the
+    provider tariff. Scheme matching runs per row against the bitset index.
+    Runs in pool workers, which load the catalog through their own loader.
+    """
+    size = len(rows)
+    tariffs = get_provider_tariffs()
+    roof_area = np.fromiter((_to_float(row.get("roof_area", "")) for row in rows), np.float64, size)
+    monthly_bill = np.fromiter((_to_float(row.get("monthly_bill", "")) for row in rows), np.float64, size)
+    tariff = np.fromiter(
+        (tariffs.get(row.get("provider", ""), DEFAULT_PROVIDER_TARIFF) for row in rows), np.float64, size
+    )
+    invalid = np.isnan(roof_area) | np.isnan(monthly_bill)
+    roof_area = np.nan_to_num(roof_area)
+    monthly_bill = np.nan_to_num(monthly_bill)
+
+    monthly_units = estimate_monthly_units_from_bills(monthly_bill, (row.get("provider", "") for row in rows))
+    annual_consumption = np.where(monthly_bill > 0, monthly_units * 12, 0.0)
+
+    site_yields: Dict[tuple, float] = {}
+    for row in rows:
+        site = (row.get("state"), row.get("roof_type"))
+        if site not in site_yields:
+            site_yields[site] = annual_yield_per_kw(*site)
+    yield_per_kw = np.fromiter(
+        (site_yields[(row.get("state"), row.get("roof_type"))] for row in rows), np.float64, size
+    )
+
+    # estimate_system_size_kw
+    system_kw = np.where(
+        annual_consumption > 0,
+        annual_consumption / yield_per_kw,
+        np.where(roof_area > 0, roof_area / DEFAULT_AREA_PER_KW, 1.0),
+    )
+    system_kw = np.clip(system_kw, 0.5, 10.0)
+
+    subsidy = estimate_subsidy_arrays(system_kw)
+    generation = system_kw * yield_per_kw
+    financials = financial_prediction_arrays(
+        annual_generation_kwh=generation,
+        tariff_rate_inr_per_kwh=tariff,
+        gross_cost_inr=subsidy["gross_cost"],
+        subsidy_amount_inr=subsidy["central"] + subsidy["state_subsidy"],
+        self_consumption_ratio=SELF_CONSUMPTION_RATIO,
+    )
+
+    results = list(
+        zip(
+            *(
+                _format_column(column)
+                for column in (
+                    monthly_units,
+                    system_kw,
+                    subsidy["gross_cost"],
+                    subsidy["central"],
+                    subsidy["state_subsidy"],
+                    subsidy["net_cost"],
+                    generation,
+                    financials["annual_savings_inr"],
+                    financials["monthly_savings_inr"],
+                    financials["payback_period_years"],
+                    financials["co2_avoided_kg_per_year"],
+                )
+            )
+        )
+    )
+
+    roof_values = roof_area.tolist()
+    consumption_values = annual_consumption.tolist()
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for i, row in enumerate(rows):
+        inputs = [row.get(column, "") for column in BULK_INPUT_COLUMNS]
+        if invalid[i]:
+            writer.writerow([first_row + i, *inputs, *_BLANK_RESULTS, "roof_area and monthly_bill must be numbers"])
+            continue
+        matches = match_subsidy_schemes(
+            state=row.get("state", ""),
+            consumer_segment=row.get("segment") or "residential",
+            owns_property=None,
+            is_grid_connected=(row.get("grid") or "grid") == "grid",
+            roof_area=roof_values[i] or None,
+            annual_consumption=consumption_values[i] or None,
+        )
+        writer.writerow(
+            [first_row + i, *inputs, *results[i], len(matches), ";".join(match.id for match in matches), ""]
+        )
+    return buffer.getvalue()
+
+
+def _iter_chunks(stream: IO[bytes], chunk_size: int) -> Iterator[List[Dict[str, str]]]:
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    reader = csv.reader(text)
+    header = _normalise_header(next(reader, []))
+    records = (dict(zip(header, (value.strip() for value in row))) for row in reader if row)
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _chain(first: Any, second: Any, rest: Iterable[Any]) -> Iterator[Any]:
+    yield first
+    if second is not None:
+        yield second
+        yield from rest
+
+
+def _pool_context():
+    # Web workers may run threads (e.g. the energy write-behind flusher),
+    # which makes plain fork unsafe.
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def iter_bulk_estimates(
+    stream: IO[bytes],
+    *,
+    chunk_size: int = BULK_CHUNK_SIZE,
+    workers: Optional[int] = None,
+) -> Iterator[str]:
+    """Yield the CSV result for an uploaded rooftop list, chunk by chunk.
+
+    Input is read lazily and at most ``2 * workers`` chunks are in flight,
+    so memory stays bounded however long the file is. Output order matches
+    input order. A single-chunk file (or ``workers <= 1``) is estimated
+    in-process, skipping pool start-up.
+    """
+    header = io.StringIO()
+    csv.writer(header).writerow(BULK_OUTPUT_COLUMNS)
+    yield header.getvalue()
+
+    chunks = _iter_chunks(stream, chunk_size)
+    first = next(chunks, None)
+    if first is None:
+        return
+    second = next(chunks, None)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if second is None or workers <= 1:
+        row = 1
+        for chunk in _chain(first, second, chunks):
+            yield estimate_chunk(chunk, row)
+            row += len(chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context()) as pool:
+        in_flight: deque[Future] = deque()
+        row = 1
+        for chunk in _chain(first, second, chunks):
+            in_flight.append(pool.submit(estimate_chunk, chunk, row))
+            row += len(chunk)
+            if len(in_flight) >= 2 * workers:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
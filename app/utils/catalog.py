@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Dict, Mapping, Optional, Tuple
+
+from flask import Flask
+
+from ..config import Config
+from .tariffs import SlabTariff, compile_slab_tariff
+
+if TYPE_CHECKING:
+    from .schemes import SchemeIndex
+
+logger = logging.getLogger(__name__)
+
+# One JSON document per file: {"version": "...", <collection>: ...}.
+CATALOG_FILES = ("schemes", "providers", "vendors", "banks")
+
+
+class CatalogError(ValueError):
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class Provider:
+    key: str
+    label: str
+    tariff: float  # INR per kWh, effective rate used for savings
+    billing: SlabTariff  # slab structure used to turn bills into units
+
+
+@dataclass(frozen=True, slots=True)
+class Vendor:
+    id: str
+    name: str
+    rating: float
+    price_range_inr: str
+    base_price_per_kw_inr: float
+    locations: Tuple[str, ...]
+    years_experience: int
+    highlights: Tuple[str, ...]
+    contact: str = ""
+    website: str = ""
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "rating": self.rating,
+            "price_range_inr": self.price_range_inr,
+            "base_price_per_kw_inr": self.base_price_per_kw_inr,
+            "locations": list(self.locations),
+            "years_experience": self.years_experience,
+            "highlights": list(self.highlights),
+            "contact": self.contact,
+            "website": self.website,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class Bank:
+    name: str
+    type: str
+    rating: float
+    details: str
+    link: str
+
+
+@dataclass(frozen=True, slots=True)
+class Catalog:
+    version: str  # content hash over every catalog file
+    file_versions: Mapping[str, str]  # "version" declared inside each file
+    stamps: Tuple[Tuple[int, int], ...]  # (mtime_ns, size) per file, for reload checks
+    scheme_index: "SchemeIndex"
+    providers: Mapping[str, Provider]
+    vendors: Tuple[Vendor, ...]
+    banks: Tuple[Bank, ...]
+
+
+def _tupled(record: Mapping[str, Any]) -> Dict[str, Any]:
+    return {key: tuple(value) if isinstance(value, list) else value for key, value in record.items()}
+
+
+def _parse_schemes(document: Mapping[str, Any]) -> "SchemeIndex":
+    from .schemes import SchemeMatch, compile_scheme_index
+
+    return compile_scheme_index(
+        {
+            region: [SchemeMatch(**_tupled(record)) for record in records]
+            for region, records in document["regions"].items()
+        }
+    )
+
+
+def _parse_provider(record: Mapping[str, Any]) -> Provider:
+    # Providers without slabs bill every unit at the flat tariff.
+    slabs = [(slab["up_to"], slab["rate"]) for slab in record.get("slabs") or ()]
+    return Provider(
+        key=record["key"],
+        label=record["label"],
+        tariff=float(record["tariff"]),
+        billing=compile_slab_tariff(slabs or [(None, record["tariff"])], record.get("fixed_charge_inr", 0.0)),
+    )
+
+
+def _parse_providers(document: Mapping[str, Any]) -> Mapping[str, Provider]:
+    providers = [_parse_provider(record) for record in document["providers"]]
+    return MappingProxyType({provider.key: provider for provider in providers})
+
+
+def load_catalog(directory: Path) -> Catalog:
+    """Read and parse every catalog file in ``directory``."""
+    digest = hashlib.sha256()
+    documents: Dict[str, Any] = {}
+    stamps = []
+    for name in CATALOG_FILES:
+        path = directory / f"{name}.json"
+        try:
+            stat = path.stat()
+            raw = path.read_bytes()
+            documents[name] = json.loads(raw)
+        except (OSError, ValueError) as exc:
+            raise CatalogError(f"Cannot read catalog file {path}: {exc}") from exc
+        stamps.append((stat.st_mtime_ns, stat.st_size))
+        digest.update(name.encode("utf-8") + b"\0" + raw + b"\0")
+
+    try:
+        return Catalog(
+            version=digest.hexdigest()[:16],
+            file_versions=MappingProxyType({name: str(documents[name].get("version", "")) for name in CATALOG_FILES}),
+            stamps=tuple(stamps),
+            scheme_index=_parse_schemes(documents["schemes"]),
+            providers=_parse_providers(documents["providers"]),
+            vendors=tuple(Vendor(**_tupled(record)) for record in documents["vendors"]["vendors"]),
+            banks=tuple(Bank(**record) for record in documents["banks"]["banks"]),
+        )
+    except (KeyError, TypeError, ValueError, AttributeError) as exc:
+        raise CatalogError(f"Malformed catalog in {directory}: {exc!r}") from exc
+
+
+class CatalogLoader:
+    """Per-process catalog that is re-read when a file's mtime or size changes.
+
+    Files are stat'ed at most once per ``check_interval`` seconds. A file
+    that fails to parse (e.g. caught mid-write) leaves the previous catalog
+    in place and is retried on the next check.
+    """
+
+    def __init__(self, directory: str | Path, check_interval: float = 2.0):
+        self.directory = Path(directory)
+        self.check_interval = check_interval
+        self._catalog: Optional[Catalog] = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+
+    def init_app(self, app: Flask) -> None:
+        with self._lock:
+            self.directory = Path(app.config.get("CATALOG_DIR", self.directory))
+            self.check_interval = float(app.config.get("CATALOG_RELOAD_INTERVAL", self.check_interval))
+            self._catalog = None
+            self._next_check = 0.0
+        self.current()  # fail fast on a broken catalog
+
+    def _stamps(self) -> Tuple[Tuple[int, int], ...]:
+        stamps = []
+        for name in CATALOG_FILES:
+            try:
+                stat = (self.directory / f"{name}.json").stat()
+            except OSError:
+                return ()
+            stamps.append((stat.st_mtime_ns, stat.st_size))
+        return tuple(stamps)
+
+    def current(self) -> Catalog:
+        catalog = self._catalog
+        if catalog is not None and time.monotonic() < self._next_check:
+            return catalog
+        with self._lock:
+            now = time.monotonic()
+            if self._catalog is not None and now < self._next_check:
+                return self._catalog
+            self._next_check = now + self.check_interval
+            if self._catalog is None:
+                self._catalog = load_catalog(self.directory)
+            elif self._stamps() != self._catalog.stamps:
+                try:
+                    self._catalog = load_catalog(self.directory)
+                except CatalogError:
+                    logger.exception("Catalog reload failed; keeping version %s", self._catalog.version)
+                else:
+                    logger.info("Catalog reloaded: version %s", self._catalog.version)
+            return self._catalog
+
+
+catalog_loader = CatalogLoader(Config.CATALOG_DIR, Config.CATALOG_RELOAD_INTERVAL)
+
+
+def current_catalog() -> Catalog:
+    return catalog_loader.current()
+
+
+def catalog_version() -> str:
+    """Identifies the catalog files that results were computed against."""
+    return catalog_loader.current().version
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from typing import Any, Dict
+
+from .energy import build_energy_context
+from .projects import build_projects_context
+from .request_cache import request_cached
+
+DASHBOARD_RECENT_LIMIT = 3
+
+
+@request_cached
+def load_dashboard_projects(user_id: int) -> Dict[str, Any]:
+    return build_projects_context(user_id, limit=DASHBOARD_RECENT_LIMIT)
+
+
+@request_cached
+def load_dashboard_energy(user_id: int) -> Dict[str, Any]:
+    return build_energy_context(user_id, recent_limit=DASHBOARD_RECENT_LIMIT)
+
+
+@request_cached
+def load_dashboard_data(user_id: int) -> Dict[str, Any]:
+    """Everything the dashboard widgets read, fetched once per request.
+
+    Three round trips in total: the newest projects with a windowed total
+    count, the daily rollup (series and totals), and the newest logs.
+    """
+    projects_context = load_dashboard_projects(user_id)
+    energy_context = load_dashboard_energy(user_id)
+    return {
+        "recent_projects": projects_context["projects"],
+        "project_count": projects_context["total"],
+        "projects_simulated": not projects_context["has_real_projects"],
+        "recent_energy": energy_context["logs"],
+        "energy": energy_context,
+    }
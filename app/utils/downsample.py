@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+DEFAULT_CHART_POINTS = 180
+MIN_LTTB_POINTS = 3  # both endpoints plus one bucket
+
+
+def lttb_indices(y: np.ndarray, threshold: int, x: np.ndarray | None = None) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets: pick ``threshold`` representative indices.
+
+    The first and last points are always kept, so ``threshold`` is raised
+    to at least three. Each intermediate bucket contributes the point
+    forming the largest triangle with the previously selected point and the
+    mean of the next bucket, which preserves peaks and dips that plain
+    striding would drop.
+    """
+    size = y.size
+    threshold = max(threshold, MIN_LTTB_POINTS)
+    if threshold >= size:
+        return np.arange(size)
+    if x is None:
+        x = np.arange(size, dtype=np.float64)
+
+    every = (size - 2) / (threshold - 2)
+    edges = (np.arange(threshold - 1) * every).astype(np.int64) + 1
+    edges[-1] = size - 1
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    anchor = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        if bucket + 2 < edges.size:
+            next_start, next_end = edges[bucket + 1], edges[bucket + 2]
+            avg_x = x[next_start:next_end].mean()
+            avg_y = y[next_start:next_end].mean()
+        else:
+            avg_x, avg_y = x[size - 1], y[size - 1]
+
+        area = np.abs(
+            (x[anchor] - avg_x) * (y[start:end] - y[anchor])
+            - (x[anchor] - x[start:end]) * (avg_y - y[anchor])
+        )
+        anchor = start + int(np.argmax(area))
+        selected[bucket + 1] = anchor
+    selected[-1] = size - 1
+    return selected
+
+
+def _bucket_means(series: Sequence[Dict[str, Any]], max_points: int, fields: Sequence[str]) -> List[Dict[str, Any]]:
+    size = len(series)
+    starts = np.linspace(0, size, max_points, endpoint=False).astype(np.int64)
+    counts = np.diff(np.append(starts, size))
+    columns = {
+        field: np.add.reduceat(np.fromiter((item[field] for item in series), np.float64, size), starts) / counts
+        for field in fields
+    }
+    return [
+        {
+            "date": series[int(start)]["date"],
+            **{field: round(float(columns[field][index]), 2) for field in fields},
+        }
+        for index, start in enumerate(starts)
+    ]
+
+
+def downsample_series(
+    series: Sequence[Dict[str, Any]],
+    max_points: int = DEFAULT_CHART_POINTS,
+    *,
+    key: str = "generation",
+    mode: str = "lttb",
+    fields: Sequence[str] = ("generation", "consumption", "export", "revenue"),
+) -> List[Dict[str, Any]]:
+    """Bound a daily series to ``max_points`` entries for charting.
+
+    ``lttb`` keeps real days chosen by the shape of ``key``, always including
+    the first and last (so never fewer than three); ``mean`` averages
+    consecutive equal-width buckets (labelled by their first day). Series
+    already within budget are returned unchanged.
+    """
+    if not max_points or len(series) <= max_points:
+        return list(series)
+    if mode == "mean":
+        return _bucket_means(series, max_points, fields)
+
+    y = np.fromiter((item[key] for item in series), np.float64, len(series))
+    x = np.array([item["date"] for item in series], dtype="datetime64[D]").astype(np.float64)
+    return [series[int(index)] for index in lttb_indices(y, max_points, x)]
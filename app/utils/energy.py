@@ -1,69 +1,172 @@
 from __future__ import annotations
 
-import random
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 from datetime import date, datetime, timedelta
-from types import SimpleNamespace
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
-from ..models import EnergyLog
+from sqlalchemy import and_, or_
 
+from ..models import EnergyLog
+from .energy_insights import build_chart_analytics, build_insight_strings, compute_energy_analytics
+from .energy_rollup import entry_bucket, load_rollup_totals
+from .sample_data import daily_cached, sample_energy_days
+
+RECENT_LOG_LIMIT = 50
+LOG_PAGE_SIZE = 25
+
+# Window key -> (label, days back from today; None means full history)
+ENERGY_WINDOWS: OrderedDict[str, tuple[str, int | None]] = OrderedDict(
+    [
+        ("30d", ("30 days", 30)),
+        ("90d", ("90 days", 90)),
+        ("1y", ("1 year", 365)),
+        ("all", ("All time", None)),
+    ]
+)
+DEFAULT_ENERGY_WINDOW = "90d"
+
+
+def _empty_day() -> dict[str, float]:
+    return {"generation": 0.0, "consumption": 0.0, "export": 0.0, "revenue": 0.0}
+
+
+def resolve_window(window: str | None) -> tuple[str, date | None]:
+    """Map a window key to ``(key, first_date)``; unknown keys use the default."""
+    if window not in ENERGY_WINDOWS:
+        window = DEFAULT_ENERGY_WINDOW
+    days = ENERGY_WINDOWS[window][1]
+    if days is None:
+        return window, None
+    return window, date.today() - timedelta(days=days - 1)
+
+
+def build_recent_logs_query(user_id: int, limit: int | None = RECENT_LOG_LIMIT, start: date | None = None):
+    query = EnergyLog.query.filter_by(user_id=user_id)
+    if start is not None:
+        query = query.filter(EnergyLog.date >= start)
+    query = query.order_by(EnergyLog.date.desc(), EnergyLog.created_at.desc())
+    if limit is not None:
+        query = query.limit(limit)
+    return query
+
+
+def load_recent_logs(
+    user_id: int, limit: int | None = RECENT_LOG_LIMIT, start: date | None = None
+) -> List[EnergyLog]:
+    return build_recent_logs_query(user_id, limit, start).all()
+
+
+def encode_log_cursor(log: EnergyLog) -> str:
+    return f"{log.date.isoformat()}_{log.created_at.isoformat()}_{log.id}"
+
+
+def decode_log_cursor(cursor: str | None) -> Optional[Tuple[date, datetime, int]]:
+    if not cursor:
+        return None
+    try:
+        date_part, created_part, id_part = cursor.split("_")
+        return date.fromisoformat(date_part), datetime.fromisoformat(created_part), int(id_part)
+    except ValueError:
+        return None
+
+
+def build_log_page_query(
+    user_id: int,
+    *,
+    start: date | None = None,
+    position: Optional[Tuple[date, datetime, int]] = None,
+    page_size: int = LOG_PAGE_SIZE,
+):
+    """Logs after the ``(date, created_at, id)`` position, newest first, one row past the page."""
+    query = EnergyLog.query.filter_by(user_id=user_id)
+    if start is not None:
+        query = query.filter(EnergyLog.date >= start)
+
+    if position is not None:
+        after_date, after_created, after_id = position
+        query = query.filter(
+            or_(
+                EnergyLog.date < after_date,
+                and_(EnergyLog.date == after_date, EnergyLog.created_at < after_created),
+                and_(
+                    EnergyLog.date == after_date,
+                    EnergyLog.created_at == after_created,
+                    EnergyLog.id < after_id,
+                ),
+            )
+        )
 
-def build_energy_context(user_id: int) -> Dict[str, Any]:
-    logs: List[EnergyLog] = (
-        EnergyLog.query.filter_by(user_id=user_id)
-        .order_by(EnergyLog.date.desc(), EnergyLog.created_at.desc())
-        .all()
+    return query.order_by(EnergyLog.date.desc(), EnergyLog.created_at.desc(), EnergyLog.id.desc()).limit(
+        page_size + 1
     )
-    has_real_logs = bool(logs)
 
-    daily_totals: dict[str, dict[str, float]] = defaultdict(
-        lambda: {"generation": 0.0, "consumption": 0.0, "export": 0.0, "revenue": 0.0}
-    )
 
-    if has_real_logs:
+def load_log_page(
+    user_id: int,
+    *,
+    start: date | None = None,
+    cursor: str | None = None,
+    page_size: int = LOG_PAGE_SIZE,
+) -> tuple[List[EnergyLog], str | None]:
+    """Return one page of logs, newest first, plus the cursor for the next page.
+
+    Pages are keyed on ``(date, created_at, id)`` rather than OFFSET, so each
+    page is an index range seek no matter how deep the user scrolls.
+    """
+    position = decode_log_cursor(cursor)
+    rows = build_log_page_query(user_id, start=start, position=position, page_size=page_size).all()
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        return rows, encode_log_cursor(rows[-1])
+    return rows, None
+
+
+def build_energy_context(
+    user_id: int,
+    *,
+    aggregate_in_db: bool = True,
+    recent_limit: int | None = None,
+    start: date | None = None,
+) -> Dict[str, Any]:
+    """Summarise a user's energy logs for the tracker and dashboard.
+
+    With ``aggregate_in_db`` the per-day sums are read from the
+    ``energy_daily_rollup`` table, so their cost grows with the number of
+    logged days rather than logged rows. ``logs`` holds every raw row unless
+    ``recent_limit`` caps it (the dashboard) or is 0 to skip loading them
+    (the tracker pages them itself). ``start`` limits the series, totals and
+    logs to days on or after that date.
+    """
+    if aggregate_in_db:
+        daily_totals = defaultdict(_empty_day, load_rollup_totals(user_id, start))
+        has_real_logs = bool(daily_totals)
+        if not has_real_logs and start is not None:
+            has_real_logs = (
+                EnergyLog.query.filter_by(user_id=user_id).with_entities(EnergyLog.id).first() is not None
+            )
+        logs = load_recent_logs(user_id, recent_limit, start) if has_real_logs and recent_limit != 0 else []
+    else:
+        logs = load_recent_logs(user_id, None, start)
+        has_real_logs = bool(logs)
+        daily_totals = defaultdict(_empty_day)
         for log in logs:
-            date_key = log.date.strftime("%Y-%m-%d")
-            day_totals = daily_totals[date_key]
-            kwh_value = float(log.kwh or 0)
-            entry_type = (log.entry_type or "").lower()
-            if entry_type == "generation":
-                day_totals["generation"] += kwh_value
-            elif entry_type == "export":
-                day_totals["export"] += kwh_value
-            else:
-                day_totals["consumption"] += kwh_value
+            day_totals = daily_totals[log.date.strftime("%Y-%m-%d")]
+            day_totals[entry_bucket(log.entry_type)] += float(log.kwh or 0)
             if log.revenue is not None:
                 day_totals["revenue"] += float(log.revenue or 0)
-        sample_logs: List[Any] = []
-    else:
-        base_date = date.today() - timedelta(days=29)
-        for index in range(30):
-            current_date = base_date + timedelta(days=index)
-            generation = round(random.uniform(18.0, 34.0), 2)
-            export = round(generation * random.uniform(0.35, 0.6), 2)
-            consumption = round(max(generation - export + random.uniform(-3.5, 3.5), 0.0), 2)
-            revenue = round(export * random.uniform(5.5, 7.2), 2)
-            date_key = current_date.strftime("%Y-%m-%d")
-            daily_totals[date_key] = {
-                "generation": generation,
-                "consumption": consumption,
-                "export": export,
-                "revenue": revenue,
-            }
-
-        sample_logs = [
-            SimpleNamespace(
-                entry_type="generation",
-                date=datetime.strptime(date_key, "%Y-%m-%d").date(),
-                kwh=totals["generation"],
-                revenue=totals["revenue"],
-                panel_id=f"SOLAR-{index + 101}",
-                note="Automated record generated for visualization.",
-            )
-            for index, (date_key, totals) in enumerate(sorted(daily_totals.items())[-6:])
-        ]
+        if recent_limit is not None:
+            logs = logs[:recent_limit]
+
+    if not has_real_logs:
+        sample_context = sample_energy_context()
+        if recent_limit:
+            return {**sample_context, "logs": sample_context["logs"][:recent_limit]}
+        return dict(sample_context)
 
+    return {"logs": logs, "has_real_logs": True, **_summarise(daily_totals)}
+
+
+def _summarise(daily_totals: Dict[str, Dict[str, float]]) -> Dict[str, Any]:
     daily_series = [
         {
             "date": date_key,
@@ -75,64 +178,28 @@ def build_energy_context(user_id: int) -> Dict[str, Any]:
         for date_key, values in sorted(daily_totals.items())
     ]
 
-    total_generation = round(sum(item["generation"] for item in daily_series), 2)
-    total_export = round(sum(item["export"] for item in daily_series), 2)
-    total_revenue = round(sum(item["revenue"] for item in daily_series), 2)
-    total_consumption = round(sum(item["consumption"] for item in daily_series), 2)
-
-    insights: list[str] = []
+    analytics = compute_energy_analytics(daily_series)
+    insights = build_insight_strings(analytics)
+    if analytics is not None:
+        for item, week in zip(daily_series, analytics.rolling_7):
+            item["rolling_7"] = round(float(week), 2)
 
-    if daily_series:
-        def friendly_date(value: str) -> str:
-            return datetime.strptime(value, "%Y-%m-%d").strftime("%d %b %Y")
-
-        average_generation = sum(item["generation"] for item in daily_series) / len(daily_series)
-        insights.append(f"Average daily generation sits at {average_generation:.1f} kWh over the observed window.")
-
-        latest = daily_series[-1]
-        insights.append(
-            f"Latest reading logged on {friendly_date(latest['date'])} produced {latest['generation']:.1f} kWh."
-        )
-
-        if total_generation:
-            export_ratio = (total_export / total_generation) * 100
-            insights.append(
-                f"Export ratio is {export_ratio:.0f}% of total generation, highlighting grid contribution potential."
-            )
-
-        peak_generation_day = max(daily_series, key=lambda item: item["generation"])
-        insights.append(
-            f"Peak generation observed on {friendly_date(peak_generation_day['date'])} at {peak_generation_day['generation']:.1f} kWh."
-        )
-
-        if len(daily_series) >= 14:
-            recent_week = daily_series[-7:]
-            previous_week = daily_series[-14:-7]
-            recent_total = sum(item["generation"] for item in recent_week)
-            previous_total = sum(item["generation"] for item in previous_week)
-            if previous_total:
-                change = recent_total - previous_total
-                direction = "up" if change >= 0 else "down"
-                percent_change = abs(change) / previous_total * 100
-                insights.append(f"Generation is {direction} {percent_change:.1f}% compared to the prior week.")
-        if total_revenue:
-            average_revenue = total_revenue / len(daily_series)
-            insights.append(
-                f"Revenue averages ₹{average_revenue:,.0f} per day with a cumulative ₹{total_revenue:,.0f}."
-            )
-
-    totals = {
-        "generation": total_generation,
-        "export": total_export,
-        "revenue": total_revenue,
-        "consumption": total_consumption,
-    }
+    totals = (
+        {key: analytics.totals[key] for key in ("generation", "export", "revenue", "consumption")}
+        if analytics is not None
+        else {"generation": 0.0, "export": 0.0, "revenue": 0.0, "consumption": 0.0}
+    )
 
     return {
-        "logs": logs if has_real_logs else sample_logs,
-        "has_real_logs": has_real_logs,
         "daily_series": daily_series,
         "totals": totals,
         "insights": insights,
+        "analytics": build_chart_analytics(analytics),
     }
 
+
+@daily_cached
+def sample_energy_context() -> Dict[str, Any]:
+    """Demo context for users without logs; built once per day per process."""
+    daily_totals, sample_logs = sample_energy_days()
+    return {"logs": sample_logs, "has_real_logs": False, **_summarise(daily_totals)}
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from datetime import date
+from typing import Iterator
+
+from sqlalchemy import func, select
+
+from ..extensions import db
+from ..models import EnergyLog
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "jsonl": "application/x-ndjson",
+}
+EXPORT_COLUMNS = ("date", "entry_type", "kwh", "revenue", "panel_id", "note", "created_at")
+EXPORT_YIELD_PER = 1_000
+_CHUNK_BYTES = 64 * 1024
+
+
+def _export_statement(
+    user_id: int,
+    *,
+    start: date | None = None,
+    end: date | None = None,
+    entry_type: str | None = None,
+):
+    stmt = select(*(getattr(EnergyLog, column) for column in EXPORT_COLUMNS)).where(
+        EnergyLog.user_id == user_id
+    )
+    if start is not None:
+        stmt = stmt.where(EnergyLog.date >= start)
+    if end is not None:
+        stmt = stmt.where(EnergyLog.date <= end)
+    if entry_type:
+        stmt = stmt.where(func.lower(EnergyLog.entry_type) == entry_type.lower())
+    return stmt.order_by(EnergyLog.date, EnergyLog.created_at, EnergyLog.id).execution_options(
+        yield_per=EXPORT_YIELD_PER
+    )
+
+
+def _format_value(value):
+    if value is None:
+        return ""
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def iter_energy_export(user_id: int, fmt: str = "csv", **filters) -> Iterator[str]:
+    """Yield the export body in ~64 KB text chunks.
+
+    Rows are pulled through ``yield_per`` (a server-side cursor on
+    Postgres), so only one fetch batch plus one output chunk is held in
+    memory regardless of history length.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == "csv" else None
+    if writer is not None:
+        writer.writerow(EXPORT_COLUMNS)
+
+    result = db.session.execute(_export_statement(user_id, **filters))
+    try:
+        for row in result:
+            values = [_format_value(value) for value in row]
+            if writer is not None:
+                writer.writerow(values)
+            else:
+                record = dict(zip(EXPORT_COLUMNS, values))
+                for key in ("revenue", "panel_id", "note"):
+                    if record[key] == "":
+                        record[key] = None
+                buffer.write(json.dumps(record, ensure_ascii=False))
+                buffer.write("\n")
+
+            if buffer.tell() >= _CHUNK_BYTES:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+    finally:
+        result.close()
+
+    if buffer.tell():
+        yield buffer.getvalue()
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+import logging
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from typing import IO, Any, Iterator
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from ..extensions import db
+from ..forms import TRACKER_ENTRY_TYPE_CHOICES, TRACKER_NOTE_MAX_LENGTH, TRACKER_PANEL_ID_MAX_LENGTH
+from ..models import EnergyLog
+from .energy_rollup import record_energy_logs
+
+logger = logging.getLogger(__name__)
+
+IMPORT_BATCH_SIZE = 2_000
+IMPORT_MAX_REPORTED_ERRORS = 200
+
+_ENTRY_TYPES = {value for value, _label in TRACKER_ENTRY_TYPE_CHOICES}
+_KWH_LIMIT = Decimal("99999999.99")  # Numeric(10, 2)
+_REVENUE_LIMIT = Decimal("9999999999.99")  # Numeric(12, 2)
+
+# Common inverter export headers mapped onto EnergyLog fields.
+_COLUMN_ALIASES = {
+    "type": "entry_type",
+    "energy_kwh": "kwh",
+    "kwh_total": "kwh",
+    "energy": "kwh",
+    "value_inr": "revenue",
+    "panel": "panel_id",
+    "string_id": "panel_id",
+    "inverter_id": "panel_id",
+    "day": "date",
+    "timestamp": "date",
+    "datetime": "date",
+    "comment": "note",
+}
+
+
+class RowError(ValueError):
+    pass
+
+
+@dataclass
+class ImportReport:
+    inserted: int = 0
+    failed: int = 0
+    stopped: bool = False  # a batch failed to commit or the file broke off; later rows were not read
+    errors: list[tuple[int, str]] = field(default_factory=list)
+
+    def add_error(self, line: int, message: str, rows: int = 1) -> None:
+        self.failed += rows
+        if len(self.errors) < IMPORT_MAX_REPORTED_ERRORS:
+            self.errors.append((line, message))
+
+
+def detect_format(filename: str | None) -> str:
+    extension = (filename or "").rsplit(".", 1)[-1].lower()
+    return "jsonl" if extension in ("jsonl", "ndjson") else "csv"
+
+
+def _normalise_keys(record: dict[str, Any]) -> dict[str, Any]:
+    normalised = {}
+    for key, value in record.items():
+        if key is None:
+            continue
+        name = key.strip().lower().replace(" ", "_")
+        normalised[_COLUMN_ALIASES.get(name, name)] = value
+    return normalised
+
+
+def _iter_records(stream: IO[bytes], fmt: str) -> Iterator[tuple[int, dict[str, Any] | str]]:
+    """Yield ``(line_number, record)`` lazily; malformed lines yield an error string."""
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if fmt == "jsonl":
+        for line_number, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as exc:
+                yield line_number, f"Invalid JSON: {exc.msg}"
+                continue
+            if not isinstance(record, dict):
+                yield line_number, "Each line must be a JSON object."
+                continue
+            yield line_number, _normalise_keys(record)
+        return
+
+    reader = csv.DictReader(text)
+    for record in reader:
+        yield reader.line_num, _normalise_keys(record)
+
+
+def _parse_decimal(value: Any, label: str, limit: Decimal, *, required: bool) -> Decimal | None:
+    if value is None or (isinstance(value, str) and not value.strip()):
+        if required:
+            raise RowError(f"{label} is required.")
+        return None
+    try:
+        number = Decimal(str(value).strip().replace(",", ""))
+    except InvalidOperation:
+        raise RowError(f"{label} must be a number.") from None
+    if not number.is_finite() or abs(number) > limit:
+        raise RowError(f"{label} is out of range.")
+    return number.quantize(Decimal("0.01"))
+
+
+def _parse_date(value: Any) -> date:
+    if not value or not str(value).strip():
+        raise RowError("date is required.")
+    raw = str(value).strip()
+    try:
+        return datetime.fromisoformat(raw.replace("Z", "+00:00")).date()
+    except ValueError:
+        pass
+    for pattern in ("%d/%m/%Y", "%d-%m-%Y", "%d/%m/%Y %H:%M", "%d/%m/%Y %H:%M:%S"):
+        try:
+            return datetime.strptime(raw, pattern).date()
+        except ValueError:
+            continue
+    raise RowError(f"date {raw!r} is not a valid date.")
+
+
+def validate_row(record: dict[str, Any], user_id: int, default_entry_type: str) -> dict[str, Any]:
+    """Apply the same rules as TrackerEntryForm and return an insert dict."""
+    entry_type = str(record.get("entry_type") or default_entry_type).strip().lower()
+    if entry_type not in _ENTRY_TYPES:
+        raise RowError(f"entry_type {entry_type!r} is not one of {', '.join(sorted(_ENTRY_TYPES))}.")
+
+    panel_id = str(record.get("panel_id") or "").strip() or None
+    if panel_id and len(panel_id) > TRACKER_PANEL_ID_MAX_LENGTH:
+        raise RowError(f"panel_id is longer than {TRACKER_PANEL_ID_MAX_LENGTH} characters.")
+
+    note = str(record.get("note") or "").strip() or None
+    if note and len(note) > TRACKER_NOTE_MAX_LENGTH:
+        raise RowError(f"note is longer than {TRACKER_NOTE_MAX_LENGTH} characters.")
+
+    kwh = _parse_decimal(record.get("kwh"), "kwh", _KWH_LIMIT, required=True)
+    if not kwh:
+        # DataRequired on the form rejects a zero reading as well.
+        raise RowError("kwh is required.")
+
+    return {
+        "user_id": user_id,
+        "entry_type": entry_type,
+        "kwh": kwh,
+        "revenue": _parse_decimal(record.get("revenue"), "revenue", _REVENUE_LIMIT, required=False),
+        "panel_id": panel_id,
+        "date": _parse_date(record.get("date")),
+        "note": note,
+        "created_at": datetime.utcnow(),
+    }
+
+
+def _flush(batch: list[dict[str, Any]]) -> None:
+    # Core insert on the session's connection: a plain DBAPI executemany
+    # without the ORM bulk-persistence bookkeeping.
+    db.session.connection().execute(EnergyLog.__table__.insert(), batch)
+    record_energy_logs(batch)
+    db.session.commit()
+
+
+def import_energy_file(
+    stream: IO[bytes],
+    *,
+    user_id: int,
+    fmt: str = "csv",
+    default_entry_type: str = "generation",
+    batch_size: int = IMPORT_BATCH_SIZE,
+) -> ImportReport:
+    """Stream-import readings into EnergyLog.
+
+    Rows are validated one at a time and written with executemany in
+    ``batch_size`` chunks, each committed in its own transaction together
+    with its rollup update, so memory stays bounded by one batch. Invalid
+    rows are skipped and reported by line number. A batch that fails to
+    commit is rolled back and ends the import with ``stopped`` set;
+    ``inserted`` still counts the batches committed before it. A decoding
+    or CSV error mid-file also sets ``stopped``, after committing the valid
+    rows read up to that point.
+    """
+    report = ImportReport()
+    batch: list[dict[str, Any]] = []
+    batch_lines = (0, 0)  # first and last line number in the batch
+
+    def flush() -> bool:
+        try:
+            _flush(batch)
+        except SQLAlchemyError as exc:
+            db.session.rollback()
+            logger.exception("Energy import batch failed for user %s.", user_id)
+            report.add_error(
+                batch_lines[0],
+                f"Database error ({exc.__class__.__name__}) saving lines {batch_lines[0]}-{batch_lines[1]}; "
+                f"these and all later rows were not imported. {report.inserted:,} earlier rows were saved.",
+                rows=len(batch),
+            )
+            report.stopped = True
+            return False
+        report.inserted += len(batch)
+        return True
+
+    def stop_reading(message: str) -> None:
+        # Rows decoded before the break are valid; keep them rather than the whole batch.
+        if batch and not flush():
+            return
+        report.add_error(last_line + 1, f"{message} Rows from line {last_line + 1} on were not read.", rows=0)
+        report.stopped = True
+
+    last_line = 0
+    try:
+        for line_number, record in _iter_records(stream, fmt):
+            last_line = line_number
+            if isinstance(record, str):
+                report.add_error(line_number, record)
+                continue
+            try:
+                batch.append(validate_row(record, user_id, default_entry_type))
+            except RowError as exc:
+                report.add_error(line_number, str(exc))
+                continue
+            batch_lines = (batch_lines[0] if len(batch) > 1 else line_number, line_number)
+            if len(batch) >= batch_size:
+                if not flush():
+                    return report
+                batch = []
+        if batch:
+            flush()
+    except UnicodeDecodeError:
+        stop_reading("File is not UTF-8 encoded text.")
+    except csv.Error as exc:
+        stop_reading(f"Could not parse CSV: {exc}.")
+    return report
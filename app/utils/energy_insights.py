@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+SERIES_FIELDS = ("generation", "consumption", "export", "revenue")
+ROLLING_FIELDS = ("rolling_7",)
+ANOMALY_Z_THRESHOLD = 2.5
+
+
+@dataclass(frozen=True)
+class EnergyAnalytics:
+    dates: np.ndarray  # datetime64[D]
+    generation: np.ndarray
+    consumption: np.ndarray
+    export: np.ndarray
+    revenue: np.ndarray
+    rolling_7: np.ndarray
+    zscores: np.ndarray
+    anomaly_indices: np.ndarray
+    trend_slope_kwh_per_day: float
+    months: np.ndarray  # datetime64[M], one entry per observed month
+    monthly_totals: Dict[str, np.ndarray]
+    totals: Dict[str, float]
+    average_generation: float
+    peak_index: int
+    week_change_percent: Optional[float]
+
+    @property
+    def size(self) -> int:
+        return int(self.dates.size)
+
+
+def _trailing_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing mean over ``window`` observations; shorter at the start."""
+    csum = np.concatenate(([0.0], np.cumsum(values)))
+    upper = np.arange(1, values.size + 1)
+    lower = np.maximum(upper - window, 0)
+    return (csum[upper] - csum[lower]) / (upper - lower)
+
+
+def compute_energy_analytics(
+    daily_series: Sequence[Dict[str, Any]],
+    *,
+    anomaly_z: float = ANOMALY_Z_THRESHOLD,
+) -> Optional[EnergyAnalytics]:
+    """Load ``daily_series`` into arrays once and derive every statistic.
+
+    ``daily_series`` is the sorted list of per-day dicts built by
+    ``build_energy_context``. Rolling windows and week-over-week change
+    count observed days, matching the original insight wording.
+    """
+    size = len(daily_series)
+    if not size:
+        return None
+
+    dates = np.array([item["date"] for item in daily_series], dtype="datetime64[D]")
+    columns = {
+        name: np.fromiter((item[name] for item in daily_series), dtype=np.float64, count=size)
+        for name in SERIES_FIELDS
+    }
+    generation = columns["generation"]
+
+    mean = generation.mean()
+    std = generation.std()
+    if std > 0:
+        zscores = (generation - mean) / std
+    else:
+        zscores = np.zeros(size)
+    anomaly_indices = np.flatnonzero(np.abs(zscores) >= anomaly_z)
+
+    slope = 0.0
+    if size >= 2:
+        offsets = (dates - dates[0]).astype(np.float64)
+        spread = offsets - offsets.mean()
+        denominator = np.dot(spread, spread)
+        if denominator > 0:
+            slope = float(np.dot(spread, generation - mean) / denominator)
+
+    month_keys = dates.astype("datetime64[M]")
+    months, month_index = np.unique(month_keys, return_inverse=True)
+    monthly_totals = {
+        name: np.bincount(month_index, weights=values, minlength=months.size)
+        for name, values in columns.items()
+    }
+
+    week_change = None
+    if size >= 14:
+        recent_total = generation[-7:].sum()
+        previous_total = generation[-14:-7].sum()
+        if previous_total:
+            week_change = float((recent_total - previous_total) / previous_total * 100)
+
+    return EnergyAnalytics(
+        dates=dates,
+        generation=generation,
+        consumption=columns["consumption"],
+        export=columns["export"],
+        revenue=columns["revenue"],
+        rolling_7=_trailing_mean(generation, 7),
+        zscores=zscores,
+        anomaly_indices=anomaly_indices,
+        trend_slope_kwh_per_day=slope,
+        months=months,
+        monthly_totals=monthly_totals,
+        totals={name: round(float(values.sum()), 2) for name, values in columns.items()},
+        average_generation=float(mean),
+        peak_index=int(np.argmax(generation)),
+        week_change_percent=week_change,
+    )
+
+
+def _friendly_date(value: np.datetime64) -> str:
+    return datetime.strptime(str(value), "%Y-%m-%d").strftime("%d %b %Y")
+
+
+def build_chart_analytics(analytics: Optional[EnergyAnalytics]) -> Dict[str, Any]:
+    """JSON-ready trend, anomaly and monthly figures for the tracker view."""
+    if analytics is None:
+        return {"trend_kwh_per_day": 0.0, "anomalies": [], "monthly": []}
+
+    return {
+        "trend_kwh_per_day": round(analytics.trend_slope_kwh_per_day, 3),
+        "anomalies": [
+            {
+                "date": str(analytics.dates[index]),
+                "generation": round(float(analytics.generation[index]), 2),
+                "zscore": round(float(analytics.zscores[index]), 2),
+            }
+            for index in analytics.anomaly_indices
+        ],
+        "monthly": [
+            {
+                "month": str(month),
+                **{name: round(float(analytics.monthly_totals[name][index]), 2) for name in SERIES_FIELDS},
+            }
+            for index, month in enumerate(analytics.months)
+        ],
+    }
+
+
+def build_insight_strings(analytics: Optional[EnergyAnalytics]) -> List[str]:
+    """Render the automated insight sentences shown on tracker and dashboard."""
+    if analytics is None:
+        return []
+
+    insights: List[str] = []
+    totals = analytics.totals
+
+    insights.append(
+        f"Average daily generation sits at {analytics.average_generation:.1f} kWh over the observed window."
+    )
+    insights.append(
+        f"Latest reading logged on {_friendly_date(analytics.dates[-1])} produced {analytics.generation[-1]:.1f} kWh."
+    )
+
+    if totals["generation"]:
+        export_ratio = (totals["export"] / totals["generation"]) * 100
+        insights.append(
+            f"Export ratio is {export_ratio:.0f}% of total generation, highlighting grid contribution potential."
+        )
+
+    peak = analytics.peak_index
+    insights.append(
+        f"Peak generation observed on {_friendly_date(analytics.dates[peak])} at {analytics.generation[peak]:.1f} kWh."
+    )
+
+    if analytics.week_change_percent is not None:
+        direction = "up" if analytics.week_change_percent >= 0 else "down"
+        insights.append(
+            f"Generation is {direction} {abs(analytics.week_change_percent):.1f}% compared to the prior week."
+        )
+    if totals["revenue"]:
+        average_revenue = totals["revenue"] / analytics.size
+        insights.append(
+            f"Revenue averages ₹{average_revenue:,.0f} per day with a cumulative ₹{totals['revenue']:,.0f}."
+        )
+
+    return insights
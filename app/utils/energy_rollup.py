@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Iterable, Mapping
+
+from sqlalchemy import case, func
+
+from ..extensions import db
+from ..models import EnergyDailyRollup, EnergyLog
+
+ROLLUP_COLUMNS = ("generation", "consumption", "export", "revenue")
+
+
+def entry_bucket(entry_type: str | None) -> str:
+    entry_type = (entry_type or "").lower()
+    if entry_type in ("generation", "export"):
+        return entry_type
+    return "consumption"
+
+
+def _as_decimal(value: Any) -> Decimal:
+    if value is None:
+        return Decimal("0")
+    if isinstance(value, Decimal):
+        return value
+    return Decimal(str(value))
+
+
+def _collapse(logs: Iterable[Any]) -> dict[tuple[int, date], dict[str, Decimal]]:
+    """Pre-sum logs per (user, day) so each rollup row is touched once."""
+    deltas: dict[tuple[int, date], dict[str, Decimal]] = defaultdict(
+        lambda: {column: Decimal("0") for column in ROLLUP_COLUMNS}
+    )
+    for log in logs:
+        if isinstance(log, Mapping):
+            user_id, log_date = log["user_id"], log["date"]
+            entry_type, kwh, revenue = log["entry_type"], log["kwh"], log.get("revenue")
+        else:
+            user_id, log_date = log.user_id, log.date
+            entry_type, kwh, revenue = log.entry_type, log.kwh, log.revenue
+        day = deltas[(user_id, log_date)]
+        day[entry_bucket(entry_type)] += _as_decimal(kwh)
+        day["revenue"] += _as_decimal(revenue)
+    return deltas
+
+
+def _upsert_insert():
+    dialect = db.session.get_bind().dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        return None
+    return insert
+
+
+def record_energy_logs(logs: Iterable[Any]) -> int:
+    """Fold new EnergyLog rows (models or insert dicts) into the daily rollup.
+
+    Runs inside the caller's transaction, so the rollup commits (or rolls
+    back) together with the logs themselves. Works for a single form entry
+    as well as for bulk ingestion batches. Returns the number of rollup
+    days touched.
+    """
+    deltas = _collapse(logs)
+    if not deltas:
+        return 0
+
+    now = datetime.utcnow()
+    rows = [
+        {"user_id": user_id, "date": day, "updated_at": now, **values}
+        for (user_id, day), values in deltas.items()
+    ]
+
+    insert = _upsert_insert()
+    if insert is not None:
+        stmt = insert(EnergyDailyRollup).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[EnergyDailyRollup.user_id, EnergyDailyRollup.date],
+            set_={
+                **{
+                    column: getattr(EnergyDailyRollup, column) + getattr(stmt.excluded, column)
+                    for column in ROLLUP_COLUMNS
+                },
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        db.session.execute(stmt)
+        return len(rows)
+
+    for row in rows:
+        rollup = db.session.get(EnergyDailyRollup, (row["user_id"], row["date"]))
+        if rollup is None:
+            db.session.add(EnergyDailyRollup(**row))
+            continue
+        for column in ROLLUP_COLUMNS:
+            setattr(rollup, column, _as_decimal(getattr(rollup, column)) + row[column])
+        rollup.updated_at = now
+    return len(rows)
+
+
+def build_rollup_totals_query(user_id: int, start: date | None = None):
+    query = db.session.query(
+        EnergyDailyRollup.date,
+        EnergyDailyRollup.generation,
+        EnergyDailyRollup.consumption,
+        EnergyDailyRollup.export,
+        EnergyDailyRollup.revenue,
+    ).filter(EnergyDailyRollup.user_id == user_id)
+    if start is not None:
+        query = query.filter(EnergyDailyRollup.date >= start)
+    return query
+
+
+def load_rollup_totals(user_id: int, start: date | None = None) -> dict[str, dict[str, float]]:
+    rows = build_rollup_totals_query(user_id, start).all()
+    return {
+        row_date.strftime("%Y-%m-%d"): {
+            "generation": float(generation or 0),
+            "consumption": float(consumption or 0),
+            "export": float(export or 0),
+            "revenue": float(revenue or 0),
+        }
+        for row_date, generation, consumption, export, revenue in rows
+    }
+
+
+def _raw_daily_query(user_id: int | None = None):
+    entry_type = func.lower(EnergyLog.entry_type)
+    query = db.session.query(
+        EnergyLog.user_id,
+        EnergyLog.date,
+        func.sum(case((entry_type == "generation", EnergyLog.kwh), else_=0)),
+        func.sum(case((entry_type.in_(["generation", "export"]), 0), else_=EnergyLog.kwh)),
+        func.sum(case((entry_type == "export", EnergyLog.kwh), else_=0)),
+        func.coalesce(func.sum(EnergyLog.revenue), 0),
+    )
+    if user_id is not None:
+        query = query.filter(EnergyLog.user_id == user_id)
+    return query.group_by(EnergyLog.user_id, EnergyLog.date)
+
+
+def find_rollup_drift(user_id: int | None = None) -> list[dict[str, Any]]:
+    """Compare the rollup with a fresh GROUP BY over energy_log."""
+    expected = {
+        (row_user, row_date): dict(zip(ROLLUP_COLUMNS, map(_as_decimal, values)))
+        for row_user, row_date, *values in _raw_daily_query(user_id).all()
+    }
+
+    rollup_query = EnergyDailyRollup.query
+    if user_id is not None:
+        rollup_query = rollup_query.filter_by(user_id=user_id)
+    actual = {
+        (row.user_id, row.date): {column: _as_decimal(getattr(row, column)) for column in ROLLUP_COLUMNS}
+        for row in rollup_query.all()
+    }
+
+    drift = []
+    zero = {column: Decimal("0") for column in ROLLUP_COLUMNS}
+    for key in sorted(expected.keys() | actual.keys()):
+        want = expected.get(key, zero)
+        have = actual.get(key, zero)
+        if any(abs(want[column] - have[column]) >= Decimal("0.01") for column in ROLLUP_COLUMNS):
+            drift.append({"user_id": key[0], "date": key[1], "expected": want, "actual": have})
+    return drift
+
+
+def rebuild_energy_rollup(user_id: int | None = None) -> int:
+    """Recompute rollup rows from energy_log. The caller commits."""
+    delete_query = EnergyDailyRollup.query
+    if user_id is not None:
+        delete_query = delete_query.filter_by(user_id=user_id)
+    delete_query.delete(synchronize_session=False)
+
+    now = datetime.utcnow()
+    rows = [
+        {"user_id": row_user, "date": row_date, "updated_at": now, **dict(zip(ROLLUP_COLUMNS, values))}
+        for row_user, row_date, *values in _raw_daily_query(user_id).all()
+    ]
+    if rows:
+        db.session.execute(db.insert(EnergyDailyRollup), rows)
+    return len(rows)
@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+import csv
+import hashlib
+import math
+import os
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from flask import Flask
+
+from ..config import Config
+
+HOURS_PER_YEAR = 8_760
+IST_OFFSET_MINUTES = 330
+
+# On-disk layout (see write_tmy_dataset):
+#   tmy.npy        int16 (cells, 3, 8760) memory-mapped: GHI W/m2, DNI W/m2,
+#                  air temperature in 0.1 degC; hours from 1 Jan 00:00 IST.
+#   tmy_index.npz  regular lat/lon grid whose nodes hold the nearest cell
+#                  (-1 when none is within range), plus cell coordinates.
+DATA_FILE = "tmy.npy"
+INDEX_FILE = "tmy_index.npz"
+TEMPERATURE_SCALE = 10.0
+
+_GHI_COLUMNS = ("ghi", "g(h)")
+_DNI_COLUMNS = ("dni", "gb(n)")
+_TEMPERATURE_COLUMNS = ("temperature", "t2m", "temp", "air temperature")
+
+
+class TmyFormatError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class TmyStation:
+    """One location's typical year, already aligned to IST hours."""
+
+    name: str
+    latitude: float
+    longitude: float
+    ghi: np.ndarray  # W/m2
+    dni: np.ndarray  # W/m2
+    temperature: np.ndarray  # degC
+
+
+@dataclass(frozen=True)
+class TmySeries:
+    cell: int
+    latitude: float
+    longitude: float
+    ghi: np.ndarray
+    dni: np.ndarray
+    temperature: np.ndarray
+
+
+def _find_column(header: Sequence[str], names: Iterable[str]) -> int:
+    lowered = [name.strip().lower() for name in header]
+    for name in names:
+        if name in lowered:
+            return lowered.index(name)
+    raise TmyFormatError(f"missing column: one of {', '.join(names)}")
+
+
+def _header_number(lines: Sequence[str], label: str) -> Optional[float]:
+    pattern = re.compile(rf"^\s*{label}[^:]*:\s*[,;\t]?\s*(-?\d+(?:\.\d+)?)", re.IGNORECASE)
+    for line in lines:
+        match = pattern.match(line)
+        if match:
+            return float(match.group(1))
+    return None
+
+
+def read_tmy_csv(path: str | Path) -> TmyStation:
+    """Parse a PVGIS or NSRDB-style TMY CSV into an IST-aligned station year.
+
+    PVGIS files carry ``Latitude (decimal degrees): ..`` header lines and a
+    ``time(UTC)`` column; NSRDB files carry a metadata row (with
+    ``Time Zone``) and Year/Month/Day/Hour/Minute columns. Leap days are
+    dropped and the series is rotated so hour 0 is 00:00-01:00 IST.
+    """
+    path = Path(path)
+    lines = path.read_text(encoding="utf-8-sig").splitlines()
+    rows = list(csv.reader(lines))
+
+    header_at = next(
+        (
+            position
+            for position, row in enumerate(rows)
+            if any(cell.strip().lower() in _GHI_COLUMNS for cell in row)
+            and any(cell.strip().lower() in _DNI_COLUMNS for cell in row)
+        ),
+        None,
+    )
+    if header_at is None:
+        raise TmyFormatError(f"{path.name}: no GHI/DNI header row")
+    header = rows[header_at]
+    lowered = [cell.strip().lower() for cell in header]
+    ghi_at = _find_column(header, _GHI_COLUMNS)
+    dni_at = _find_column(header, _DNI_COLUMNS)
+    temperature_at = _find_column(header, _TEMPERATURE_COLUMNS)
+
+    latitude = _header_number(lines[:header_at], "latitude")
+    longitude = _header_number(lines[:header_at], "longitude")
+    tz_hours = 0.0
+    if header_at >= 2 and "latitude" in [cell.strip().lower() for cell in rows[0]]:
+        meta = dict(zip((cell.strip().lower() for cell in rows[0]), rows[1]))
+        latitude = float(meta["latitude"])
+        longitude = float(meta["longitude"])
+        tz_hours = float(meta.get("time zone") or meta.get("local time zone") or 0.0)
+    if latitude is None or longitude is None:
+        raise TmyFormatError(f"{path.name}: latitude/longitude not found")
+
+    ghi: List[float] = []
+    dni: List[float] = []
+    temperature: List[float] = []
+    minute = 0
+    for row in rows[header_at + 1 :]:
+        if len(row) <= max(ghi_at, dni_at, temperature_at):
+            break  # PVGIS appends a legend after the data
+        try:
+            values = float(row[ghi_at]), float(row[dni_at]), float(row[temperature_at])
+        except ValueError:
+            break
+        if "time(utc)" in lowered:
+            stamp = row[lowered.index("time(utc)")]  # YYYYMMDD:HHMM
+            month, day, minute = int(stamp[4:6]), int(stamp[6:8]), int(stamp[11:13])
+        elif "month" in lowered and "day" in lowered:
+            month, day = int(row[lowered.index("month")]), int(row[lowered.index("day")])
+            minute = int(float(row[lowered.index("minute")])) if "minute" in lowered else 0
+        else:
+            month = day = 0
+        if month == 2 and day == 29:
+            continue
+        ghi.append(values[0])
+        dni.append(values[1])
+        temperature.append(values[2])
+
+    if len(ghi) != HOURS_PER_YEAR:
+        raise TmyFormatError(f"{path.name}: expected {HOURS_PER_YEAR} hourly rows, found {len(ghi)}")
+
+    # A reading stamped hh:mm at UTC+tz falls in IST hour hh + shift.
+    shift = math.floor((minute + IST_OFFSET_MINUTES - tz_hours * 60) / 60)
+    return TmyStation(
+        name=path.stem,
+        latitude=latitude,
+        longitude=longitude,
+        ghi=np.roll(np.clip(np.asarray(ghi), 0.0, None), shift),
+        dni=np.roll(np.clip(np.asarray(dni), 0.0, None), shift),
+        temperature=np.roll(np.asarray(temperature), shift),
+    )
+
+
+def write_tmy_dataset(
+    stations: Sequence[TmyStation],
+    directory: str | Path,
+    *,
+    step: float = 0.1,
+    max_distance_km: float = 75.0,
+) -> Dict[str, int]:
+    """Pack stations into the memory-mappable format and build the grid lookup.
+
+    Every grid node within ``max_distance_km`` of a station stores the index
+    of its nearest station, so lookups are a rounding and one array read.
+    Files are written next to the targets and renamed into place, leaving
+    workers that still map the old files unaffected.
+    """
+    if not stations:
+        raise TmyFormatError("no stations to write")
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    values = np.empty((len(stations), 3, HOURS_PER_YEAR), dtype=np.int16)
+    for position, station in enumerate(stations):
+        values[position, 0] = np.rint(np.clip(station.ghi, 0, 32_767))
+        values[position, 1] = np.rint(np.clip(station.dni, 0, 32_767))
+        values[position, 2] = np.rint(station.temperature * TEMPERATURE_SCALE)
+
+    cell_lat = np.array([station.latitude for station in stations])
+    cell_lon = np.array([station.longitude for station in stations])
+    margin = max_distance_km / 100.0 + step  # degrees; generous at Indian latitudes
+    origin = (
+        math.floor((cell_lat.min() - margin) / step) * step,
+        math.floor((cell_lon.min() - margin) / step) * step,
+    )
+    rows = int(round((cell_lat.max() + margin - origin[0]) / step)) + 1
+    cols = int(round((cell_lon.max() + margin - origin[1]) / step)) + 1
+    node_lat = (origin[0] + np.arange(rows) * step)[:, None]
+    node_lon = (origin[1] + np.arange(cols) * step)[None, :]
+
+    best = np.full((rows, cols), np.inf)
+    lookup = np.full((rows, cols), -1, dtype=np.int32)
+    km_per_degree_lon = 111.32 * np.cos(np.radians(node_lat))
+    for position in range(len(stations)):
+        distance = np.hypot((node_lat - cell_lat[position]) * 110.57, (node_lon - cell_lon[position]) * km_per_degree_lon)
+        closer = distance < best
+        best[closer] = distance[closer]
+        lookup[closer] = position
+    lookup[best > max_distance_km] = -1
+
+    data_tmp = directory / f".{DATA_FILE}.tmp"
+    index_tmp = directory / f".{INDEX_FILE}.tmp"
+    with open(data_tmp, "wb") as handle:
+        np.save(handle, values)
+    with open(index_tmp, "wb") as handle:
+        np.savez(
+            handle,
+            origin=np.array(origin),
+            step=np.array(step),
+            lookup=lookup,
+            cell_lat=cell_lat,
+            cell_lon=cell_lon,
+            names=np.array([station.name for station in stations]),
+        )
+    os.replace(data_tmp, directory / DATA_FILE)
+    os.replace(index_tmp, directory / INDEX_FILE)
+    return {"cells": len(stations), "grid_nodes": int((lookup >= 0).sum())}
+
+
+class TmyDataset:
+    def __init__(self, directory: Path):
+        index_path = directory / INDEX_FILE
+        with np.load(index_path) as index:
+            self.origin = tuple(float(value) for value in index["origin"])
+            self.step = float(index["step"])
+            self.lookup = index["lookup"]
+            self.cell_lat = index["cell_lat"]
+            self.cell_lon = index["cell_lon"]
+        self.version = hashlib.sha256(index_path.read_bytes()).hexdigest()[:16]
+        # Read-only memory map: pages come from the OS cache shared by all workers.
+        self.values = np.load(directory / DATA_FILE, mmap_mode="r")
+
+    def nearest_cell(self, latitude: float, longitude: float) -> Optional[int]:
+        row = int(round((latitude - self.origin[0]) / self.step))
+        col = int(round((longitude - self.origin[1]) / self.step))
+        if 0 <= row < self.lookup.shape[0] and 0 <= col < self.lookup.shape[1]:
+            cell = int(self.lookup[row, col])
+            return cell if cell >= 0 else None
+        return None
+
+    def series(self, cell: int) -> TmySeries:
+        block = self.values[cell]
+        return TmySeries(
+            cell=cell,
+            latitude=float(self.cell_lat[cell]),
+            longitude=float(self.cell_lon[cell]),
+            ghi=block[0].astype(np.float64),
+            dni=block[1].astype(np.float64),
+            temperature=block[2] / TEMPERATURE_SCALE,
+        )
+
+
+class TmyStore:
+    """Lazily opened, per-process handle on the TMY dataset directory."""
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+        self._dataset: Optional[TmyDataset] = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def init_app(self, app: Flask) -> None:
+        with self._lock:
+            self.directory = Path(app.config.get("TMY_DIR", self.directory))
+            self._dataset = None
+            self._loaded = False
+
+    def dataset(self) -> Optional[TmyDataset]:
+        if self._loaded:
+            return self._dataset
+        with self._lock:
+            if not self._loaded:
+                if (self.directory / INDEX_FILE).exists() and (self.directory / DATA_FILE).exists():
+                    self._dataset = TmyDataset(self.directory)
+                self._loaded = True
+            return self._dataset
+
+    def lookup(self, latitude: float, longitude: float) -> Optional[Tuple[str, int]]:
+        """(dataset version, cell) nearest to a site, or None outside coverage."""
+        dataset = self.dataset()
+        if dataset is None:
+            return None
+        cell = dataset.nearest_cell(latitude, longitude)
+        return (dataset.version, cell) if cell is not None else None
+
+
+tmy_store = TmyStore(Config.TMY_DIR)
+
+
+def tmy_version() -> str:
+    """Identifies the TMY data that yields were computed against; ``none`` without any."""
+    dataset = tmy_store.dataset()
+    return dataset.version if dataset is not None else "none"
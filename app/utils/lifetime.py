@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from .ml_scoring import calculate_financial_predictions
+
+
+@dataclass(frozen=True)
+class LifetimeAssumptions:
+    years: int = 25
+    degradation_per_year: float = 0.005  # 0.5 % output loss per year
+    tariff_escalation: float = 0.03
+    om_cost_fraction: float = 0.01  # yearly O&M as a share of gross cost
+    om_escalation: float = 0.05
+    inverter_replacement_year: Optional[int] = 12
+    inverter_cost_per_kw: float = 8_000.0  # INR, today's prices
+    inverter_cost_escalation: float = 0.0
+    discount_rate: float = 0.08
+
+
+DEFAULT_ASSUMPTIONS = LifetimeAssumptions()
+_IRR_RATE_GRID = np.linspace(-0.9, 1.0, 1_901)
+
+
+@dataclass(frozen=True)
+class LifetimeProjection:
+    years: np.ndarray
+    generation_kwh: np.ndarray
+    savings_inr: np.ndarray
+    om_cost_inr: np.ndarray
+    inverter_cost_inr: np.ndarray
+    net_cash_flow_inr: np.ndarray
+    cumulative_cash_flow_inr: np.ndarray  # includes the upfront net cost
+    upfront_cost_inr: float
+    first_year: Dict[str, Any]  # calculate_financial_predictions output
+    lifetime_savings_inr: float
+    npv_inr: float
+    irr: Optional[float]
+    payback_years: Optional[float]
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "monthly_savings_inr": self.first_year["monthly_savings_inr"],
+            "lifetime_savings_inr": round(self.lifetime_savings_inr, 2),
+            "npv_inr": round(self.npv_inr, 2),
+            "irr_percent": round(self.irr * 100, 2) if self.irr is not None else None,
+            "payback_years": round(self.payback_years, 2) if self.payback_years is not None else None,
+            "co2_tonnes_per_year": round(self.first_year["co2_avoided_kg_per_year"] / 1000.0, 3),
+        }
+
+
+def _npv(rates: np.ndarray, upfront: float, cash_flows: np.ndarray) -> np.ndarray:
+    periods = np.arange(1, cash_flows.size + 1)
+    factors = (1.0 + rates[:, None]) ** -periods[None, :]
+    return factors @ cash_flows - upfront
+
+
+def _irr(upfront: float, cash_flows: np.ndarray) -> Optional[float]:
+    """Lowest IRR with a sign change on a coarse rate grid, refined by bisection."""
+    if upfront <= 0 or not (cash_flows > 0).any():
+        return None
+    values = _npv(_IRR_RATE_GRID, upfront, cash_flows)
+    crossings = np.flatnonzero(np.sign(values[:-1]) != np.sign(values[1:]))
+    if not crossings.size:
+        return None
+    low, high = _IRR_RATE_GRID[crossings[0]], _IRR_RATE_GRID[crossings[0] + 1]
+    low_value = values[crossings[0]]
+    for _ in range(50):
+        mid = (low + high) / 2
+        mid_value = _npv(np.array([mid]), upfront, cash_flows)[0]
+        if np.sign(mid_value) == np.sign(low_value):
+            low, low_value = mid, mid_value
+        else:
+            high = mid
+    return float((low + high) / 2)
+
+
+def _payback(upfront: float, cumulative: np.ndarray, cash_flows: np.ndarray) -> Optional[float]:
+    if upfront <= 0:
+        return 0.0
+    recovered = np.flatnonzero(cumulative >= 0)
+    if not recovered.size:
+        return None
+    year = int(recovered[0])
+    before = cumulative[year - 1] if year else -upfront
+    # Interpolate within the year the balance turns positive.
+    return float(year + (-before / cash_flows[year]))
+
+
+def simulate_lifetime(
+    *,
+    system_size_kw: float,
+    annual_generation_kwh: float,
+    tariff_rate_inr_per_kwh: float,
+    gross_cost_inr: float,
+    subsidy_amount_inr: float,
+    self_consumption_ratio: float = 0.8,
+    assumptions: LifetimeAssumptions = DEFAULT_ASSUMPTIONS,
+) -> LifetimeProjection:
+    """Year-by-year cash flows over the system lifetime.
+
+    Year one matches ``calculate_financial_predictions``; later years
+    apply panel degradation, tariff and O&M escalation and an optional
+    inverter replacement, all as NumPy arrays over the years.
+    """
+    first_year = calculate_financial_predictions(
+        system_size_kw=system_size_kw,
+        annual_generation_kwh=annual_generation_kwh,
+        tariff_rate_inr_per_kwh=tariff_rate_inr_per_kwh,
+        gross_cost_inr=gross_cost_inr,
+        subsidy_amount_inr=subsidy_amount_inr,
+        self_consumption_ratio=self_consumption_ratio,
+    )
+    upfront = gross_cost_inr - subsidy_amount_inr
+
+    years = np.arange(1, assumptions.years + 1)
+    elapsed = years - 1
+    generation = annual_generation_kwh * (1.0 - assumptions.degradation_per_year) ** elapsed
+    savings = generation * self_consumption_ratio * tariff_rate_inr_per_kwh * (1.0 + assumptions.tariff_escalation) ** elapsed
+    om_cost = gross_cost_inr * assumptions.om_cost_fraction * (1.0 + assumptions.om_escalation) ** elapsed
+    inverter_cost = np.where(
+        years == assumptions.inverter_replacement_year,
+        system_size_kw * assumptions.inverter_cost_per_kw * (1.0 + assumptions.inverter_cost_escalation) ** elapsed,
+        0.0,
+    )
+    cash_flows = savings - om_cost - inverter_cost
+    cumulative = np.cumsum(cash_flows) - upfront
+
+    return LifetimeProjection(
+        years=years,
+        generation_kwh=generation,
+        savings_inr=savings,
+        om_cost_inr=om_cost,
+        inverter_cost_inr=inverter_cost,
+        net_cash_flow_inr=cash_flows,
+        cumulative_cash_flow_inr=cumulative,
+        upfront_cost_inr=upfront,
+        first_year=first_year,
+        lifetime_savings_inr=float(cash_flows.sum()),
+        npv_inr=float(_npv(np.array([assumptions.discount_rate]), upfront, cash_flows)[0]),
+        irr=_irr(upfront, cash_flows),
+        payback_years=_payback(upfront, cumulative, cash_flows),
+    )
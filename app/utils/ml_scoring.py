@@ -5,7 +5,13 @@ Includes subsidy matching, vendor scoring, and financial predictions
 from __future__ import annotations
 
 import math
-from typing import Optional
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Any, Optional, Sequence, Union
+
+import numpy as np
+
+from .solar_yield import DEFAULT_ANNUAL_PRODUCTION_PER_KW, simulate_yield
 
 
 def calculate_subsidy_match_score(
@@ -99,6 +105,79 @@ def calculate_subsidy_match_score(
     return round(final_score, 1)
 
 
+@lru_cache(maxsize=4096)
+def _lowered(values: tuple) -> frozenset:
+    return frozenset(str(value).lower() for value in values)
+
+
+def _scheme_field(scheme: Any, name: str, default: Any) -> Any:
+    if isinstance(scheme, Mapping):
+        return scheme.get(name, default)
+    return getattr(scheme, name, default)
+
+
+def calculate_subsidy_match_scores(
+    *,
+    schemes: Sequence[Any],
+    user_system_size_kw: float,
+    user_annual_consumption_kwh: Optional[float],
+    user_state: str,
+    user_consumer_segment: str,
+    gross_cost_inr: float,
+    subsidy_amount_inr: float,
+    ease_of_claim: Union[float, Sequence[float]] = 0.5,
+) -> np.ndarray:
+    """
+    Batch version of ``calculate_subsidy_match_score``.
+
+    Scores every candidate at once: the user-level features are computed a
+    single time and the per-scheme ones (state, segment, ease of claim) as
+    NumPy columns. ``schemes`` may be dicts or ``SchemeMatch`` objects and
+    ``ease_of_claim`` a scalar or one value per scheme. Returns a float
+    array equal, element for element, to calling the scalar function.
+    """
+    count = len(schemes)
+    user_state_key = user_state.lower()
+    user_segment_key = user_consumer_segment.lower()
+
+    coverage = np.array([_scheme_field(scheme, "coverage", "national") for scheme in schemes], dtype=object)
+    state_match = np.fromiter(
+        (user_state_key in _lowered(tuple(_scheme_field(scheme, "states", []))) for scheme in schemes),
+        dtype=bool,
+        count=count,
+    )
+    segment_match = np.fromiter(
+        (user_segment_key in _lowered(tuple(_scheme_field(scheme, "consumer_segments", []))) for scheme in schemes),
+        dtype=bool,
+        count=count,
+    )
+    ease = np.broadcast_to(np.asarray(ease_of_claim, dtype=np.float64), (count,))
+
+    # Features are accumulated in the same order as the scalar model so the
+    # floating-point sums match exactly.
+    score = np.zeros(count)
+    if gross_cost_inr > 0:
+        score += min(subsidy_amount_inr / gross_cost_inr, 1.0) * 30
+    score += np.where((coverage == "state") & state_match, 15.0, np.where(coverage == "national", 10.0, 0.0))
+    score += np.where(segment_match, 10.0, 0.0)
+    if 1.0 <= user_system_size_kw <= 10.0:
+        score += max(0, 20 * (1 - abs(user_system_size_kw - 5.0) / 5.0))
+    else:
+        score += 10
+    score += ease * 10
+    if gross_cost_inr > 0 and user_annual_consumption_kwh:
+        annual_savings = user_annual_consumption_kwh * 0.8 * 6.0
+        if annual_savings > 0:
+            payback_years = (gross_cost_inr - subsidy_amount_inr) / annual_savings
+            score += max(0, 15 * (1 - (payback_years - 5) / 15))
+
+    score = np.clip(score, 0, 100)
+    # np.round rounds via a scaled multiply; use Python's round on the few
+    # distinct values instead so results stay identical to the scalar model.
+    distinct, inverse = np.unique(score, return_inverse=True)
+    return np.array([round(float(value), 1) for value in distinct])[inverse.reshape(-1)]
+
+
 def calculate_vendor_score(
     *,
     rating: float,
@@ -167,11 +246,13 @@ def calculate_vendor_score(
 def calculate_financial_predictions(
     *,
     system_size_kw: float,
-    annual_generation_kwh: float,
+    annual_generation_kwh: float | None = None,
     tariff_rate_inr_per_kwh: float,
     gross_cost_inr: float,
     subsidy_amount_inr: float,
     self_consumption_ratio: float = 0.8,  # 80% self-consumption
+    latitude: float | None = None,
+    longitude: float | None = None,
 ) -> dict:
     """
     Financial and CO₂ savings prediction model.
@@ -185,11 +266,13 @@ def calculate_financial_predictions(
     
     Args:
         system_size_kw: System size in kW
-        annual_generation_kwh: Estimated annual generation
+        annual_generation_kwh: Estimated annual generation; when omitted it is
+            simulated for the site at latitude/longitude (nearest TMY cell)
         tariff_rate_inr_per_kwh: Local electricity tariff
         gross_cost_inr: Total system cost
         subsidy_amount_inr: Subsidy amount
         self_consumption_ratio: Ratio of generation self-consumed (0-1)
+        latitude, longitude: Site location, used only without annual_generation_kwh
     
     Returns:
         Dict with predictions:
@@ -199,6 +282,12 @@ def calculate_financial_predictions(
         - co2_avoided_kg_per_year
         - net_cost_inr
     """
+    if annual_generation_kwh is None:
+        if latitude is not None and longitude is not None:
+            annual_generation_kwh = system_size_kw * simulate_yield(latitude, longitude, abs(latitude)).annual_kwh_per_kw
+        else:
+            annual_generation_kwh = system_size_kw * DEFAULT_ANNUAL_PRODUCTION_PER_KW
+
     # Net cost after subsidy
     net_cost_inr = gross_cost_inr - subsidy_amount_inr
     
@@ -230,6 +319,37 @@ def calculate_financial_predictions(
     }
 
 
+def financial_prediction_arrays(
+    *,
+    annual_generation_kwh: np.ndarray,
+    tariff_rate_inr_per_kwh: np.ndarray | float,
+    gross_cost_inr: np.ndarray,
+    subsidy_amount_inr: np.ndarray,
+    self_consumption_ratio: float = 0.8,
+) -> dict[str, np.ndarray]:
+    """
+    Array form of ``calculate_financial_predictions`` for grids of inputs.
+
+    Same formulas, without the rounding; ``payback_period_years`` is NaN
+    where there are no savings (``None`` in the scalar version).
+    """
+    net_cost_inr = gross_cost_inr - subsidy_amount_inr
+    self_consumed_kwh = annual_generation_kwh * self_consumption_ratio
+    annual_savings_inr = self_consumed_kwh * tariff_rate_inr_per_kwh
+    annual_savings_inr, net_cost_inr = np.broadcast_arrays(annual_savings_inr, net_cost_inr)
+
+    payback_period_years = np.full(annual_savings_inr.shape, np.nan)
+    np.divide(net_cost_inr, annual_savings_inr, out=payback_period_years, where=annual_savings_inr > 0)
+    return {
+        "monthly_savings_inr": annual_savings_inr / 12.0,
+        "annual_savings_inr": annual_savings_inr,
+        "payback_period_years": payback_period_years,
+        "co2_avoided_kg_per_year": annual_generation_kwh * 0.82,
+        "net_cost_inr": net_cost_inr,
+        "self_consumed_kwh": self_consumed_kwh,
+    }
+
+
 def analyze_sentiment_simple(text: str) -> float:
     """
     Simple sentiment analysis for vendor reviews.
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from datetime import date
+from statistics import median
+from typing import Any, Dict, List
+
+from sqlalchemy import func
+
+from ..extensions import db
+from ..models import EnergyLog
+
+DEFAULT_PANEL_CAPACITY_KWP = 1.0
+
+
+def build_panel_generation_query(user_id: int, *, start: date | None = None, end: date | None = None):
+    """One GROUP BY panel_id over generation logs in the date range."""
+    query = db.session.query(
+        EnergyLog.panel_id,
+        func.sum(EnergyLog.kwh),
+        func.count(func.distinct(EnergyLog.date)),
+        func.min(EnergyLog.date),
+        func.max(EnergyLog.date),
+    ).filter(
+        EnergyLog.user_id == user_id,
+        EnergyLog.panel_id.isnot(None),
+        func.lower(EnergyLog.entry_type) == "generation",
+    )
+    if start is not None:
+        query = query.filter(EnergyLog.date >= start)
+    if end is not None:
+        query = query.filter(EnergyLog.date <= end)
+    return query.group_by(EnergyLog.panel_id)
+
+
+def load_panel_generation(
+    user_id: int, *, start: date | None = None, end: date | None = None
+) -> List[tuple[str, float, int, date, date]]:
+    return [
+        (panel_id, float(kwh or 0), int(days or 0), first_day, last_day)
+        for panel_id, kwh, days, first_day, last_day in build_panel_generation_query(
+            user_id, start=start, end=end
+        ).all()
+    ]
+
+
+def build_panel_performance(
+    user_id: int,
+    *,
+    start: date | None = None,
+    end: date | None = None,
+    capacity_kwp: float = DEFAULT_PANEL_CAPACITY_KWP,
+    threshold_percent: float = 15.0,
+) -> Dict[str, Any]:
+    """Rank panels by specific yield and flag the ones trailing their peers.
+
+    Specific yield is kWh per kWp per reporting day, so panels that missed
+    days are not penalised for the gap. Capacities are not stored per panel
+    yet, so ``capacity_kwp`` applies to every panel. A panel is flagged when
+    its yield is more than ``threshold_percent`` below the median panel; the
+    median keeps one dead string from dragging the reference down.
+    """
+    capacity_kwp = capacity_kwp if capacity_kwp and capacity_kwp > 0 else DEFAULT_PANEL_CAPACITY_KWP
+    rows = load_panel_generation(user_id, start=start, end=end)
+
+    panels = []
+    for panel_id, kwh, days, first_day, last_day in rows:
+        specific_yield = kwh / capacity_kwp / days if days else 0.0
+        panels.append(
+            {
+                "panel_id": panel_id,
+                "generation_kwh": round(kwh, 2),
+                "reporting_days": days,
+                "first_date": first_day.isoformat() if first_day else None,
+                "last_date": last_day.isoformat() if last_day else None,
+                "specific_yield": specific_yield,
+            }
+        )
+    panels.sort(key=lambda item: item["specific_yield"], reverse=True)
+
+    peer_median = median(item["specific_yield"] for item in panels) if panels else 0.0
+    for rank, item in enumerate(panels, start=1):
+        shortfall = 0.0
+        if peer_median > 0:
+            shortfall = (peer_median - item["specific_yield"]) / peer_median * 100
+        item["rank"] = rank
+        item["shortfall_percent"] = round(max(shortfall, 0.0), 1)
+        item["flagged"] = len(panels) > 1 and shortfall > threshold_percent
+        item["specific_yield"] = round(item["specific_yield"], 3)
+
+    return {
+        "panels": panels,
+        "flagged_count": sum(1 for item in panels if item["flagged"]),
+        "median_specific_yield": round(peer_median, 3),
+        "capacity_kwp": capacity_kwp,
+        "threshold_percent": threshold_percent,
+        "start": start.isoformat() if start else None,
+        "end": end.isoformat() if end else None,
+    }
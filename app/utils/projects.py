@@ -1,67 +1,57 @@
 from __future__ import annotations
 
-from datetime import date, datetime, timedelta
-from types import SimpleNamespace
 from typing import Any, List
 
+from sqlalchemy import func
+
+from ..extensions import db
 from ..models import Project
+from .sample_data import sample_projects as sample_projects_cached
 
 
-def build_projects_context(user_id: int) -> dict[str, Any]:
-    projects: List[Project] = (
-        Project.query.filter_by(user_id=user_id)
+def build_recent_projects_query(user_id: int, limit: int):
+    return (
+        db.session.query(Project, func.count().over().label("total"))
+        .filter(Project.user_id == user_id)
         .order_by(Project.created_at.desc())
-        .all()
+        .limit(limit)
     )
+
+
+def load_recent_projects(user_id: int, limit: int) -> tuple[List[Project], int]:
+    """Return the newest ``limit`` projects and the user's total in one query."""
+    rows = build_recent_projects_query(user_id, limit).all()
+    if not rows:
+        return [], 0
+    return [project for project, _total in rows], rows[0].total
+
+
+def build_projects_context(user_id: int, limit: int | None = None) -> dict[str, Any]:
+    if limit is None:
+        projects: List[Project] = (
+            Project.query.filter_by(user_id=user_id)
+            .order_by(Project.created_at.desc())
+            .all()
+        )
+        total = len(projects)
+    else:
+        projects, total = load_recent_projects(user_id, limit)
     has_real_projects = bool(projects)
 
     if has_real_projects:
         return {
             "projects": projects,
             "has_real_projects": True,
+            "total": total,
         }
 
-    sample_projects = [
-        SimpleNamespace(
-            id=idx + 1,
-            name=name,
-            installer=installer,
-            detail=detail,
-            system_type=system_type,
-            installation_date=installation_date,
-            image_filename=None,
-            created_at=created_at,
-        )
-        for idx, (name, installer, detail, system_type, installation_date, created_at) in enumerate([
-            (
-                "Residential Rooftop - Main Building",
-                "GreenEnergy Solutions",
-                "5 kW on-grid system installed on concrete rooftop. Net metering enabled with local DISCOM.",
-                "on-grid",
-                date.today() - timedelta(days=120),
-                datetime.now() - timedelta(days=120),
-            ),
-            (
-                "Garage Solar Installation",
-                "SolarTech India",
-                "3 kW hybrid system with battery backup for garage and workshop area.",
-                "hybrid",
-                date.today() - timedelta(days=85),
-                datetime.now() - timedelta(days=85),
-            ),
-            (
-                "Community Solar Project",
-                "UrbanSpark Rooftech",
-                "Shared 10 kW installation serving 4 residential units in cooperative housing.",
-                "shared",
-                date.today() - timedelta(days=45),
-                datetime.now() - timedelta(days=45),
-            ),
-        ])
-    ]
+    sample_projects = sample_projects_cached()
+    if limit is not None:
+        sample_projects = sample_projects[:limit]
 
     return {
         "projects": sample_projects,
         "has_real_projects": False,
+        "total": len(sample_projects),
     }
 
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+from typing import Any, Callable
+
+from sqlalchemy import text
+
+from ..extensions import db
+from ..models import Project, Reminder, SubsidySubmission
+from .dashboard import DASHBOARD_RECENT_LIMIT
+from .energy import LOG_PAGE_SIZE, build_log_page_query, build_recent_logs_query, resolve_window
+from .energy_rollup import build_rollup_totals_query
+from .panels import build_panel_generation_query
+from .projects import build_recent_projects_query
+
+
+def _route_queries(user_id: int) -> dict[str, Callable[[], Any]]:
+    """The per-user list queries issued by each route, keyed by endpoint.
+
+    Built by the same helpers the routes call, so the check follows any
+    change to their filters or ordering.
+    """
+    _window, start = resolve_window(None)
+    # Any position works: EXPLAIN only needs the shape of the keyset predicate.
+    position = (date.today(), datetime.utcnow(), 2**31 - 1)
+    return {
+        "dashboard.index (recent logs)": lambda: build_recent_logs_query(user_id, DASHBOARD_RECENT_LIMIT),
+        "tracker.index (first log page)": lambda: build_log_page_query(user_id, start=start),
+        "tracker.index (next log page)": lambda: build_log_page_query(
+            user_id, start=start, position=position, page_size=LOG_PAGE_SIZE
+        ),
+        "tracker.index / dashboard.index (daily rollup)": lambda: build_rollup_totals_query(user_id, start),
+        "tracker.panels (per-panel GROUP BY)": lambda: build_panel_generation_query(user_id, start=start),
+        "reminders.list_reminders": lambda: (
+            Reminder.query.filter_by(user_id=user_id).order_by(Reminder.due_date, Reminder.due_time)
+        ),
+        "projects.list_projects": lambda: (
+            Project.query.filter_by(user_id=user_id).order_by(Project.created_at.desc())
+        ),
+        "dashboard.index (recent projects)": lambda: build_recent_projects_query(user_id, DASHBOARD_RECENT_LIMIT),
+        "profile.view_profile": lambda: (
+            SubsidySubmission.query.filter_by(user_id=user_id).order_by(SubsidySubmission.created_at.desc())
+        ),
+    }
+
+
+def _plan_lines(sql: str, dialect: str) -> list[str]:
+    if dialect == "sqlite":
+        rows = db.session.execute(text(f"EXPLAIN QUERY PLAN {sql}")).all()
+        return [str(row[-1]) for row in rows]
+    if dialect == "postgresql":
+        # Tiny dev tables make the planner prefer a seq scan regardless of
+        # indexes; disabling it shows whether an index path exists at all.
+        db.session.execute(text("SET LOCAL enable_seqscan = off"))
+        rows = db.session.execute(text(f"EXPLAIN {sql}")).all()
+        return [str(row[0]) for row in rows]
+    raise ValueError(f"EXPLAIN check is not supported for dialect {dialect!r}")
+
+
+def _is_full_scan(line: str, dialect: str) -> bool:
+    if dialect == "sqlite":
+        detail = line.upper()
+        # "SCAN (subquery-N)" reads a materialized subquery, not a table.
+        return detail.startswith("SCAN") and "USING" not in detail and not detail.startswith("SCAN (")
+    return "Seq Scan" in line
+
+
+def explain_route_queries(user_id: int = 1) -> list[dict[str, Any]]:
+    """Run EXPLAIN for every per-user route query.
+
+    Each report carries the raw plan lines plus ``uses_index`` (no full
+    table scan) and ``sorts_in_memory`` (SQLite needed a temp b-tree or
+    Postgres added a Sort node, i.e. the index order was not usable).
+    """
+    dialect = db.session.get_bind().dialect
+    reports = []
+    try:
+        for endpoint, build_query in _route_queries(user_id).items():
+            statement = build_query().statement
+            sql = str(statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+            plan = _plan_lines(sql, dialect.name)
+            reports.append(
+                {
+                    "endpoint": endpoint,
+                    "plan": plan,
+                    "uses_index": not any(_is_full_scan(line, dialect.name) for line in plan),
+                    "sorts_in_memory": any(
+                        "TEMP B-TREE" in line.upper() or line.lstrip().startswith("Sort")
+                        for line in plan
+                    ),
+                }
+            )
+    finally:
+        db.session.rollback()
+    return reports
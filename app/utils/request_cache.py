@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from functools import wraps
+from typing import Any, Callable, TypeVar
+
+from flask import g, has_app_context
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def request_cached(func: F) -> F:
+    """Memoize ``func`` for the lifetime of the current app/request context.
+
+    Results live on ``flask.g``, so widgets rendered in the same request
+    share one query while the next request starts fresh. Outside an app
+    context the function is simply called.
+    """
+
+    @wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if not has_app_context():
+            return func(*args, **kwargs)
+        cache = g.setdefault("_request_cache", {})
+        key = (func.__module__, func.__qualname__, args, tuple(sorted(kwargs.items())))
+        if key not in cache:
+            cache[key] = func(*args, **kwargs)
+        return cache[key]
+
+    def clear() -> None:
+        if has_app_context():
+            g.pop("_request_cache", None)
+
+    wrapper.cache_clear = clear  # type: ignore[attr-defined]
+    return wrapper  # type: ignore[return-value]
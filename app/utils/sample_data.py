@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import random
+import threading
+from datetime import date, datetime, time, timedelta
+from functools import wraps
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Tuple, TypeVar
+
+T = TypeVar("T")
+
+SAMPLE_SEED = "solaris-sample"
+SAMPLE_ENERGY_DAYS = 30
+SAMPLE_ENERGY_LOGS = 6
+
+
+def daily_cached(func: Callable[[], T]) -> Callable[[], T]:
+    """Cache a zero-argument builder in-process until the date changes.
+
+    Callers share the cached object and must treat it as read-only.
+    """
+    lock = threading.Lock()
+    state: Dict[str, Any] = {"day": None, "value": None}
+
+    @wraps(func)
+    def wrapper() -> T:
+        today = date.today()
+        if state["day"] != today:
+            with lock:
+                if state["day"] != today:
+                    state["value"] = func()
+                    state["day"] = today
+        return state["value"]
+
+    return wrapper
+
+
+def _rng(kind: str, day: date) -> random.Random:
+    # String seeds hash deterministically (independent of PYTHONHASHSEED),
+    # so every worker produces the same demo data for the same day.
+    return random.Random(f"{SAMPLE_SEED}:{kind}:{day.isoformat()}")
+
+
+@daily_cached
+def sample_energy_days() -> Tuple[Dict[str, Dict[str, float]], List[SimpleNamespace]]:
+    """Demo daily totals for the last 30 days plus the demo log entries."""
+    today = date.today()
+    rng = _rng("energy", today)
+    base_date = today - timedelta(days=SAMPLE_ENERGY_DAYS - 1)
+
+    daily_totals: Dict[str, Dict[str, float]] = {}
+    for index in range(SAMPLE_ENERGY_DAYS):
+        current_date = base_date + timedelta(days=index)
+        generation = round(rng.uniform(18.0, 34.0), 2)
+        export = round(generation * rng.uniform(0.35, 0.6), 2)
+        consumption = round(max(generation - export + rng.uniform(-3.5, 3.5), 0.0), 2)
+        revenue = round(export * rng.uniform(5.5, 7.2), 2)
+        daily_totals[current_date.strftime("%Y-%m-%d")] = {
+            "generation": generation,
+            "consumption": consumption,
+            "export": export,
+            "revenue": revenue,
+        }
+
+    sample_logs = [
+        SimpleNamespace(
+            entry_type="generation",
+            date=datetime.strptime(date_key, "%Y-%m-%d").date(),
+            kwh=totals["generation"],
+            revenue=totals["revenue"],
+            panel_id=f"SOLAR-{index + 101}",
+            note="Automated record generated for visualization.",
+        )
+        for index, (date_key, totals) in enumerate(sorted(daily_totals.items())[-SAMPLE_ENERGY_LOGS:])
+    ]
+    return daily_totals, sample_logs
+
+
+@daily_cached
+def sample_projects() -> List[SimpleNamespace]:
+    today = date.today()
+    morning = datetime.combine(today, time(9, 0))
+    return [
+        SimpleNamespace(
+            id=idx + 1,
+            name=name,
+            installer=installer,
+            detail=detail,
+            system_type=system_type,
+            installation_date=today - timedelta(days=days_ago),
+            image_filename=None,
+            created_at=morning - timedelta(days=days_ago),
+        )
+        for idx, (name, installer, detail, system_type, days_ago) in enumerate([
+            (
+                "Residential Rooftop - Main Building",
+                "GreenEnergy Solutions",
+                "5 kW on-grid system installed on concrete rooftop. Net metering enabled with local DISCOM.",
+                "on-grid",
+                120,
+            ),
+            (
+                "Garage Solar Installation",
+                "SolarTech India",
+                "3 kW hybrid system with battery backup for garage and workshop area.",
+                "hybrid",
+                85,
+            ),
+            (
+                "Community Solar Project",
+                "UrbanSpark Rooftech",
+                "Shared 10 kW installation serving 4 residential units in cooperative housing.",
+                "shared",
+                45,
+            ),
+        ])
+    ]
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Tuple
+
+import numpy as np
+
+from .ml_scoring import financial_prediction_arrays
+from .subsidy import DEFAULT_ANNUAL_PRODUCTION_PER_KW, estimate_subsidy_arrays
+
+# Axis name -> (steps, low factor, high factor) around the recommended point.
+# Odd step counts keep the recommended value exactly on the grid;
+# 21 x 17 x 13 = 4,641 cells.
+SWEEP_AXES: Dict[str, Tuple[int, float, float]] = {
+    "system_kw": (21, 0.5, 1.5),
+    "tariff": (17, 0.6, 1.4),
+    "cost_per_kw": (13, 0.7, 1.3),
+}
+MIN_SYSTEM_KW = 0.5
+MAX_SYSTEM_KW = 10.0
+
+# Metric -> (scale of one integer step in the payload, axes it depends on).
+# Net cost ignores the tariff and savings ignore the installed cost, so
+# those two are sent as 2-D grids rather than repeated along the third axis.
+SWEEP_METRICS: Dict[str, Tuple[float, Tuple[str, ...]]] = {
+    "net_cost_inr": (100.0, ("system_kw", "cost_per_kw")),
+    "annual_savings_inr": (10.0, ("system_kw", "tariff")),
+    "payback_period_years": (0.1, ("system_kw", "tariff", "cost_per_kw")),
+}
+
+
+def _axis(centre: float, steps: int, low: float, high: float) -> np.ndarray:
+    values = np.linspace(centre * low, centre * high, steps)
+    values[steps // 2] = centre
+    return values
+
+
+def sensitivity_sweep(
+    *,
+    system_kw: float,
+    tariff: float,
+    cost_per_kw: float,
+    self_consumption_ratio: float = 0.8,
+    annual_production_per_kw: float = DEFAULT_ANNUAL_PRODUCTION_PER_KW,
+) -> Dict[str, Any]:
+    """Net cost, savings and payback over a size x tariff x cost grid.
+
+    The grid is evaluated in one broadcast pass through
+    ``estimate_subsidy_arrays`` and ``financial_prediction_arrays``. Each
+    metric is returned over only the ``axes`` it depends on, as a flat,
+    C-ordered list of integers in units of ``scale`` (``null`` where
+    undefined) plus its min/max for colouring.
+    """
+    centres = {"system_kw": system_kw, "tariff": tariff, "cost_per_kw": cost_per_kw}
+    axes = {name: _axis(centres[name], *spec) for name, spec in SWEEP_AXES.items()}
+    axes["system_kw"] = np.clip(axes["system_kw"], MIN_SYSTEM_KW, MAX_SYSTEM_KW)
+
+    sizes = axes["system_kw"][:, None, None]
+    tariffs = axes["tariff"][None, :, None]
+    costs = axes["cost_per_kw"][None, None, :]
+
+    subsidy = estimate_subsidy_arrays(sizes, cost_per_kw=costs)
+    financials = financial_prediction_arrays(
+        annual_generation_kwh=sizes * annual_production_per_kw,
+        tariff_rate_inr_per_kwh=tariffs,
+        gross_cost_inr=subsidy["gross_cost"],
+        subsidy_amount_inr=subsidy["central"] + subsidy["state_subsidy"],
+        self_consumption_ratio=self_consumption_ratio,
+    )
+    shape = (sizes.shape[0], tariffs.shape[1], costs.shape[2])
+    grids = {
+        "net_cost_inr": subsidy["net_cost"],
+        "annual_savings_inr": financials["annual_savings_inr"],
+        "payback_period_years": financials["payback_period_years"],
+    }
+
+    order = list(SWEEP_AXES)
+    metrics = {}
+    for name, (scale, metric_axes) in SWEEP_METRICS.items():
+        # Broadcast, then keep index 0 along the axes the metric does not vary with.
+        grid = np.broadcast_to(grids[name], shape)[
+            tuple(slice(None) if axis in metric_axes else 0 for axis in order)
+        ]
+        finite = np.isfinite(grid)
+        steps = np.rint(np.where(finite, grid, 0.0) / scale).astype(np.int64).ravel().tolist()
+        if not finite.all():
+            steps = [value if ok else None for value, ok in zip(steps, finite.ravel().tolist())]
+        metrics[name] = {
+            "scale": scale,
+            "axes": list(metric_axes),
+            "min": float(grid[finite].min()) if finite.any() else None,
+            "max": float(grid[finite].max()) if finite.any() else None,
+            "values": steps,
+        }
+
+    return {
+        "shape": list(shape),
+        "order": order,
+        "axes": {name: np.round(values, 2).tolist() for name, values in axes.items()},
+        "recommended": [int(np.argmin(np.abs(axes[name] - centres[name]))) for name in SWEEP_AXES],
+        "metrics": metrics,
+    }
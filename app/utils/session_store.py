@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from flask import Flask, Request, Response
+from flask import session as request_session
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SessionInterface, SessionMixin
+from flask_login import user_logged_in, user_logged_out
+from itsdangerous import BadSignature, Signer
+from werkzeug.datastructures import CallbackDict
+
+_serializer = TaggedJSONSerializer()
+
+
+class SessionStore(ABC):
+    """Backend interface: opaque session id -> serialized session payload."""
+
+    @abstractmethod
+    def load(self, sid: str) -> Optional[str]:
+        ...
+
+    @abstractmethod
+    def save(self, sid: str, payload: str, ttl: float) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, sid: str) -> None:
+        ...
+
+    def purge_expired(self) -> int:
+        return 0
+
+
+class MemorySessionStore(SessionStore):
+    """Per-process store with TTL eviction, for development and tests."""
+
+    def __init__(self, sweep_interval: float = 60.0):
+        self._items: Dict[str, tuple[float, str]] = {}
+        self._lock = threading.Lock()
+        self._sweep_interval = sweep_interval
+        self._next_sweep = time.monotonic() + sweep_interval
+
+    def load(self, sid: str) -> Optional[str]:
+        with self._lock:
+            item = self._items.get(sid)
+            if item is None:
+                return None
+            expires_at, payload = item
+            if expires_at <= time.monotonic():
+                del self._items[sid]
+                return None
+            return payload
+
+    def save(self, sid: str, payload: str, ttl: float) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._items[sid] = (now + ttl, payload)
+            if now >= self._next_sweep:
+                self._sweep(now)
+
+    def delete(self, sid: str) -> None:
+        with self._lock:
+            self._items.pop(sid, None)
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            return self._sweep(time.monotonic())
+
+    def _sweep(self, now: float) -> int:
+        expired = [sid for sid, (expires_at, _payload) in self._items.items() if expires_at <= now]
+        for sid in expired:
+            del self._items[sid]
+        self._next_sweep = now + self._sweep_interval
+        return len(expired)
+
+
+class SQLiteSessionStore(SessionStore):
+    """Local SQLite file shared by every worker process on the host."""
+
+    def __init__(self, path: str | Path, sweep_interval: float = 300.0):
+        self.path = str(path)
+        # Connections are opened lazily per process and thread: a connection
+        # inherited across fork (preloaded or pool workers) must not be used.
+        self._locals: Dict[int, threading.local] = {}
+        self._sweep_interval = sweep_interval
+        self._next_sweep = 0.0
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        with closing(sqlite3.connect(self.path, timeout=5.0, isolation_level=None)) as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS session_store ("
+                "sid TEXT PRIMARY KEY, payload TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS ix_session_store_expires_at ON session_store (expires_at)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        local = self._locals.get(os.getpid())
+        if local is None:
+            local = self._locals.setdefault(os.getpid(), threading.local())
+        connection = getattr(local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            connection.execute("PRAGMA synchronous=NORMAL")
+            local.connection = connection
+        return connection
+
+    def load(self, sid: str) -> Optional[str]:
+        row = self._connect().execute(
+            "SELECT payload FROM session_store WHERE sid = ? AND expires_at > ?", (sid, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def save(self, sid: str, payload: str, ttl: float) -> None:
+        now = time.time()
+        connection = self._connect()
+        connection.execute(
+            "INSERT INTO session_store (sid, payload, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(sid) DO UPDATE SET payload = excluded.payload, expires_at = excluded.expires_at",
+            (sid, payload, now + ttl),
+        )
+        if now >= self._next_sweep:
+            self._next_sweep = now + self._sweep_interval
+            self.purge_expired()
+
+    def delete(self, sid: str) -> None:
+        self._connect().execute("DELETE FROM session_store WHERE sid = ?", (sid,))
+
+    def purge_expired(self) -> int:
+        cursor = self._connect().execute("DELETE FROM session_store WHERE expires_at <= ?", (time.time(),))
+        return cursor.rowcount
+
+
+class ServerSession(CallbackDict, SessionMixin):
+    def __init__(self, initial: Optional[Dict[str, Any]] = None, sid: Optional[str] = None, payload: str = ""):
+        def on_update(_self: "ServerSession") -> None:
+            _self.modified = True
+
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.loaded_payload = payload
+        self.modified = False
+
+
+class ServerSideSessionInterface(SessionInterface):
+    """Keeps session data in a ``SessionStore``; the cookie holds a signed id.
+
+    The payload is compared with what was loaded when the response is
+    saved, so in-place changes to nested values (the journey dict) are
+    persisted even without ``session.modified``.
+    """
+
+    salt = "solaris-server-session"
+
+    def __init__(self, store: SessionStore):
+        self.store = store
+
+    def _signer(self, app: Flask) -> Optional[Signer]:
+        if not app.secret_key:
+            return None
+        return Signer(app.secret_key, salt=self.salt)
+
+    def open_session(self, app: Flask, request: Request) -> Optional[ServerSession]:
+        signer = self._signer(app)
+        if signer is None:
+            return None
+        cookie = request.cookies.get(self.get_cookie_name(app))
+        if cookie:
+            try:
+                sid = signer.unsign(cookie).decode("ascii")
+            except BadSignature:
+                sid = None
+            payload = self.store.load(sid) if sid else None
+            if payload is not None:
+                return ServerSession(_serializer.loads(payload), sid=sid, payload=payload)
+        return ServerSession()
+
+    def save_session(self, app: Flask, session: ServerSession, response: Response) -> None:  # type: ignore[override]
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+        secure = self.get_cookie_secure(app)
+        samesite = self.get_cookie_samesite(app)
+        httponly = self.get_cookie_httponly(app)
+
+        if session.accessed:
+            response.vary.add("Cookie")
+
+        if not session:
+            if session.sid is not None or session.modified:
+                if session.sid is not None:
+                    self.store.delete(session.sid)
+                response.delete_cookie(
+                    name, domain=domain, path=path, secure=secure, samesite=samesite, httponly=httponly
+                )
+            return
+
+        payload = _serializer.dumps(dict(session))
+        changed = payload != session.loaded_payload
+        if not changed and not self.should_set_cookie(app, session):
+            return
+
+        if session.sid is None:
+            session.sid = secrets.token_urlsafe(32)
+        self.store.save(session.sid, payload, app.permanent_session_lifetime.total_seconds())
+        session.loaded_payload = payload
+
+        response.set_cookie(
+            name,
+            self._signer(app).sign(session.sid.encode("ascii")).decode("ascii"),
+            expires=self.get_expiration_time(app, session),
+            httponly=httponly,
+            domain=domain,
+            path=path,
+            secure=secure,
+            samesite=samesite,
+        )
+
+    def regenerate(self, session: ServerSession) -> None:
+        """Drop the stored row and issue a fresh id when the response is saved."""
+        if session.sid is not None:
+            self.store.delete(session.sid)
+        session.sid = None
+        session.loaded_payload = ""
+        session.modified = True
+
+
+def _regenerate_session_id(app: Flask, **_extra: Any) -> None:
+    # Login and logout get a new id, so an id planted before authentication
+    # (session fixation) never becomes an authenticated session.
+    interface = app.session_interface
+    if isinstance(interface, ServerSideSessionInterface) and isinstance(request_session, ServerSession):
+        interface.regenerate(request_session)
+
+
+def build_session_store(app: Flask) -> Optional[SessionStore]:
+    backend = app.config.get("SESSION_BACKEND", "cookie")
+    if backend == "sqlite":
+        path = app.config.get("SESSION_SQLITE_PATH") or os.path.join(app.instance_path, "sessions.db")
+        return SQLiteSessionStore(path)
+    if backend == "memory":
+        return MemorySessionStore()
+    if backend == "cookie":
+        return None
+    raise ValueError(f"Unknown SESSION_BACKEND {backend!r}; use 'sqlite', 'memory' or 'cookie'.")
+
+
+def init_session_store(app: Flask) -> None:
+    store = build_session_store(app)
+    if store is not None:
+        app.session_interface = ServerSideSessionInterface(store)
+        user_logged_in.connect(_regenerate_session_id, app)
+        user_logged_out.connect(_regenerate_session_id, app)
@@ -0,0 +1,318 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .irradiance import tmy_store
+from .subsidy import DEFAULT_ANNUAL_PRODUCTION_PER_KW
+
+YIELD_CACHE_SIZE = 512
+HOURS_PER_YEAR = 8_760
+IST_OFFSET_HOURS = 5.5
+
+SOLAR_CONSTANT = 1_367.0  # W/m2
+SYSTEM_LOSSES = 0.14  # soiling, wiring, inverter, mismatch (PVWatts default)
+TEMPERATURE_COEFFICIENT = -0.004  # per degC above 25 degC, crystalline silicon
+NOCT = 45.0  # nominal operating cell temperature, degC
+GROUND_ALBEDO = 0.2
+
+# Share of clean-air clear-sky irradiance reaching the ground, Jan..Dec, per
+# climate region. The monthly shapes follow IMD climatology: the southwest
+# monsoon (Jun-Sep) everywhere, heaviest on the west coast and in the
+# northeast; the northeast monsoon (Oct-Dec) on the Tamil Nadu coast;
+# winter fog and haze over the northern plains; thin dry air in Ladakh.
+# The levels were calibrated so each representative site's annual yield
+# falls in the range commonly reported for it from satellite TMY data
+# (NIWE solar atlas, PVGIS-SARAH, PVWatts with NSRDB): about 1,600
+# kWh/kWp in Rajasthan down to about 1,100-1,200 in the northeast. They
+# are indicative only; import TMY data (flask import-tmy) for site-exact
+# figures.
+REGION_CLEARNESS: Dict[str, Tuple[float, ...]] = {
+    "arid-northwest": (0.80, 0.82, 0.82, 0.81, 0.79, 0.71, 0.57, 0.57, 0.71, 0.81, 0.81, 0.80),
+    "northern-plains": (0.61, 0.69, 0.74, 0.75, 0.73, 0.65, 0.51, 0.51, 0.63, 0.73, 0.70, 0.62),
+    "eastern-plains": (0.64, 0.67, 0.68, 0.67, 0.63, 0.49, 0.40, 0.41, 0.46, 0.60, 0.65, 0.64),
+    "central": (0.78, 0.79, 0.78, 0.77, 0.74, 0.59, 0.46, 0.47, 0.58, 0.74, 0.77, 0.78),
+    "west-coast": (0.74, 0.75, 0.75, 0.74, 0.72, 0.46, 0.34, 0.38, 0.52, 0.68, 0.72, 0.73),
+    "southwest-coast": (0.71, 0.73, 0.73, 0.69, 0.60, 0.43, 0.43, 0.49, 0.56, 0.56, 0.58, 0.65),
+    "south-plateau": (0.74, 0.76, 0.75, 0.72, 0.68, 0.56, 0.52, 0.52, 0.57, 0.60, 0.64, 0.68),
+    "southeast-coast": (0.70, 0.74, 0.74, 0.72, 0.68, 0.62, 0.58, 0.58, 0.58, 0.55, 0.50, 0.56),
+    "northeast": (0.60, 0.60, 0.56, 0.48, 0.44, 0.36, 0.36, 0.38, 0.40, 0.52, 0.60, 0.60),
+    "eastern-himalaya": (0.59, 0.57, 0.51, 0.45, 0.41, 0.33, 0.31, 0.33, 0.37, 0.51, 0.59, 0.61),
+    "western-himalaya": (0.64, 0.64, 0.66, 0.70, 0.74, 0.72, 0.58, 0.56, 0.68, 0.76, 0.72, 0.66),
+    "cold-desert": (0.83, 0.83, 0.83, 0.83, 0.85, 0.87, 0.85, 0.85, 0.87, 0.87, 0.85, 0.83),
+    "bay-islands": (0.68, 0.72, 0.72, 0.68, 0.52, 0.42, 0.42, 0.42, 0.44, 0.50, 0.54, 0.60),
+}
+DEFAULT_REGION = "central"
+
+# Representative site (capital or main load centre) per state / UT, keyed
+# by the lower-cased form value.
+STATE_COORDINATES: Dict[str, Tuple[float, float]] = {
+    "andhra pradesh": (16.51, 80.52),
+    "arunachal pradesh": (27.08, 93.61),
+    "assam": (26.14, 91.74),
+    "bihar": (25.59, 85.14),
+    "chhattisgarh": (21.25, 81.63),
+    "goa": (15.49, 73.83),
+    "gujarat": (23.02, 72.57),
+    "haryana": (28.46, 77.03),
+    "himachal pradesh": (31.10, 77.17),
+    "jharkhand": (23.34, 85.31),
+    "karnataka": (12.97, 77.59),
+    "kerala": (8.52, 76.94),
+    "madhya pradesh": (23.26, 77.41),
+    "maharashtra": (19.08, 72.88),
+    "manipur": (24.82, 93.94),
+    "meghalaya": (25.58, 91.89),
+    "mizoram": (23.73, 92.72),
+    "nagaland": (25.67, 94.11),
+    "odisha": (20.30, 85.82),
+    "punjab": (30.90, 75.86),
+    "rajasthan": (26.91, 75.79),
+    "sikkim": (27.33, 88.61),
+    "tamil nadu": (13.08, 80.27),
+    "telangana": (17.39, 78.49),
+    "tripura": (23.83, 91.29),
+    "uttar pradesh": (26.85, 80.95),
+    "uttarakhand": (30.32, 78.03),
+    "west bengal": (22.57, 88.36),
+    "andaman and nicobar islands": (11.62, 92.73),
+    "chandigarh": (30.73, 76.78),
+    "dadra and nagar haveli and daman and diu": (20.40, 72.83),
+    "delhi": (28.61, 77.21),
+    "jammu and kashmir": (34.08, 74.80),
+    "ladakh": (34.15, 77.58),
+    "lakshadweep": (10.57, 72.64),
+    "puducherry": (11.94, 79.81),
+}
+
+# Climate region of each state's representative site.
+STATE_REGIONS: Dict[str, str] = {
+    "andhra pradesh": "southeast-coast",
+    "arunachal pradesh": "northeast",
+    "assam": "northeast",
+    "bihar": "eastern-plains",
+    "chhattisgarh": "central",
+    "goa": "west-coast",
+    "gujarat": "arid-northwest",
+    "haryana": "northern-plains",
+    "himachal pradesh": "western-himalaya",
+    "jharkhand": "eastern-plains",
+    "karnataka": "south-plateau",
+    "kerala": "southwest-coast",
+    "madhya pradesh": "central",
+    "maharashtra": "west-coast",
+    "manipur": "northeast",
+    "meghalaya": "northeast",
+    "mizoram": "northeast",
+    "nagaland": "northeast",
+    "odisha": "eastern-plains",
+    "punjab": "northern-plains",
+    "rajasthan": "arid-northwest",
+    "sikkim": "eastern-himalaya",
+    "tamil nadu": "southeast-coast",
+    "telangana": "central",
+    "tripura": "northeast",
+    "uttar pradesh": "northern-plains",
+    "uttarakhand": "western-himalaya",
+    "west bengal": "eastern-plains",
+    "andaman and nicobar islands": "bay-islands",
+    "chandigarh": "northern-plains",
+    "dadra and nagar haveli and daman and diu": "west-coast",
+    "delhi": "northern-plains",
+    "jammu and kashmir": "western-himalaya",
+    "ladakh": "cold-desert",
+    "lakshadweep": "southwest-coast",
+    "puducherry": "southeast-coast",
+}
+
+# Panels on pitched roofs follow the roof; elsewhere they sit on a
+# mounting structure tilted to the latitude.
+ROOF_TILT_DEGREES: Dict[str, float] = {
+    "sloped-roof": 25.0,
+    "tiles": 25.0,
+    "tin-metal": 15.0,
+    "asbestos": 15.0,
+}
+DEFAULT_AZIMUTH = 180.0  # due south
+
+
+@dataclass(frozen=True)
+class YieldProfile:
+    latitude: float
+    longitude: float
+    tilt: float
+    azimuth: float
+    hourly_kwh_per_kw: np.ndarray  # 8760 values from 1 Jan 00:00 IST; read-only
+    monthly_kwh_per_kw: np.ndarray  # 12 values; read-only
+    annual_kwh_per_kw: float
+    tmy_cell: Optional[int] = None  # None when modelled from clear sky
+
+
+def _month_of_day() -> np.ndarray:
+    days_per_month = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+    return np.repeat(np.arange(12), days_per_month)
+
+
+_MONTH_OF_HOUR = np.repeat(_month_of_day(), 24)
+
+
+def _sun_geometry(latitude: float, longitude: float, tilt: float, azimuth: float):
+    hour = np.arange(HOURS_PER_YEAR) + 0.5  # mid-hour, IST
+    day = np.floor(hour / 24.0) + 1.0
+    day_angle = 2.0 * np.pi * (day - 1.0) / 365.0
+
+    # Sun position (Cooper declination, Spencer equation of time).
+    declination = np.radians(23.45) * np.sin(2.0 * np.pi * (284.0 + day) / 365.0)
+    equation_of_time = 229.18 * (
+        0.000075
+        + 0.001868 * np.cos(day_angle)
+        - 0.032077 * np.sin(day_angle)
+        - 0.014615 * np.cos(2 * day_angle)
+        - 0.040849 * np.sin(2 * day_angle)
+    )  # minutes
+    solar_time = (hour % 24.0) - IST_OFFSET_HOURS + longitude / 15.0 + equation_of_time / 60.0
+    hour_angle = np.radians(15.0 * (solar_time - 12.0))
+
+    phi = np.radians(latitude)
+    beta = np.radians(tilt)
+    gamma = np.radians(azimuth - 180.0)  # surface azimuth from south, west positive
+    sin_d, cos_d = np.sin(declination), np.cos(declination)
+    cos_w = np.cos(hour_angle)
+    cos_zenith = np.sin(phi) * sin_d + np.cos(phi) * cos_d * cos_w
+    cos_incidence = (
+        sin_d * np.sin(phi) * np.cos(beta)
+        - sin_d * np.cos(phi) * np.sin(beta) * np.cos(gamma)
+        + cos_d * np.cos(phi) * np.cos(beta) * cos_w
+        + cos_d * np.sin(phi) * np.sin(beta) * np.cos(gamma) * cos_w
+        + cos_d * np.sin(beta) * np.sin(gamma) * np.sin(hour_angle)
+    )
+    return day, solar_time, cos_zenith, cos_incidence
+
+
+def _clear_sky(latitude: float, region: str, day: np.ndarray, solar_time: np.ndarray, cos_zenith: np.ndarray):
+    """Modelled beam (normal), diffuse, global horizontal and ambient temperature."""
+    daylight = cos_zenith > 0.0
+
+    # Clear-sky beam (Meinel attenuation, Kasten-Young air mass) scaled by the
+    # monthly clearness; diffuse is a share of beam plus the scattered loss.
+    zenith_deg = np.degrees(np.arccos(np.clip(cos_zenith, -1.0, 1.0)))
+    kasten_young = np.maximum(cos_zenith, 0.0) + 0.50572 * np.maximum(96.07995 - zenith_deg, 0.01) ** -1.6364
+    air_mass = np.where(daylight, 1.0 / kasten_young, np.inf)
+    extraterrestrial = SOLAR_CONSTANT * (1.0 + 0.033 * np.cos(2.0 * np.pi * day / 365.0))
+    clearness = np.asarray(REGION_CLEARNESS[region])[_MONTH_OF_HOUR]
+    beam = np.where(daylight, extraterrestrial * 0.7 ** (air_mass**0.678), 0.0) * clearness
+    diffuse = 0.1 * beam + np.where(daylight, 0.15 * (1.0 - clearness) * extraterrestrial * cos_zenith, 0.0)
+    global_horizontal = beam * np.maximum(cos_zenith, 0.0) + diffuse
+
+    # Ambient temperature: latitude-dependent mean, pre-monsoon peak, 15:00 high.
+    ambient = (
+        27.0
+        - 0.35 * (latitude - 20.0)
+        + 5.0 * np.sin(2.0 * np.pi * (day - 44.0) / 365.0)
+        + 5.0 * np.cos(2.0 * np.pi * (solar_time - 15.0) / 24.0)
+    )
+    return beam, diffuse, global_horizontal, ambient
+
+
+def _measured(cell: int, cos_zenith: np.ndarray):
+    """Beam, diffuse, global horizontal and ambient temperature from the TMY cell."""
+    series = tmy_store.dataset().series(cell)
+    beam = np.where(cos_zenith > 0.0, series.dni, 0.0)
+    diffuse = np.maximum(series.ghi - beam * np.maximum(cos_zenith, 0.0), 0.0)
+    return beam, diffuse, series.ghi, series.temperature
+
+
+@lru_cache(maxsize=YIELD_CACHE_SIZE)
+def _simulate(
+    latitude: float,
+    longitude: float,
+    tilt: float,
+    azimuth: float,
+    region: str = DEFAULT_REGION,
+    tmy: Optional[Tuple[str, int]] = None,
+) -> YieldProfile:
+    day, solar_time, cos_zenith, cos_incidence = _sun_geometry(latitude, longitude, tilt, azimuth)
+    if tmy is None:
+        beam, diffuse, global_horizontal, ambient = _clear_sky(latitude, region, day, solar_time, cos_zenith)
+    else:
+        beam, diffuse, global_horizontal, ambient = _measured(tmy[1], cos_zenith)
+
+    beta = np.radians(tilt)
+    plane_of_array = (
+        beam * np.maximum(cos_incidence, 0.0)
+        + diffuse * (1.0 + np.cos(beta)) / 2.0
+        + global_horizontal * GROUND_ALBEDO * (1.0 - np.cos(beta)) / 2.0
+    )
+    cell_temperature = ambient + plane_of_array / 800.0 * (NOCT - 20.0)
+    derate = 1.0 + TEMPERATURE_COEFFICIENT * (cell_temperature - 25.0)
+
+    hourly = plane_of_array / 1000.0 * derate * (1.0 - SYSTEM_LOSSES)  # kWh per kWp
+    monthly = np.bincount(_MONTH_OF_HOUR, weights=hourly, minlength=12)
+    hourly.flags.writeable = False
+    monthly.flags.writeable = False
+    return YieldProfile(
+        latitude=latitude,
+        longitude=longitude,
+        tilt=tilt,
+        azimuth=azimuth,
+        hourly_kwh_per_kw=hourly,
+        monthly_kwh_per_kw=monthly,
+        annual_kwh_per_kw=float(hourly.sum()),
+        tmy_cell=tmy[1] if tmy else None,
+    )
+
+
+def nearest_region(latitude: float, longitude: float) -> str:
+    """Climate region of the closest representative state site."""
+    state = min(
+        STATE_COORDINATES,
+        key=lambda name: (STATE_COORDINATES[name][0] - latitude) ** 2
+        + ((STATE_COORDINATES[name][1] - longitude) * np.cos(np.radians(latitude))) ** 2,
+    )
+    return STATE_REGIONS[state]
+
+
+def simulate_yield(
+    latitude: float,
+    longitude: float,
+    tilt: float,
+    azimuth: float = DEFAULT_AZIMUTH,
+    region: Optional[str] = None,
+) -> YieldProfile:
+    """Hourly AC yield of 1 kWp at a site.
+
+    Uses the nearest TMY cell when the dataset covers the site (memoised per
+    cell), otherwise the clear-sky model with the region's monthly clearness
+    (memoised per ~10 km). ``region`` defaults to that of the nearest state
+    site. Tilt and azimuth are rounded to whole degrees.
+    """
+    tilt, azimuth = float(round(tilt)), float(round(azimuth) % 360)
+    tmy = tmy_store.lookup(latitude, longitude)
+    if tmy is not None:
+        dataset = tmy_store.dataset()
+        cell = tmy[1]
+        return _simulate(float(dataset.cell_lat[cell]), float(dataset.cell_lon[cell]), tilt, azimuth, tmy=tmy)
+    latitude, longitude = round(latitude, 1), round(longitude, 1)
+    if region not in REGION_CLEARNESS:
+        region = nearest_region(latitude, longitude)
+    return _simulate(latitude, longitude, tilt, azimuth, region)
+
+
+def site_yield(state: Optional[str], roof_type: Optional[str] = None) -> Optional[YieldProfile]:
+    """Yield profile for a journey's state and roof type; None for an unknown state."""
+    key = (state or "").strip().lower()
+    coordinates = STATE_COORDINATES.get(key)
+    if coordinates is None:
+        return None
+    latitude, longitude = coordinates
+    tilt = ROOF_TILT_DEGREES.get(roof_type or "", abs(latitude))
+    return simulate_yield(latitude, longitude, tilt, region=STATE_REGIONS[key])
+
+
+def annual_yield_per_kw(state: Optional[str], roof_type: Optional[str] = None) -> float:
+    """kWh per kWp per year at the site, or the national default for an unknown state."""
+    profile = site_yield(state, roof_type)
+    return profile.annual_kwh_per_kw if profile else DEFAULT_ANNUAL_PRODUCTION_PER_KW
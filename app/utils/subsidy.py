@@ -1,13 +1,18 @@
 from __future__ import annotations
 
-from collections import OrderedDict
 from dataclasses import dataclass
 from typing import Iterable
 
+import numpy as np
+
+from .catalog import current_catalog
+from .tariffs import SlabTariff, flat_tariff, units_for_bill, units_for_bills
+
 DEFAULT_COST_PER_KW = 65_000  # INR
-DEFAULT_ANNUAL_PRODUCTION_PER_KW = 1_100  # kWh per kW per year
+DEFAULT_ANNUAL_PRODUCTION_PER_KW = 1_100  # kWh per kW per year, when the site is unknown
 DEFAULT_AREA_PER_KW = 8  # m2 per kW usable
 DEFAULT_PROVIDER_TARIFF = 8.0  # INR per kWh fallback
+DEFAULT_PROVIDER_BILLING = flat_tariff(DEFAULT_PROVIDER_TARIFF)
 
 
 @dataclass
@@ -32,35 +37,19 @@ class EstimateResult:
     system_kw: float
 
 
-ELECTRICITY_PROVIDERS: OrderedDict[str, dict[str, float | str]] = OrderedDict(
-    [
-        ("bses_rajdhani", {"label": "BSES Rajdhani (Delhi)", "tariff": 8.2}),
-        ("bses_yamuna", {"label": "BSES Yamuna (Delhi)", "tariff": 8.0}),
-        ("tpddl", {"label": "Tata Power Delhi Distribution", "tariff": 8.4}),
-        ("adani_mumbai", {"label": "Adani Electricity Mumbai", "tariff": 9.1}),
-        ("mseb", {"label": "MSEDCL / Mahadiscom (Maharashtra)", "tariff": 7.3}),
-        ("tangedco", {"label": "TANGEDCO (Tamil Nadu)", "tariff": 6.4}),
-        ("bescom", {"label": "BESCOM (Bengaluru)", "tariff": 7.1}),
-        ("cesc_kolkata", {"label": "CESC (Kolkata)", "tariff": 8.3}),
-        ("pspcl", {"label": "PSPCL (Punjab)", "tariff": 7.0}),
-        ("ts_spdcl", {"label": "TSSPDCL (Telangana)", "tariff": 7.6}),
-        ("wb_sedcl", {"label": "WBSEDCL (West Bengal)", "tariff": 7.2}),
-        ("apspdcl", {"label": "APSPDCL (Andhra Pradesh)", "tariff": 7.0}),
-        ("up_pcl", {"label": "UPPCL (Uttar Pradesh)", "tariff": 7.4}),
-        ("gseb", {"label": "GUVNL / DGVCL (Gujarat)", "tariff": 7.2}),
+def get_provider_choices() -> list[tuple[str, str]]:
+    """Select options for the provider field, from the current catalog."""
+    return [
+        ("", "Select electricity provider / DISCOM"),
+        *[(key, provider.label) for key, provider in current_catalog().providers.items()],
+        ("other", "Other / Not listed"),
     ]
-)
 
-ELECTRICITY_PROVIDER_CHOICES: list[tuple[str, str]] = [
-    ("", "Select electricity provider / DISCOM"),
-    *[(key, data["label"]) for key, data in ELECTRICITY_PROVIDERS.items()],
-    ("other", "Other / Not listed"),
-]
 
-PROVIDER_TARIFFS: dict[str, float] = {
-    key: float(data["tariff"]) for key, data in ELECTRICITY_PROVIDERS.items()
-}
-PROVIDER_TARIFFS["other"] = DEFAULT_PROVIDER_TARIFF
+def get_provider_tariffs() -> dict[str, float]:
+    tariffs = {key: provider.tariff for key, provider in current_catalog().providers.items()}
+    tariffs["other"] = DEFAULT_PROVIDER_TARIFF
+    return tariffs
 
 
 def get_provider_label(provider_key: str | None) -> str | None:
@@ -68,14 +57,20 @@ def get_provider_label(provider_key: str | None) -> str | None:
         return None
     if provider_key == "other":
         return "Other provider"
-    provider = ELECTRICITY_PROVIDERS.get(provider_key)
+    provider = current_catalog().providers.get(provider_key)
     if not provider:
         return None
-    return str(provider["label"])
+    return provider.label
 
 
 def get_provider_tariff(provider_key: str | None) -> float:
-    return PROVIDER_TARIFFS.get(provider_key or "", DEFAULT_PROVIDER_TARIFF)
+    provider = current_catalog().providers.get(provider_key or "")
+    return provider.tariff if provider else DEFAULT_PROVIDER_TARIFF
+
+
+def get_provider_billing(provider_key: str | None) -> SlabTariff:
+    provider = current_catalog().providers.get(provider_key or "")
+    return provider.billing if provider else DEFAULT_PROVIDER_BILLING
 
 
 def estimate_monthly_units_from_bill(
@@ -83,10 +78,22 @@ def estimate_monthly_units_from_bill(
 ) -> float | None:
     if not monthly_bill_inr or monthly_bill_inr <= 0:
         return None
-    tariff = PROVIDER_TARIFFS.get(provider_key or "", DEFAULT_PROVIDER_TARIFF)
-    if tariff <= 0:
-        tariff = DEFAULT_PROVIDER_TARIFF
-    return max(monthly_bill_inr / tariff, 0.0)
+    return units_for_bill(get_provider_billing(provider_key), monthly_bill_inr)
+
+
+def estimate_monthly_units_from_bills(
+    monthly_bills_inr: np.ndarray, provider_keys: Iterable[str]
+) -> np.ndarray:
+    """Batch ``estimate_monthly_units_from_bill``; NaN where there is no bill."""
+    bills = np.asarray(monthly_bills_inr, dtype=np.float64)
+    keys, groups = np.unique(np.asarray(list(provider_keys), dtype=str), return_inverse=True)
+    units = np.full(bills.shape, np.nan)
+    has_bill = bills > 0
+    for group, key in enumerate(keys.tolist()):
+        rows = has_bill & (groups == group)
+        if rows.any():
+            units[rows] = units_for_bills(get_provider_billing(key), bills[rows])
+    return units
 
 
 BUILTIN_SCHEMES: list[Scheme] = [
@@ -102,9 +109,10 @@ BUILTIN_SCHEMES: list[Scheme] = [
 def estimate_system_size_kw(
     roof_area: float | None = None,
     annual_consumption_kwh: float | None = None,
+    annual_production_per_kw: float = DEFAULT_ANNUAL_PRODUCTION_PER_KW,
 ) -> float:
     if annual_consumption_kwh and annual_consumption_kwh > 0:
-        estimated = annual_consumption_kwh / DEFAULT_ANNUAL_PRODUCTION_PER_KW
+        estimated = annual_consumption_kwh / annual_production_per_kw
     elif roof_area and roof_area > 0:
         estimated = roof_area / DEFAULT_AREA_PER_KW
     else:
@@ -141,3 +149,29 @@ def estimate_subsidy(
         system_kw=system_kw,
     )
 
+
+def estimate_subsidy_arrays(
+    system_kw: np.ndarray,
+    *,
+    cost_per_kw: np.ndarray | float = DEFAULT_COST_PER_KW,
+    schemes: Iterable[Scheme] = BUILTIN_SCHEMES,
+    state_policy: StatePolicy | None = None,
+) -> dict[str, np.ndarray]:
+    """Array form of ``estimate_subsidy``; inputs broadcast against each other."""
+    state_policy = state_policy or StatePolicy()
+    gross_cost = np.asarray(system_kw, dtype=np.float64) * cost_per_kw
+
+    central_total = np.zeros_like(gross_cost)
+    for scheme in schemes:
+        eligible = gross_cost * (scheme.subsidy_percent / 100.0)
+        if scheme.max_amount_inr is not None:
+            eligible = np.minimum(eligible, scheme.max_amount_inr)
+        central_total += eligible
+
+    state_total = gross_cost * (state_policy.capex_subsidy_percent / 100.0)
+    return {
+        "gross_cost": gross_cost,
+        "central": central_total,
+        "state_subsidy": state_total,
+        "net_cost": np.maximum(0.0, gross_cost - central_total - state_total),
+    }
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from .lifetime import LifetimeProjection, simulate_lifetime
+from .ml_scoring import calculate_subsidy_match_scores
+from .catalog import catalog_version
+from .irradiance import tmy_version
+from .schemes import SchemeMatch, get_scheme_filter_options, match_subsidy_schemes
+from .solar_yield import annual_yield_per_kw
+from .subsidy import (
+    EstimateResult,
+    estimate_monthly_units_from_bill,
+    estimate_subsidy,
+    estimate_system_size_kw,
+    get_provider_tariff,
+)
+
+# Journey fields that influence the computed results (and the stored submission).
+JOURNEY_INPUT_KEYS = (
+    "roof_area",
+    "monthly_bill",
+    "provider",
+    "state",
+    "consumer_segment",
+    "grid_connection",
+    "roof_type",
+    "ownership",
+)
+RESULT_CACHE_SIZE = 256
+
+
+@dataclass(frozen=True)
+class SubsidyResultBundle:
+    fingerprint: str
+    roof_area: float
+    monthly_bill: float
+    estimated_monthly_units: Optional[float]
+    annual_consumption: Optional[float]
+    recommended_kw: float
+    annual_yield_per_kw: float
+    result: EstimateResult
+    matches: Tuple[SchemeMatch, ...]  # ML-scored copies; treat as read-only
+    filter_options: Dict[str, list]
+    estimated_annual_output: float
+    estimated_annual_savings: float
+    financial_predictions: Dict[str, Any]
+    lifetime: LifetimeProjection
+
+
+def journey_fingerprint(journey: Mapping[str, Any]) -> str:
+    """Stable hash of the journey inputs; equal inputs give equal results."""
+    payload = {key: journey.get(key) for key in JOURNEY_INPUT_KEYS}
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def compute_result_bundle(journey: Mapping[str, Any], fingerprint: Optional[str] = None) -> SubsidyResultBundle:
+    """Run sizing, scheme matching and ML scoring for one set of inputs."""
+    roof_area = journey.get("roof_area", 0.0)
+    monthly_bill = journey.get("monthly_bill", 0.0)
+    provider_key = journey.get("provider")
+
+    estimated_monthly_units = estimate_monthly_units_from_bill(monthly_bill, provider_key)
+    annual_consumption = estimated_monthly_units * 12 if estimated_monthly_units else None
+
+    yield_per_kw = annual_yield_per_kw(journey.get("state"), journey.get("roof_type"))
+    recommended_kw = estimate_system_size_kw(
+        roof_area=roof_area or None,
+        annual_consumption_kwh=annual_consumption or None,
+        annual_production_per_kw=yield_per_kw,
+    )
+    result = estimate_subsidy(recommended_kw)
+    subsidy_amount = result.central + result.state_subsidy
+
+    candidates = match_subsidy_schemes(
+        state=journey.get("state") or "",
+        consumer_segment=journey.get("consumer_segment") or "residential",
+        owns_property=journey.get("ownership") if "ownership" in journey else None,
+        is_grid_connected=journey.get("grid_connection") == "grid",
+        roof_area=roof_area or None,
+        annual_consumption=annual_consumption or None,
+    )
+    ml_scores = calculate_subsidy_match_scores(
+        schemes=candidates,
+        user_system_size_kw=recommended_kw,
+        user_annual_consumption_kwh=annual_consumption,
+        user_state=journey.get("state") or "",
+        user_consumer_segment=journey.get("consumer_segment") or "residential",
+        gross_cost_inr=result.gross_cost,
+        subsidy_amount_inr=subsidy_amount,
+        # Higher if online portal available
+        ease_of_claim=[0.7 if match.application_url else 0.5 for match in candidates],
+    )
+    # Score copies: the catalog entries are shared between requests.
+    matches = [
+        replace(match, match_score=float(ml_score) / 10.0)
+        for match, ml_score in zip(candidates, ml_scores)
+    ]
+    matches.sort(key=lambda item: item.match_score, reverse=True)
+
+    estimated_annual_output = recommended_kw * yield_per_kw
+    tariff = get_provider_tariff(provider_key)
+    lifetime = simulate_lifetime(
+        system_size_kw=recommended_kw,
+        annual_generation_kwh=estimated_annual_output,
+        tariff_rate_inr_per_kwh=tariff,
+        gross_cost_inr=result.gross_cost,
+        subsidy_amount_inr=subsidy_amount,
+        self_consumption_ratio=0.8,
+    )
+    financial_predictions = lifetime.first_year
+
+    if annual_consumption:
+        estimated_annual_savings = min(annual_consumption, estimated_annual_output) * tariff
+    elif monthly_bill:
+        estimated_annual_savings = monthly_bill * 12 * 0.6
+    else:
+        estimated_annual_savings = financial_predictions["annual_savings_inr"]
+
+    return SubsidyResultBundle(
+        fingerprint=fingerprint or journey_fingerprint(journey),
+        roof_area=roof_area,
+        monthly_bill=monthly_bill,
+        estimated_monthly_units=estimated_monthly_units,
+        annual_consumption=annual_consumption,
+        recommended_kw=recommended_kw,
+        annual_yield_per_kw=yield_per_kw,
+        result=result,
+        matches=tuple(matches),
+        filter_options=get_scheme_filter_options(matches),
+        estimated_annual_output=estimated_annual_output,
+        estimated_annual_savings=estimated_annual_savings,
+        financial_predictions=financial_predictions,
+        lifetime=lifetime,
+    )
+
+
+class _BundleCache:
+    """Small thread-safe LRU keyed by journey fingerprint."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._items: "OrderedDict[str, SubsidyResultBundle]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[SubsidyResultBundle]:
+        with self._lock:
+            bundle = self._items.get(key)
+            if bundle is not None:
+                self._items.move_to_end(key)
+            return bundle
+
+    def put(self, key: str, bundle: SubsidyResultBundle) -> None:
+        with self._lock:
+            self._items[key] = bundle
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
+_bundle_cache = _BundleCache(RESULT_CACHE_SIZE)
+
+
+def load_result_bundle(journey: Mapping[str, Any]) -> SubsidyResultBundle:
+    """Return the cached bundle for these inputs, computing it on a miss."""
+    fingerprint = journey_fingerprint(journey)
+    key = f"{catalog_version()}:{tmy_version()}:{fingerprint}"
+    bundle = _bundle_cache.get(key)
+    if bundle is None:
+        bundle = compute_result_bundle(journey, fingerprint)
+        _bundle_cache.put(key, bundle)
+    return bundle
+
+
+def results_etag(journey: Mapping[str, Any]) -> str:
+    """Strong validator for the results payload: journey inputs + catalog and TMY versions."""
+    seed = f"{journey_fingerprint(journey)}:{catalog_version()}:{tmy_version()}"
+    return hashlib.sha256(seed.encode("utf-8")).hexdigest()[:32]
+
+
+def bundle_payload(bundle: SubsidyResultBundle) -> Dict[str, Any]:
+    """JSON-ready view of a bundle for the results API."""
+    result = bundle.result
+    return {
+        "recommended_kw": bundle.recommended_kw,
+        "annual_yield_kwh_per_kw": bundle.annual_yield_per_kw,
+        "roof_area": bundle.roof_area,
+        "monthly_bill": bundle.monthly_bill,
+        "estimated_monthly_units": bundle.estimated_monthly_units,
+        "annual_consumption_kwh": bundle.annual_consumption,
+        "estimate": {
+            "gross_cost_inr": result.gross_cost,
+            "central_subsidy_inr": result.central,
+            "state_subsidy_inr": result.state_subsidy,
+            "net_cost_inr": result.net_cost,
+        },
+        "estimated_annual_output_kwh": bundle.estimated_annual_output,
+        "estimated_annual_savings_inr": bundle.estimated_annual_savings,
+        "financial_predictions": bundle.financial_predictions,
+        "lifetime": bundle.lifetime.summary(),
+        "filter_options": bundle.filter_options,
+        "matches": [match.as_dict() for match in bundle.matches],
+    }
+
+
+def clear_result_cache() -> None:
+    _bundle_cache.clear()
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+
+@dataclass(frozen=True, slots=True)
+class SlabTariff:
+    """Telescopic slab tariff compiled into cumulative breakpoints.
+
+    Slab ``i`` bills units from ``unit_starts[i]`` onwards at ``rates[i]``;
+    ``cost_starts[i]`` is the energy charge for all units below that slab.
+    Both sequences increase strictly, so bills invert by binary search.
+    """
+
+    fixed_charge: float  # INR per month, billed at any consumption
+    unit_starts: Tuple[float, ...]
+    cost_starts: Tuple[float, ...]
+    rates: Tuple[float, ...]  # INR per kWh
+
+
+def compile_slab_tariff(
+    slabs: Sequence[Tuple[Optional[float], float]],
+    fixed_charge: float = 0.0,
+) -> SlabTariff:
+    """Build breakpoints from ``(up_to_units, rate)`` pairs; the last ``up_to`` is ``None``."""
+    if not slabs:
+        raise ValueError("a tariff needs at least one slab")
+    unit_starts = [0.0]
+    cost_starts = [0.0]
+    rates = []
+    for position, (up_to, rate) in enumerate(slabs):
+        rate = float(rate)
+        if rate <= 0:
+            raise ValueError(f"slab rates must be positive, got {rate}")
+        rates.append(rate)
+        last = position == len(slabs) - 1
+        if last:
+            if up_to is not None:
+                raise ValueError("the last slab must be open-ended (up_to: null)")
+            break
+        if up_to is None or float(up_to) <= unit_starts[-1]:
+            raise ValueError("slab limits must increase")
+        cost_starts.append(cost_starts[-1] + (float(up_to) - unit_starts[-1]) * rate)
+        unit_starts.append(float(up_to))
+    return SlabTariff(
+        fixed_charge=float(fixed_charge),
+        unit_starts=tuple(unit_starts),
+        cost_starts=tuple(cost_starts),
+        rates=tuple(rates),
+    )
+
+
+def flat_tariff(rate: float) -> SlabTariff:
+    return compile_slab_tariff([(None, rate)])
+
+
+def bill_for_units(tariff: SlabTariff, units: float) -> float:
+    """Monthly bill (INR) for ``units`` kWh."""
+    units = max(units, 0.0)
+    slab = bisect_right(tariff.unit_starts, units) - 1
+    energy = tariff.cost_starts[slab] + (units - tariff.unit_starts[slab]) * tariff.rates[slab]
+    return tariff.fixed_charge + energy
+
+
+def units_for_bill(tariff: SlabTariff, bill: float) -> float:
+    """Monthly kWh that produce ``bill``; 0 when the bill is within the fixed charge."""
+    energy = bill - tariff.fixed_charge
+    if energy <= 0:
+        return 0.0
+    slab = bisect_right(tariff.cost_starts, energy) - 1
+    return tariff.unit_starts[slab] + (energy - tariff.cost_starts[slab]) / tariff.rates[slab]
+
+
+def units_for_bills(tariff: SlabTariff, bills: np.ndarray) -> np.ndarray:
+    """Vectorised ``units_for_bill`` over an array of bills."""
+    energy = np.maximum(np.asarray(bills, dtype=np.float64) - tariff.fixed_charge, 0.0)
+    cost_starts = np.asarray(tariff.cost_starts)
+    slab = np.searchsorted(cost_starts, energy, side="right") - 1
+    return np.asarray(tariff.unit_starts)[slab] + (energy - cost_starts[slab]) / np.asarray(tariff.rates)[slab]
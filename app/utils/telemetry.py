@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import hashlib
+import secrets
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+from sqlalchemy.exc import IntegrityError
+
+from ..extensions import db
+from ..forms import TRACKER_ENTRY_TYPE_CHOICES, TRACKER_NOTE_MAX_LENGTH, TRACKER_PANEL_ID_MAX_LENGTH
+from ..models import ApiToken, EnergyLog
+from .energy_rollup import record_energy_logs
+
+TOKEN_PREFIX = "slr_"
+IDEMPOTENCY_KEY_MAX_LENGTH = 120
+_KEY_LOOKUP_CHUNK = 500  # stays under SQLite's bound-parameter limit
+_ENTRY_TYPES = np.array([value for value, _label in TRACKER_ENTRY_TYPE_CHOICES])
+_KWH_LIMIT = 99_999_999.99
+_REVENUE_LIMIT = 9_999_999_999.99
+_EARLIEST_DATE = np.datetime64("2000-01-01")
+
+
+def hash_token(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def issue_api_token(user_id: int, name: str) -> tuple[ApiToken, str]:
+    """Create a token for one site. The plaintext is only returned here."""
+    token = TOKEN_PREFIX + secrets.token_urlsafe(32)
+    record = ApiToken(
+        user_id=user_id,
+        name=name,
+        token_hash=hash_token(token),
+        token_prefix=token[: len(TOKEN_PREFIX) + 6],
+    )
+    db.session.add(record)
+    return record, token
+
+
+def authenticate_token(token: str | None) -> ApiToken | None:
+    if not token or not token.startswith(TOKEN_PREFIX):
+        return None
+    record = ApiToken.query.filter_by(token_hash=hash_token(token)).first()
+    if record is None or not record.is_active:
+        return None
+    return record
+
+
+def _float_or_nan(value: Any) -> float:
+    if value is None or value == "" or isinstance(value, bool):
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _datetime64_or_nat(value: Any) -> np.datetime64:
+    """Day of a ``YYYY-MM-DD`` date or a full ISO 8601 datetime; NaT for anything else."""
+    if not isinstance(value, str) or len(value) < 10:
+        return np.datetime64("NaT")
+    try:
+        if len(value) == 10:
+            day = date.fromisoformat(value)
+        else:
+            day = datetime.fromisoformat(value.replace("Z", "+00:00")).date()
+    except ValueError:
+        return np.datetime64("NaT")
+    return np.datetime64(day, "D")
+
+
+def validate_readings(
+    readings: Sequence[Any], default_entry_type: str = "generation"
+) -> tuple[Dict[str, np.ndarray], Dict[int, List[str]]]:
+    """Column-wise validation of a reading batch.
+
+    Every field is pulled into a NumPy array once and each rule is a mask
+    over the whole batch. Returns the parsed columns plus ``{index: errors}``
+    for rejected readings; the rules mirror TrackerEntryForm.
+    """
+    size = len(readings)
+    is_object = np.fromiter((isinstance(item, dict) for item in readings), bool, size)
+    rows = [item if isinstance(item, dict) else {} for item in readings]
+
+    def column(name: str) -> List[Any]:
+        return [row.get(name) for row in rows]
+
+    keys = np.array([str(value) if value is not None else "" for value in column("idempotency_key")], dtype=object)
+    entry_types = np.array(
+        [str(value or default_entry_type).strip().lower() for value in column("entry_type")], dtype=object
+    )
+    kwh = np.fromiter((_float_or_nan(value) for value in column("kwh")), np.float64, size)
+    revenue = np.fromiter((_float_or_nan(value) for value in column("revenue")), np.float64, size)
+    revenue_given = np.array([value not in (None, "") for value in column("revenue")], dtype=bool)
+    dates = np.array([_datetime64_or_nat(value) for value in column("date")], dtype="datetime64[D]")
+    panel_ids = np.array([str(value).strip() if value else "" for value in column("panel_id")], dtype=object)
+    notes = np.array([str(value).strip() if value else "" for value in column("note")], dtype=object)
+
+    key_lengths = np.fromiter((len(value) for value in keys), np.int64, size)
+    latest_date = np.datetime64(date.today() + timedelta(days=1), "D")
+    checks = [
+        (key_lengths == 0, "idempotency_key is required"),
+        (key_lengths > IDEMPOTENCY_KEY_MAX_LENGTH, f"idempotency_key is longer than {IDEMPOTENCY_KEY_MAX_LENGTH} characters"),
+        (~np.isin(entry_types.astype(str), _ENTRY_TYPES), "entry_type is not recognised"),
+        (~np.isfinite(kwh) | (kwh == 0), "kwh is required and must be a number"),
+        (np.abs(np.nan_to_num(kwh)) > _KWH_LIMIT, "kwh is out of range"),
+        (revenue_given & ~np.isfinite(revenue), "revenue must be a number"),
+        (np.abs(np.nan_to_num(revenue)) > _REVENUE_LIMIT, "revenue is out of range"),
+        (np.isnat(dates), "date must be YYYY-MM-DD or an ISO 8601 datetime"),
+        (~np.isnat(dates) & ((dates < _EARLIEST_DATE) | (dates > latest_date)), "date is outside the accepted range"),
+        (
+            np.fromiter((len(value) for value in panel_ids), np.int64, size) > TRACKER_PANEL_ID_MAX_LENGTH,
+            f"panel_id is longer than {TRACKER_PANEL_ID_MAX_LENGTH} characters",
+        ),
+        (
+            np.fromiter((len(value) for value in notes), np.int64, size) > TRACKER_NOTE_MAX_LENGTH,
+            f"note is longer than {TRACKER_NOTE_MAX_LENGTH} characters",
+        ),
+    ]
+
+    errors: Dict[int, List[str]] = {}
+    for mask, message in checks:
+        for index in np.flatnonzero(mask & is_object):
+            errors.setdefault(int(index), []).append(message)
+    for index in np.flatnonzero(~is_object):
+        errors[int(index)] = ["reading must be a JSON object"]
+
+    columns = {
+        "idempotency_key": keys,
+        "entry_type": entry_types,
+        "kwh": np.round(kwh, 2),
+        "revenue": np.where(revenue_given, np.round(revenue, 2), np.nan),
+        "date": dates,
+        "panel_id": panel_ids,
+        "note": notes,
+    }
+    return columns, errors
+
+
+def _existing_keys(user_id: int, keys: Sequence[str]) -> set[str]:
+    found: set[str] = set()
+    for offset in range(0, len(keys), _KEY_LOOKUP_CHUNK):
+        chunk = list(keys[offset : offset + _KEY_LOOKUP_CHUNK])
+        found.update(
+            key
+            for (key,) in db.session.query(EnergyLog.idempotency_key).filter(
+                EnergyLog.user_id == user_id, EnergyLog.idempotency_key.in_(chunk)
+            )
+        )
+    return found
+
+
+def ingest_readings(
+    user_id: int, readings: Sequence[Any], default_entry_type: str = "generation"
+) -> Dict[str, Any]:
+    """Validate, de-duplicate and store a batch in a single transaction.
+
+    Readings whose idempotency key was already stored (or repeats earlier
+    in the same batch) are counted as duplicates, so a logger can safely
+    replay its backlog.
+    """
+    columns, errors = validate_readings(readings, default_entry_type)
+    valid = np.ones(len(readings), dtype=bool)
+    if errors:
+        valid[list(errors)] = False
+
+    candidate_index = np.flatnonzero(valid)
+    keys = columns["idempotency_key"][candidate_index]
+    _unique, first_seen = np.unique(keys.astype(str), return_index=True)
+    in_batch_duplicates = len(candidate_index) - len(first_seen)
+    candidate_index = np.sort(candidate_index[first_seen])
+
+    for attempt in range(2):
+        existing = _existing_keys(user_id, [columns["idempotency_key"][i] for i in candidate_index])
+        now = datetime.utcnow()
+        rows = [
+            {
+                "user_id": user_id,
+                "idempotency_key": columns["idempotency_key"][i],
+                "entry_type": columns["entry_type"][i],
+                "kwh": float(columns["kwh"][i]),
+                "revenue": None if np.isnan(columns["revenue"][i]) else float(columns["revenue"][i]),
+                "panel_id": columns["panel_id"][i] or None,
+                "date": columns["date"][i].item(),
+                "note": columns["note"][i] or None,
+                "created_at": now,
+            }
+            for i in candidate_index
+            if columns["idempotency_key"][i] not in existing
+        ]
+        try:
+            if rows:
+                db.session.connection().execute(EnergyLog.__table__.insert(), rows)
+                record_energy_logs(rows)
+            db.session.commit()
+            break
+        except IntegrityError:
+            # A concurrent replay stored some of these keys first; reload
+            # the existing keys once and retry.
+            db.session.rollback()
+            if attempt:
+                raise
+
+    return {
+        "accepted": len(rows),
+        "duplicates": in_batch_duplicates + len(existing),
+        "rejected": [
+            {
+                "index": index,
+                "idempotency_key": columns["idempotency_key"][index] or None,
+                "errors": messages,
+            }
+            for index, messages in sorted(errors.items())
+        ],
+    }
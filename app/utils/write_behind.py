@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import atexit
+import logging
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from flask import Flask
+
+from ..extensions import db
+from ..models import EnergyLog
+from .energy_rollup import record_energy_logs
+
+logger = logging.getLogger(__name__)
+
+
+class WriteTicket:
+    """Handle returned by ``EnergyWriteQueue.submit``."""
+
+    __slots__ = ("rows", "waiting", "_done", "_state_lock", "_claimed", "_cancelled", "error")
+
+    def __init__(self, rows: List[Dict[str, Any]], waiting: bool = False):
+        self.rows = rows
+        self.waiting = waiting  # a caller blocks on this ticket; flush without lingering
+        self._done = threading.Event()
+        self._state_lock = threading.Lock()
+        self._claimed = False
+        self._cancelled = False
+        self.error: Optional[BaseException] = None
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Block until the rows are committed; re-raise a failed write."""
+        if not self._done.wait(timeout):
+            raise TimeoutError("Energy rows were not flushed in time.")
+        if self.error is not None:
+            raise self.error
+
+    def _claim(self) -> bool:
+        """Called by the flusher before writing; False if the submitter took the rows back."""
+        with self._state_lock:
+            if self._cancelled:
+                return False
+            self._claimed = True
+            return True
+
+    def _cancel(self) -> bool:
+        """Take the rows back from the queue; False once the flusher is writing them."""
+        with self._state_lock:
+            if self._claimed:
+                return False
+            self._cancelled = True
+            return True
+
+    def _finish(self, error: Optional[BaseException] = None) -> None:
+        self.error = error
+        self._done.set()
+
+
+class EnergyWriteQueue:
+    """In-process write-behind buffer for EnergyLog inserts.
+
+    A daemon thread drains submitted rows and commits them together with
+    their rollup deltas in one transaction per batch, bounded by
+    ``ENERGY_WRITE_BATCH_SIZE`` rows or ``ENERGY_WRITE_FLUSH_INTERVAL``
+    seconds. Callers that need read-your-writes wait on the ticket; such a
+    batch is flushed as soon as the queue is drained, and if the flusher
+    does not pick it up within ``ENERGY_WRITE_WAIT_TIMEOUT`` seconds the
+    rows are written synchronously instead. With ``ENERGY_WRITE_BEHIND``
+    off every submit is written synchronously.
+    """
+
+    def __init__(self, app: Optional[Flask] = None):
+        self._app: Optional[Flask] = None
+        self._queue: "queue.Queue[Optional[WriteTicket]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.enabled = False
+        self.batch_size = 500
+        self.flush_interval = 0.2
+        self.wait_timeout = 5.0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        self._app = app
+        self.enabled = app.config.get("ENERGY_WRITE_BEHIND", True) and not app.testing
+        self.batch_size = app.config.get("ENERGY_WRITE_BATCH_SIZE", self.batch_size)
+        self.flush_interval = app.config.get("ENERGY_WRITE_FLUSH_INTERVAL", self.flush_interval)
+        self.wait_timeout = app.config.get("ENERGY_WRITE_WAIT_TIMEOUT", self.wait_timeout)
+        app.extensions["energy_write_queue"] = self
+
+    def submit(self, rows: Sequence[Dict[str, Any]], *, wait: bool = False) -> WriteTicket:
+        """Queue EnergyLog insert dicts; pass ``wait=True`` for read-your-writes.
+
+        A waiting submit returns once the rows are committed, or raises
+        ``TimeoutError`` if the flusher took them but did not commit within
+        twice ``wait_timeout``.
+        """
+        ticket = WriteTicket(list(rows), waiting=wait)
+        if not self.enabled:
+            self._write_now(ticket)
+            ticket.wait()
+            return ticket
+
+        self._ensure_worker()
+        self._queue.put(ticket)
+        if wait:
+            try:
+                ticket.wait(self.wait_timeout)
+            except TimeoutError:
+                if not ticket._cancel():
+                    # Mid-write in the flusher: give the commit a bounded grace period.
+                    ticket.wait(self.wait_timeout)
+                    return ticket
+                logger.warning(
+                    "Energy write-behind flusher is stalled; writing %d row(s) inline.", len(ticket.rows)
+                )
+                self._write_now(ticket)
+                ticket.wait()
+        return ticket
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Block until everything submitted so far is committed."""
+        if self.enabled and self._thread is not None:
+            marker = WriteTicket([], waiting=True)
+            self._queue.put(marker)
+            marker.wait(timeout)
+
+    def shutdown(self, timeout: float = 10.0) -> None:
+        """Drain the queue and stop the flusher thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._queue.put(None)
+        thread.join(timeout)
+
+    def _ensure_worker(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="energy-write-behind", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is None:
+                break
+            batch = [first]
+            pending_rows = len(first.rows)
+            waiting = first.waiting
+            deadline = time.monotonic() + self.flush_interval
+            while pending_rows < self.batch_size:
+                # With a caller blocked on the batch, only take what is
+                # already queued rather than lingering for the deadline.
+                remaining = 0.0 if waiting else deadline - time.monotonic()
+                try:
+                    ticket = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if ticket is None:
+                    stopping = True
+                    break
+                batch.append(ticket)
+                pending_rows += len(ticket.rows)
+                waiting = waiting or ticket.waiting
+            self._write_batch(batch)
+
+        # Anything queued after the stop marker still gets written.
+        leftovers = []
+        while True:
+            try:
+                ticket = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if ticket is not None:
+                leftovers.append(ticket)
+        if leftovers:
+            self._write_batch(leftovers)
+
+    def _insert(self, rows: List[Dict[str, Any]]) -> None:
+        if rows:
+            db.session.connection().execute(EnergyLog.__table__.insert(), rows)
+            record_energy_logs(rows)
+        db.session.commit()
+
+    def _write_now(self, ticket: WriteTicket) -> None:
+        try:
+            self._insert(ticket.rows)
+        except Exception as exc:
+            db.session.rollback()
+            ticket._finish(exc)
+            return
+        ticket._finish()
+
+    def _write_batch(self, batch: List[WriteTicket]) -> None:
+        batch = [ticket for ticket in batch if ticket._claim()]
+        if not batch:
+            return
+        with self._app.app_context():
+            try:
+                self._insert([row for ticket in batch for row in ticket.rows])
+            except Exception:
+                # One bad submission must not sink its neighbours: retry each
+                # ticket in its own transaction so only the culprit fails.
+                db.session.rollback()
+                logger.exception("Energy write-behind batch failed; retrying individually.")
+                for ticket in batch:
+                    self._write_now(ticket)
+                return
+            for ticket in batch:
+                ticket._finish()
+
+
+energy_write_queue = EnergyWriteQueue()
+atexit.register(energy_write_queue.shutdown)
@@ -0,0 +1,52 @@
+"""add energy daily rollup
+
+Revision ID: 5e2a7c9d1f40
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-18 09:12:31.402117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e2a7c9d1f40'
+down_revision = 'a1b2c3d4e5f6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('energy_daily_rollup',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('generation', sa.Numeric(precision=12, scale=2), nullable=False, server_default='0'),
+    sa.Column('consumption', sa.Numeric(precision=12, scale=2), nullable=False, server_default='0'),
+    sa.Column('export', sa.Numeric(precision=12, scale=2), nullable=False, server_default='0'),
+    sa.Column('revenue', sa.Numeric(precision=14, scale=2), nullable=False, server_default='0'),
+    sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'date')
+    )
+
+    # Backfill from existing logs; entry types other than generation/export
+    # count as consumption, matching app.utils.energy_rollup.entry_bucket.
+    op.execute(
+        """
+        INSERT INTO energy_daily_rollup (user_id, date, generation, consumption, export, revenue, updated_at)
+        SELECT
+            user_id,
+            date,
+            SUM(CASE WHEN lower(entry_type) = 'generation' THEN kwh ELSE 0 END),
+            SUM(CASE WHEN lower(entry_type) IN ('generation', 'export') THEN 0 ELSE kwh END),
+            SUM(CASE WHEN lower(entry_type) = 'export' THEN kwh ELSE 0 END),
+            COALESCE(SUM(revenue), 0),
+            CURRENT_TIMESTAMP
+        FROM energy_log
+        GROUP BY user_id, date
+        """
+    )
+
+
+def downgrade():
+    op.drop_table('energy_daily_rollup')
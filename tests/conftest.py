@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import pytest
+
+from app import create_app
+from app.config import Config
+from app.extensions import db
+from app.models import User
+
+
+@pytest.fixture()
+def app(tmp_path):
+    class TestConfig(Config):
+        TESTING = True
+        WTF_CSRF_ENABLED = False
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'test.db'}"
+        SESSION_BACKEND = "memory"
+        ENERGY_WRITE_BEHIND = False
+
+    app = create_app(TestConfig)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture()
+def user(app):
+    user = User(email="owner@example.com", name="Owner", journey_completed=True)
+    user.set_password("correct-horse")
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+@pytest.fixture()
+def client(app, user):
+    client = app.test_client()
+    response = client.post("/auth/login", data={"email": user.email, "password": "correct-horse"})
+    assert response.status_code == 302
+    return client
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app.extensions import db
+from app.models import EnergyLog, Project
+from app.utils.energy import RECENT_LOG_LIMIT, build_energy_context
+from app.utils.energy_rollup import record_energy_logs
+
+# Flask-Login's user load, then load_dashboard_data(): projects with a
+# windowed total, the daily rollup, and the newest logs (skipped when the
+# rollup is empty and sample data is shown instead).
+DASHBOARD_STATEMENTS = 4
+DASHBOARD_STATEMENTS_WITHOUT_LOGS = 3
+
+
+@contextmanager
+def count_statements():
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db.engine
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def _seed(user, projects: int, days: int) -> None:
+    db.session.add_all(Project(user_id=user.id, name=f"Site {n}") for n in range(projects))
+    logs = [
+        EnergyLog(user_id=user.id, entry_type="generation", kwh=12 + n % 5, date=date(2024, 1, 1) + timedelta(days=n))
+        for n in range(days)
+    ]
+    db.session.add_all(logs)
+    record_energy_logs(logs)
+    db.session.commit()
+
+
+@pytest.mark.parametrize(
+    "projects, days, expected",
+    [
+        (0, 0, DASHBOARD_STATEMENTS_WITHOUT_LOGS),
+        (2, 10, DASHBOARD_STATEMENTS),
+        (25, 400, DASHBOARD_STATEMENTS),
+    ],
+)
+def test_dashboard_issues_fixed_statement_count(client, user, projects, days, expected):
+    _seed(user, projects, days)
+    db.session.expire_all()
+
+    with count_statements() as statements:
+        response = client.get("/dashboard/")
+
+    assert response.status_code == 200
+    assert len(statements) == expected, statements
+
+
+def test_energy_context_returns_every_log_unless_limited(app, user):
+    _seed(user, 0, RECENT_LOG_LIMIT + 10)
+
+    assert len(build_energy_context(user.id)["logs"]) == RECENT_LOG_LIMIT + 10
+    assert len(build_energy_context(user.id, aggregate_in_db=False)["logs"]) == RECENT_LOG_LIMIT + 10
+    assert len(build_energy_context(user.id, recent_limit=3)["logs"]) == 3
+    assert build_energy_context(user.id, recent_limit=0)["logs"] == []
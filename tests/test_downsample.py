@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from app.utils.downsample import MIN_LTTB_POINTS, downsample_series, lttb_indices
+
+
+def _series(size):
+    first = date(2023, 1, 1)
+    rng = np.random.default_rng(7)
+    generation = rng.uniform(5, 15, size)
+    generation[size // 3] = 40.0  # a spike LTTB should keep
+    return [
+        {
+            "date": (first + timedelta(days=offset)).isoformat(),
+            "generation": round(float(kwh), 2),
+            "consumption": round(float(kwh) * 0.6, 2),
+            "export": round(float(kwh) * 0.4, 2),
+            "revenue": round(float(kwh) * 1.4, 2),
+        }
+        for offset, kwh in enumerate(generation)
+    ]
+
+
+@pytest.mark.parametrize("max_points", [1, 2, 3, 10, 180])
+def test_lttb_bounds_points_and_keeps_endpoints(max_points):
+    series = _series(500)
+    sampled = downsample_series(series, max_points)
+
+    assert len(sampled) == max(max_points, MIN_LTTB_POINTS)
+    assert sampled[0] is series[0] and sampled[-1] is series[-1]
+    assert [item["date"] for item in sampled] == sorted(item["date"] for item in sampled)
+
+
+@pytest.mark.parametrize("max_points", [1, 2, 10, 180])
+def test_mean_mode_bounds_points(max_points):
+    series = _series(500)
+    sampled = downsample_series(series, max_points, mode="mean")
+
+    assert len(sampled) == max_points
+    assert sampled[0]["date"] == series[0]["date"]
+
+
+def test_mean_mode_averages_each_bucket():
+    series = _series(500)
+    (whole,) = downsample_series(series, 1, mode="mean")
+    assert whole["generation"] == pytest.approx(np.mean([item["generation"] for item in series]), abs=0.005)
+
+
+def test_lttb_keeps_the_spike():
+    series = _series(500)
+    sampled = downsample_series(series, 20)
+    assert max(item["generation"] for item in sampled) == 40.0
+
+
+@pytest.mark.parametrize("max_points", [0, 500, 1000])
+def test_series_within_budget_is_unchanged(max_points):
+    series = _series(500)
+    assert downsample_series(series, max_points) == series
+
+
+def test_lttb_indices_clamps_tiny_thresholds():
+    y = np.arange(10, dtype=np.float64)
+    for threshold in (0, 1, 2):
+        indices = lttb_indices(y, threshold)
+        assert indices.size == MIN_LTTB_POINTS
+        assert indices[0] == 0 and indices[-1] == 9
+    np.testing.assert_array_equal(lttb_indices(y[:3], 1), [0, 1, 2])
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import io
+
+from sqlalchemy.exc import OperationalError
+
+from app.models import EnergyLog
+from app.utils import energy_import
+from app.utils.energy_import import import_energy_file
+
+
+def _csv(rows: int) -> io.BytesIO:
+    lines = ["date,kwh"] + [f"2024-01-{day % 28 + 1:02d},{day % 9 + 1}" for day in range(rows)]
+    return io.BytesIO("\n".join(lines).encode("utf-8"))
+
+
+def test_import_reports_rows_saved_before_a_failed_batch(app, user, monkeypatch):
+    flush = energy_import._flush
+    calls = []
+
+    def failing_second_batch(batch):
+        calls.append(len(batch))
+        if len(calls) == 2:
+            raise OperationalError("INSERT", {}, Exception("database is locked"))
+        flush(batch)
+
+    monkeypatch.setattr(energy_import, "_flush", failing_second_batch)
+    report = import_energy_file(_csv(25), user_id=user.id, batch_size=10)
+
+    assert calls == [10, 10]
+    assert report.stopped
+    assert report.inserted == 10
+    assert report.failed == 10
+    assert report.errors[0][0] == 12  # first line of the failed batch (header is line 1)
+    assert EnergyLog.query.count() == 10
+
+
+def test_import_commits_every_batch(app, user):
+    report = import_energy_file(_csv(25), user_id=user.id, batch_size=10)
+
+    assert not report.stopped
+    assert (report.inserted, report.failed) == (25, 0)
+    assert EnergyLog.query.count() == 25
+
+
+def test_decode_error_keeps_rows_read_before_it(app, user):
+    stream = _csv(3_000)
+    stream = io.BytesIO(stream.getvalue() + b"\n2024-02-01,\xff\xfe\n2024-02-02,4")
+    report = import_energy_file(stream, user_id=user.id, batch_size=500)
+
+    assert report.stopped
+    assert 0 < report.inserted <= 3_000
+    assert report.inserted % 500  # the partial batch pending at the error was saved
+    assert EnergyLog.query.count() == report.inserted
+    line, message = report.errors[-1]
+    assert line == report.inserted + 2  # header is line 1; every row read was valid
+    assert message.startswith("File is not UTF-8 encoded text.")
+
+
+def test_csv_error_keeps_rows_read_before_it(app, user):
+    stream = _csv(30)
+    stream = io.BytesIO(stream.getvalue() + b'\n2024-02-01,"' + b"9" * 200_000 + b'"\n2024-02-02,4')
+    report = import_energy_file(stream, user_id=user.id, batch_size=500)
+
+    assert report.stopped
+    assert report.inserted == EnergyLog.query.count() == 30
+    assert report.errors[-1][0] == 32
+    assert report.errors[-1][1].startswith("Could not parse CSV:")
@@ -0,0 +1,61 @@
+from datetime import date, timedelta
+
+import pytest
+
+from app.utils.energy_insights import (
+    build_chart_analytics,
+    build_insight_strings,
+    compute_energy_analytics,
+)
+
+GENERATION = [10.0, 11.5, 12.0, 9.5, 10.5, 11.0, 12.5, 13.0, 12.0, 11.0, 10.0, 30.0, 12.5, 13.5, 14.0, 12.0]
+
+
+@pytest.fixture
+def series():
+    first = date(2024, 3, 25)
+    return [
+        {
+            "date": (first + timedelta(days=offset)).isoformat(),
+            "generation": kwh,
+            "consumption": round(kwh * 0.6, 2),
+            "export": round(kwh * 0.4, 2),
+            "revenue": round(kwh * 0.4 * 3.5, 2),
+        }
+        for offset, kwh in enumerate(GENERATION)
+    ]
+
+
+def test_insight_strings_match_baseline_wording(series):
+    assert build_insight_strings(compute_energy_analytics(series)) == [
+        "Average daily generation sits at 12.8 kWh over the observed window.",
+        "Latest reading logged on 09 Apr 2024 produced 12.0 kWh.",
+        "Export ratio is 40% of total generation, highlighting grid contribution potential.",
+        "Peak generation observed on 05 Apr 2024 at 30.0 kWh.",
+        "Generation is up 28.0% compared to the prior week.",
+        "Revenue averages ₹18 per day with a cumulative ₹287.",
+    ]
+
+
+def test_short_series_skips_week_over_week(series):
+    insights = build_insight_strings(compute_energy_analytics(series[:13]))
+    assert not any(line.startswith("Generation is") for line in insights)
+
+
+def test_empty_series_has_no_analytics():
+    assert compute_energy_analytics([]) is None
+    assert build_insight_strings(None) == []
+    assert build_chart_analytics(None) == {"trend_kwh_per_day": 0.0, "anomalies": [], "monthly": []}
+
+
+def test_chart_analytics_flags_spike_and_groups_months(series):
+    analytics = compute_energy_analytics(series)
+    chart = build_chart_analytics(analytics)
+
+    assert chart["anomalies"] == [{"date": "2024-04-05", "generation": 30.0, "zscore": 3.73}]
+    assert chart["trend_kwh_per_day"] > 0
+    assert [month["month"] for month in chart["monthly"]] == ["2024-03", "2024-04"]
+    assert chart["monthly"][0]["generation"] == sum(GENERATION[:7])
+    assert chart["monthly"][1]["generation"] == sum(GENERATION[7:])
+    assert analytics.rolling_7[6] == pytest.approx(sum(GENERATION[:7]) / 7)
+    assert analytics.rolling_7[0] == GENERATION[0]
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from app.utils.irradiance import (
+    HOURS_PER_YEAR,
+    TmyDataset,
+    TmyFormatError,
+    read_tmy_csv,
+    tmy_store,
+    tmy_version,
+    write_tmy_dataset,
+)
+from app.utils.subsidy_results import clear_result_cache, load_result_bundle, results_etag
+
+SUN_UTC_HOUR = 6  # PVGIS stamps hh:10 UTC; 06:10 UTC is 11:40 IST
+LEAP_DAY_TEMPERATURE = 99.0
+
+
+def write_pvgis_csv(path, latitude, longitude, *, year=2020, peak=900.0):
+    """A PVGIS-style TMY file with sun only at SUN_UTC_HOUR; ``year`` 2020 includes 29 Feb."""
+    lines = [
+        f"Latitude (decimal degrees): {latitude}",
+        f"Longitude (decimal degrees): {longitude}",
+        "Elevation (m): 200",
+        "time(UTC),T2m,RH,G(h),Gb(n),Gd(h),IR(h),WS10m,WD10m,SP",
+    ]
+    stamp = datetime(year, 1, 1)
+    while stamp.year == year:
+        leap_day = stamp.month == 2 and stamp.day == 29
+        temperature = LEAP_DAY_TEMPERATURE if leap_day else 20.0 + stamp.hour / 10
+        ghi = peak if stamp.hour == SUN_UTC_HOUR else 0.0
+        lines.append(f"{stamp:%Y%m%d:%H}10,{temperature:.1f},50,{ghi:.1f},{ghi / 2:.1f},0,300,1,0,100000")
+        stamp += timedelta(hours=1)
+    lines += ["", "T2m: 2-m air temperature (degree Celsius)"]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def stations(tmp_path):
+    return [
+        read_tmy_csv(write_pvgis_csv(tmp_path / "delhi.csv", 28.61, 77.21)),
+        read_tmy_csv(write_pvgis_csv(tmp_path / "jaipur.csv", 26.91, 75.79, year=2019, peak=1000.0)),
+    ]
+
+
+def test_read_pvgis_shifts_to_ist_and_drops_leap_day(stations):
+    delhi = stations[0]
+    assert (delhi.name, delhi.latitude, delhi.longitude) == ("delhi", 28.61, 77.21)
+    assert delhi.ghi.size == delhi.dni.size == delhi.temperature.size == HOURS_PER_YEAR
+
+    sunny_hours = np.flatnonzero(delhi.ghi)
+    assert sunny_hours.size == 365
+    assert set(sunny_hours % 24) == {SUN_UTC_HOUR + 5}
+    assert delhi.dni.max() == pytest.approx(450.0)
+    assert LEAP_DAY_TEMPERATURE not in delhi.temperature
+
+
+def test_read_rejects_short_files(tmp_path):
+    path = write_pvgis_csv(tmp_path / "short.csv", 28.61, 77.21)
+    lines = path.read_text(encoding="utf-8").splitlines()
+    path.write_text("\n".join(lines[:100]) + "\n", encoding="utf-8")
+    with pytest.raises(TmyFormatError):
+        read_tmy_csv(path)
+
+
+def test_write_dataset_round_trips_and_maps_nearest_cell(tmp_path, stations):
+    summary = write_tmy_dataset(stations, tmp_path / "tmy", max_distance_km=50.0)
+    dataset = TmyDataset(tmp_path / "tmy")
+
+    assert summary["cells"] == 2 and summary["grid_nodes"] > 0
+    assert dataset.nearest_cell(28.61, 77.21) == 0
+    assert dataset.nearest_cell(28.8, 77.0) == 0
+    assert dataset.nearest_cell(26.9, 75.8) == 1
+    assert dataset.nearest_cell(27.8, 76.5) is None  # between stations, beyond 50 km of both
+    assert dataset.nearest_cell(12.97, 77.59) is None  # off the grid entirely
+
+    series = dataset.series(1)
+    np.testing.assert_array_equal(series.ghi, stations[1].ghi)
+    np.testing.assert_allclose(series.temperature, stations[1].temperature, atol=0.05)
+
+
+def test_write_dataset_needs_stations(tmp_path):
+    with pytest.raises(TmyFormatError):
+        write_tmy_dataset([], tmp_path)
+
+
+def test_results_key_on_tmy_version(app, tmp_path, stations, monkeypatch):
+    journey = {"roof_area": 40.0, "monthly_bill": 2500.0, "state": "delhi", "roof_type": "flat"}
+    monkeypatch.setattr(tmy_store, "directory", tmp_path / "missing")
+    monkeypatch.setattr(tmy_store, "_dataset", None)
+    monkeypatch.setattr(tmy_store, "_loaded", False)
+    clear_result_cache()
+
+    assert tmy_version() == "none"
+    etag_without = results_etag(journey)
+    bundle_without = load_result_bundle(journey)
+
+    write_tmy_dataset(stations, tmp_path / "tmy")
+    monkeypatch.setattr(tmy_store, "directory", tmp_path / "tmy")
+    monkeypatch.setattr(tmy_store, "_loaded", False)
+
+    assert tmy_version() == TmyDataset(tmp_path / "tmy").version
+    assert results_etag(journey) != etag_without
+    assert load_result_bundle(journey) is not bundle_without
+    clear_result_cache()
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from app.utils.lifetime import LifetimeAssumptions, _irr, _npv, simulate_lifetime
+from app.utils.ml_scoring import calculate_financial_predictions
+
+SYSTEM = {
+    "system_size_kw": 3.0,
+    "annual_generation_kwh": 4_300.0,
+    "tariff_rate_inr_per_kwh": 7.5,
+    "gross_cost_inr": 195_000.0,
+    "subsidy_amount_inr": 78_000.0,
+}
+
+
+@pytest.fixture(scope="module")
+def projection():
+    return simulate_lifetime(**SYSTEM)
+
+
+def _npv_at(rate, projection):
+    return _npv(np.array([rate]), projection.upfront_cost_inr, projection.net_cash_flow_inr)[0]
+
+
+def test_npv_is_zero_at_the_irr(projection):
+    assert projection.irr is not None and 0 < projection.irr < 1
+    assert abs(_npv_at(projection.irr, projection)) < 1e-6 * projection.upfront_cost_inr
+    assert _npv_at(projection.irr - 0.01, projection) > 0 > _npv_at(projection.irr + 0.01, projection)
+
+
+def test_irr_matches_a_textbook_case():
+    # 100 upfront, 110 back after one year: 10 %.
+    assert _irr(100.0, np.array([110.0])) == pytest.approx(0.10)
+    # 1,000 upfront, 400 a year for 3 years: about 9.7 %.
+    assert _irr(1_000.0, np.full(3, 400.0)) == pytest.approx(0.09701, abs=1e-5)
+
+
+def test_no_irr_or_payback_when_cost_is_never_recovered():
+    projection = simulate_lifetime(**{**SYSTEM, "tariff_rate_inr_per_kwh": 0.5})
+    assert projection.cumulative_cash_flow_inr[-1] < 0
+    assert projection.irr is None
+    assert projection.payback_years is None
+    assert _irr(1_000.0, np.full(5, -10.0)) is None
+
+
+def test_payback_falls_in_the_crossover_year(projection):
+    cumulative = projection.cumulative_cash_flow_inr
+    crossover = int(np.flatnonzero(cumulative >= 0)[0])  # index of the first year in the black
+    assert crossover < projection.payback_years <= crossover + 1
+    # Straight-line interpolation inside that year lands on zero.
+    before = cumulative[crossover - 1] if crossover else -projection.upfront_cost_inr
+    fraction = projection.payback_years - crossover
+    assert before + fraction * projection.net_cash_flow_inr[crossover] == pytest.approx(0.0, abs=1e-6)
+
+
+def test_fully_subsidised_system_pays_back_immediately():
+    projection = simulate_lifetime(**{**SYSTEM, "subsidy_amount_inr": SYSTEM["gross_cost_inr"]})
+    assert projection.payback_years == 0.0
+    assert projection.irr is None
+
+
+def test_year_one_agrees_with_financial_predictions(projection):
+    predictions = calculate_financial_predictions(**SYSTEM)
+    assert projection.first_year == predictions
+    assert projection.savings_inr[0] == pytest.approx(predictions["annual_savings_inr"], abs=0.01)
+    assert projection.generation_kwh[0] == SYSTEM["annual_generation_kwh"]
+    assert projection.upfront_cost_inr == pytest.approx(predictions["net_cost_inr"])
+
+
+def test_inverter_replacement_and_horizon():
+    assumptions = LifetimeAssumptions(years=20, inverter_replacement_year=10, inverter_cost_per_kw=10_000.0)
+    projection = simulate_lifetime(**SYSTEM, assumptions=assumptions)
+
+    assert projection.years.tolist() == list(range(1, 21))
+    assert np.flatnonzero(projection.inverter_cost_inr).tolist() == [9]
+    assert projection.inverter_cost_inr[9] == pytest.approx(30_000.0)
+    assert projection.lifetime_savings_inr == pytest.approx(projection.net_cash_flow_inr.sum())
+    assert np.all(np.diff(projection.generation_kwh) < 0)
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import pytest
+
+from app.utils.catalog import current_catalog
+from app.utils.ml_scoring import calculate_subsidy_match_score, calculate_subsidy_match_scores
+
+PROFILES = [
+    dict(
+        user_system_size_kw=4.2,
+        user_annual_consumption_kwh=4_800.0,
+        user_state="maharashtra",
+        user_consumer_segment="residential",
+        gross_cost_inr=273_000.0,
+        subsidy_amount_inr=78_000.0,
+    ),
+    dict(
+        user_system_size_kw=1.0,
+        user_annual_consumption_kwh=None,
+        user_state="Gujarat",
+        user_consumer_segment="agricultural",
+        gross_cost_inr=65_000.0,
+        subsidy_amount_inr=0.0,
+    ),
+    dict(
+        user_system_size_kw=10.0,
+        user_annual_consumption_kwh=30_000.0,
+        user_state="",
+        user_consumer_segment="community",
+        gross_cost_inr=650_000.0,
+        subsidy_amount_inr=650_000.0,
+    ),
+]
+
+
+def _scheme_dict(scheme) -> dict:
+    return {
+        "match_score": scheme.match_score,
+        "benefit": scheme.benefit,
+        "states": scheme.states,
+        "coverage": scheme.coverage,
+        "consumer_segments": scheme.consumer_segments,
+    }
+
+
+@pytest.fixture
+def schemes(app):
+    return list(current_catalog().scheme_index.schemes)
+
+
+@pytest.mark.parametrize("profile", PROFILES)
+def test_batch_scores_equal_the_per_scheme_loop(schemes, profile):
+    ease = [0.7 if scheme.application_url else 0.5 for scheme in schemes]
+    expected = [
+        calculate_subsidy_match_score(scheme=_scheme_dict(scheme), ease_of_claim=scheme_ease, **profile)
+        for scheme, scheme_ease in zip(schemes, ease)
+    ]
+
+    assert calculate_subsidy_match_scores(schemes=schemes, ease_of_claim=ease, **profile).tolist() == expected
+    assert (
+        calculate_subsidy_match_scores(
+            schemes=[_scheme_dict(scheme) for scheme in schemes], ease_of_claim=ease, **profile
+        ).tolist()
+        == expected
+    )
+
+
+def test_batch_accepts_a_scalar_ease_and_no_schemes(schemes):
+    profile = PROFILES[0]
+    expected = [calculate_subsidy_match_score(scheme=_scheme_dict(scheme), **profile) for scheme in schemes]
+
+    assert calculate_subsidy_match_scores(schemes=schemes, **profile).tolist() == expected
+    assert calculate_subsidy_match_scores(schemes=[], **profile).size == 0
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import pytest
+
+from app.models import SubsidySubmission
+from app.utils.catalog import current_catalog
+
+JOURNEY = {
+    "roof_area": 40.0,
+    "monthly_bill": 2500.0,
+    "state": "maharashtra",
+    "consumer_segment": "residential",
+    "grid_connection": "grid",
+    "roof_type": "rcc",
+}
+
+
+@pytest.fixture()
+def journey_client(client):
+    with client.session_transaction() as session:
+        session["subsidy_journey"] = {**JOURNEY, "provider": next(iter(current_catalog().providers))}
+    return client
+
+
+def test_results_json_does_not_record_submissions(journey_client, user):
+    first = journey_client.get("/subsidy/results.json")
+    assert first.status_code == 200
+    assert first.headers["ETag"]
+
+    revalidated = journey_client.get("/subsidy/results.json", headers={"If-None-Match": first.headers["ETag"]})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["ETag"] == first.headers["ETag"]
+
+    assert SubsidySubmission.query.count() == 0
+    assert user.last_system_kw is None
+
+    assert journey_client.get("/subsidy/results").status_code == 200
+    assert SubsidySubmission.query.count() == 1
+    assert journey_client.get("/subsidy/results.json").headers["ETag"] == first.headers["ETag"]
+
+
+def test_results_json_without_journey_leaves_session_alone(client):
+    response = client.get("/subsidy/results.json")
+    assert response.status_code == 400
+    with client.session_transaction() as session:
+        assert "subsidy_journey" not in session
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import json
+from itertools import product
+
+import pytest
+
+from app.utils.catalog import current_catalog
+from app.utils.ml_scoring import calculate_financial_predictions
+from app.utils.scenarios import SWEEP_AXES, SWEEP_METRICS, sensitivity_sweep
+from app.utils.subsidy import estimate_subsidy
+
+INPUTS = {"system_kw": 3.2, "tariff": 7.5, "cost_per_kw": 65_000.0}
+YIELD_PER_KW = 1_450.0
+MAX_WHAT_IF_BYTES = 30_000
+
+
+@pytest.fixture(scope="module")
+def sweep():
+    return sensitivity_sweep(**INPUTS, annual_production_per_kw=YIELD_PER_KW)
+
+
+def _cell(payload, name, i, j, k):
+    """Decode one cell the way the results page does."""
+    metric = payload["metrics"][name]
+    position = dict(zip(payload["order"], (i, j, k)))
+    index = 0
+    for axis in metric["axes"]:
+        index = index * payload["shape"][payload["order"].index(axis)] + position[axis]
+    raw = metric["values"][index]
+    return None if raw is None else raw * metric["scale"]
+
+
+def test_sweep_layout(sweep):
+    assert sweep["order"] == list(SWEEP_AXES)
+    assert sweep["shape"] == [steps for steps, _low, _high in SWEEP_AXES.values()]
+    assert sweep["recommended"] == [steps // 2 for steps in sweep["shape"]]
+    for name, centre in INPUTS.items():
+        assert sweep["axes"][name][sweep["recommended"][sweep["order"].index(name)]] == centre
+
+    for name, (scale, axes) in SWEEP_METRICS.items():
+        metric = sweep["metrics"][name]
+        expected_size = 1
+        for axis in axes:
+            expected_size *= sweep["shape"][sweep["order"].index(axis)]
+        assert (metric["scale"], metric["axes"]) == (scale, list(axes))
+        assert len(metric["values"]) == expected_size
+        assert all(isinstance(value, int) for value in metric["values"])
+
+
+def test_sweep_cells_match_scalar_estimates(sweep):
+    sizes, tariffs, costs = sweep["shape"]
+    for i, j, k in product(range(0, sizes, 4), range(0, tariffs, 4), range(0, costs, 3)):
+        system_kw = sweep["axes"]["system_kw"][i]
+        tariff = sweep["axes"]["tariff"][j]
+        cost_per_kw = sweep["axes"]["cost_per_kw"][k]
+        estimate = estimate_subsidy(system_kw, cost_per_kw=cost_per_kw)
+        predictions = calculate_financial_predictions(
+            system_size_kw=system_kw,
+            annual_generation_kwh=system_kw * YIELD_PER_KW,
+            tariff_rate_inr_per_kwh=tariff,
+            gross_cost_inr=estimate.gross_cost,
+            subsidy_amount_inr=estimate.central + estimate.state_subsidy,
+        )
+        # Axis values are rounded to 2 dp in the payload; allow for that plus one step.
+        assert _cell(sweep, "net_cost_inr", i, j, k) == pytest.approx(estimate.net_cost, abs=100.0)
+        assert _cell(sweep, "annual_savings_inr", i, j, k) == pytest.approx(predictions["annual_savings_inr"], abs=10.0)
+        assert _cell(sweep, "payback_period_years", i, j, k) == pytest.approx(
+            predictions["payback_period_years"], abs=0.1
+        )
+
+
+def test_sweep_marks_undefined_payback_null():
+    payload = sensitivity_sweep(system_kw=3.0, tariff=0.0, cost_per_kw=60_000.0)
+    payback = payload["metrics"]["payback_period_years"]
+    assert set(payback["values"]) == {None}
+    assert payback["min"] is None and payback["max"] is None
+    assert None not in payload["metrics"]["net_cost_inr"]["values"]
+
+
+def test_what_if_needs_a_journey_and_leaves_session_alone(client):
+    response = client.get("/subsidy/results/what-if.json")
+    assert response.status_code == 400
+    with client.session_transaction() as session:
+        assert "subsidy_journey" not in session
+
+
+def test_what_if_payload_stays_small(client):
+    with client.session_transaction() as session:
+        session["subsidy_journey"] = {
+            "roof_area": 40.0,
+            "monthly_bill": 2500.0,
+            "state": "maharashtra",
+            "consumer_segment": "residential",
+            "grid_connection": "grid",
+            "roof_type": "rcc",
+            "provider": next(iter(current_catalog().providers)),
+        }
+    response = client.get("/subsidy/results/what-if.json")
+
+    assert response.status_code == 200
+    assert len(response.data) < MAX_WHAT_IF_BYTES
+    assert set(json.loads(response.data)["metrics"]) == set(SWEEP_METRICS)
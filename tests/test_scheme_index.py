@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from itertools import product
+
+import pytest
+
+from app.utils.catalog import current_catalog
+from app.utils.schemes import match_subsidy_schemes
+
+
+def _plain_filter(index, *, state, consumer_segment, owns_property, is_grid_connected, roof_area, annual_consumption):
+    """The pre-index loop: state schemes then national ones, each checked in turn."""
+    matches = []
+    for region in ((state or "").lower(), "national"):
+        region_bits = index.by_region.get(region, 0)
+        for position, scheme in enumerate(index.schemes):
+            if not region_bits >> position & 1:
+                continue
+            if scheme.consumer_segments and consumer_segment not in scheme.consumer_segments:
+                continue
+            if owns_property is not None:
+                if scheme.requires_ownership and not owns_property:
+                    continue
+                if scheme.requires_ownership is False and owns_property:
+                    continue
+            if scheme.requires_grid_connection is True and not is_grid_connected:
+                continue
+            if scheme.requires_grid_connection is False and is_grid_connected:
+                continue
+            if scheme.min_roof_area_sqm and roof_area and roof_area < scheme.min_roof_area_sqm:
+                continue
+            if scheme.max_monthly_consumption_units and annual_consumption:
+                if annual_consumption / 12.0 > scheme.max_monthly_consumption_units:
+                    continue
+            matches.append(scheme)
+    return matches
+
+
+@pytest.fixture
+def index(app):
+    return current_catalog().scheme_index
+
+
+def _roof_areas(index):
+    values = {None, 0.0}
+    for threshold in index.roof_thresholds:
+        values.update({threshold - 0.01, float(threshold), threshold + 0.01})
+    return sorted(values, key=lambda value: -1 if value is None else value)
+
+
+def _annual_consumptions(index):
+    values = {None, 0.0}
+    for cap in index.consumption_thresholds:
+        values.update({(cap - 0.01) * 12, cap * 12.0, (cap + 0.01) * 12})
+    return sorted(values, key=lambda value: -1 if value is None else value)
+
+
+def test_index_matches_plain_filter(index):
+    segments = sorted(index.by_segment) + ["industrial"]
+    states = sorted(index.by_region) + ["kerala", ""]
+    combinations = product(
+        states, segments, (True, False, None), (True, False), _roof_areas(index), _annual_consumptions(index)
+    )
+    for state, segment, owns, grid, roof, consumption in combinations:
+        kwargs = dict(
+            state=state,
+            consumer_segment=segment,
+            owns_property=owns,
+            is_grid_connected=grid,
+            roof_area=roof,
+            annual_consumption=consumption,
+        )
+        assert match_subsidy_schemes(**kwargs) == _plain_filter(index, **kwargs), kwargs
+
+
+def _inputs_admitting(index, scheme):
+    """Inputs that pass every check for ``scheme`` except the numeric limits."""
+    position = index.schemes.index(scheme)
+    return dict(
+        state=next(region for region, bits in index.by_region.items() if bits >> position & 1),
+        consumer_segment=(scheme.consumer_segments or ("residential",))[0],
+        owns_property=None,
+        is_grid_connected=scheme.requires_grid_connection is not False,
+    )
+
+
+def test_roof_minimum_is_inclusive(index):
+    limited = [scheme for scheme in index.schemes if scheme.min_roof_area_sqm]
+    assert limited
+    for scheme in limited:
+        inputs = _inputs_admitting(index, scheme)
+        assert scheme in match_subsidy_schemes(**inputs, roof_area=scheme.min_roof_area_sqm)
+        assert scheme not in match_subsidy_schemes(**inputs, roof_area=scheme.min_roof_area_sqm - 0.01)
+
+
+def test_consumption_cap_is_inclusive(index):
+    capped = [scheme for scheme in index.schemes if scheme.max_monthly_consumption_units]
+    assert capped
+    for scheme in capped:
+        inputs = _inputs_admitting(index, scheme)
+        cap = scheme.max_monthly_consumption_units
+        assert scheme in match_subsidy_schemes(**inputs, annual_consumption=cap * 12.0)
+        assert scheme not in match_subsidy_schemes(**inputs, annual_consumption=(cap + 0.01) * 12)
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import pytest
+from itsdangerous import Signer
+
+from app.utils.session_store import (
+    MemorySessionStore,
+    ServerSideSessionInterface,
+    SQLiteSessionStore,
+)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return MemorySessionStore()
+    return SQLiteSessionStore(tmp_path / "sessions.db")
+
+
+def test_save_load_and_delete(store):
+    store.save("abc", '{"a": 1}', ttl=60)
+    assert store.load("abc") == '{"a": 1}'
+
+    store.save("abc", '{"a": 2}', ttl=60)
+    assert store.load("abc") == '{"a": 2}'
+
+    store.delete("abc")
+    assert store.load("abc") is None
+    assert store.load("never-saved") is None
+
+
+def test_expired_sessions_are_not_loaded(store):
+    store.save("old", "{}", ttl=-1)
+    assert store.load("old") is None
+
+
+def test_purge_expired_counts_removed_rows(store):
+    store.save("live", "{}", ttl=60)  # the first save also runs the periodic sweep
+    store.save("old-1", "{}", ttl=-1)
+    store.save("old-2", "{}", ttl=-1)
+
+    assert store.purge_expired() == 2
+    assert store.purge_expired() == 0
+    assert store.load("live") == "{}"
+
+
+def _sid(app, client) -> str:
+    cookie = client.get_cookie(app.config["SESSION_COOKIE_NAME"])
+    assert cookie is not None
+    return Signer(app.secret_key, salt=ServerSideSessionInterface.salt).unsign(cookie.value).decode("ascii")
+
+
+def _dashboard_status(app, client) -> int:
+    # A fresh app context, so Flask-Login's per-context user cache is not reused.
+    with app.app_context():
+        return client.get("/dashboard/").status_code
+
+
+def test_tampered_session_id_is_rejected(app, client):
+    name = app.config["SESSION_COOKIE_NAME"]
+    assert _dashboard_status(app, client) == 200
+
+    signed = client.get_cookie(name).value
+    sid, signature = signed.rsplit(".", 1)
+    client.set_cookie(name, f"{sid[:-1]}{'A' if sid[-1] != 'A' else 'B'}.{signature}")
+    assert _dashboard_status(app, client) == 302
+
+    client.set_cookie(name, signed)
+    assert _dashboard_status(app, client) == 200
+
+
+def test_login_and_logout_rotate_the_session_id(app, user):
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session["planted"] = True
+    store = app.session_interface.store
+    planted = _sid(app, client)
+    assert store.load(planted) is not None
+
+    client.post("/auth/login", data={"email": user.email, "password": "correct-horse"})
+    signed_in = _sid(app, client)
+    assert signed_in != planted
+    assert store.load(planted) is None
+
+    client.post("/auth/logout")
+    assert _sid(app, client) not in (planted, signed_in)
+    assert store.load(signed_in) is None
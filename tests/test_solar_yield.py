@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from app.utils.irradiance import tmy_store
+from app.utils.solar_yield import (
+    STATE_COORDINATES,
+    STATE_REGIONS,
+    _simulate,
+    _sun_geometry,
+    annual_yield_per_kw,
+    simulate_yield,
+    site_yield,
+)
+from app.utils.subsidy import DEFAULT_ANNUAL_PRODUCTION_PER_KW
+
+# kWh/kWp/year the regional clearness was calibrated to (see REGION_CLEARNESS).
+EXPECTED_ANNUAL_YIELD = {
+    "sikkim": (1_110, 1_170),
+    "assam": (1_160, 1_220),
+    "meghalaya": (1_160, 1_220),
+    "kerala": (1_350, 1_410),
+    "rajasthan": (1_570, 1_610),
+    "gujarat": (1_570, 1_610),
+    "ladakh": (1_660, 1_720),
+}
+
+
+@pytest.fixture(autouse=True)
+def clear_sky_only(tmp_path, monkeypatch):
+    """Model every site from clear sky, whatever TMY data the checkout has."""
+    monkeypatch.setattr(tmy_store, "directory", tmp_path)
+    monkeypatch.setattr(tmy_store, "_dataset", None)
+    monkeypatch.setattr(tmy_store, "_loaded", False)
+    _simulate.cache_clear()
+    yield
+    _simulate.cache_clear()
+
+
+def test_no_output_at_night():
+    latitude, longitude = STATE_COORDINATES["delhi"]
+    profile = simulate_yield(latitude, longitude, 25)
+    _day, _solar_time, cos_zenith, _cos_incidence = _sun_geometry(
+        profile.latitude, profile.longitude, profile.tilt, profile.azimuth
+    )
+
+    assert np.all(profile.hourly_kwh_per_kw[cos_zenith <= 0] == 0)
+    midnight_to_four = np.arange(profile.hourly_kwh_per_kw.size) % 24 < 4
+    assert not profile.hourly_kwh_per_kw[midnight_to_four].any()
+    assert profile.monthly_kwh_per_kw.sum() == pytest.approx(profile.annual_kwh_per_kw)
+
+
+def test_south_facing_beats_north_facing():
+    latitude, longitude = STATE_COORDINATES["maharashtra"]
+    south = simulate_yield(latitude, longitude, 20, azimuth=180)
+    north = simulate_yield(latitude, longitude, 20, azimuth=0)
+    assert south.annual_kwh_per_kw > north.annual_kwh_per_kw * 1.1
+
+
+@pytest.mark.parametrize("state", [None, "", "atlantis"])
+def test_unknown_state_uses_national_default(state):
+    assert site_yield(state) is None
+    assert annual_yield_per_kw(state) == DEFAULT_ANNUAL_PRODUCTION_PER_KW
+
+
+def test_profiles_are_memoised_per_rounded_site():
+    first = simulate_yield(28.61, 77.21, 24.6)
+    before = _simulate.cache_info()
+    second = simulate_yield(28.64, 77.19, 25.4)
+    after = _simulate.cache_info()
+
+    assert second is first
+    assert (after.hits, after.misses) == (before.hits + 1, before.misses)
+    assert not first.hourly_kwh_per_kw.flags.writeable
+
+
+@pytest.mark.parametrize("state", sorted(EXPECTED_ANNUAL_YIELD))
+def test_state_yields_stay_in_calibrated_range(state):
+    low, high = EXPECTED_ANNUAL_YIELD[state]
+    assert low <= annual_yield_per_kw(state) <= high
+
+
+def test_every_state_has_a_plausible_yield():
+    yields = {state: annual_yield_per_kw(state) for state in STATE_COORDINATES}
+    assert set(STATE_COORDINATES) == set(STATE_REGIONS)
+    assert all(1_100 <= value <= 1_720 for value in yields.values()), yields
+    assert max(yields, key=yields.get) == "ladakh"
+    assert min(yields, key=yields.get) == "sikkim"
@@ -0,0 +1,86 @@
+import math
+
+import numpy as np
+import pytest
+
+from app.utils.subsidy import (
+    DEFAULT_PROVIDER_TARIFF,
+    estimate_monthly_units_from_bill,
+    estimate_monthly_units_from_bills,
+)
+from app.utils.tariffs import (
+    bill_for_units,
+    compile_slab_tariff,
+    flat_tariff,
+    units_for_bill,
+    units_for_bills,
+)
+
+FIXED_CHARGE = 120.0
+
+
+@pytest.fixture
+def tariff():
+    return compile_slab_tariff([(100, 3.0), (300, 4.5), (500, 6.0), (None, 7.5)], fixed_charge=FIXED_CHARGE)
+
+
+def _boundary_bills(tariff):
+    bills = [FIXED_CHARGE + cost for cost in tariff.cost_starts]
+    bills += [bill + delta for bill in bills for delta in (-0.01, 0.01)]
+    return sorted(bill for bill in bills if bill > FIXED_CHARGE) + [5_000.0, 12_345.67]
+
+
+def test_round_trip_across_slab_boundaries(tariff):
+    for bill in _boundary_bills(tariff):
+        assert bill_for_units(tariff, units_for_bill(tariff, bill)) == pytest.approx(bill)
+
+
+def test_boundary_bills_land_on_slab_starts(tariff):
+    for units, cost in zip(tariff.unit_starts, tariff.cost_starts):
+        assert units_for_bill(tariff, FIXED_CHARGE + cost) == pytest.approx(units)
+
+
+@pytest.mark.parametrize("bill", [0.0, 50.0, FIXED_CHARGE])
+def test_bill_within_fixed_charge_has_no_units(tariff, bill):
+    assert units_for_bill(tariff, bill) == 0.0
+    assert units_for_bills(tariff, np.array([bill]))[0] == 0.0
+
+
+def test_scalar_and_vector_inversion_agree(tariff):
+    bills = np.array([0.0, FIXED_CHARGE] + _boundary_bills(tariff))
+    expected = [units_for_bill(tariff, float(bill)) for bill in bills]
+    np.testing.assert_allclose(units_for_bills(tariff, bills), expected)
+
+
+def test_flat_tariff_divides_by_rate():
+    tariff = flat_tariff(8.0)
+    assert units_for_bill(tariff, 2_000.0) == pytest.approx(250.0)
+    assert bill_for_units(tariff, 250.0) == pytest.approx(2_000.0)
+
+
+def test_compile_rejects_bad_slabs():
+    with pytest.raises(ValueError):
+        compile_slab_tariff([])
+    with pytest.raises(ValueError):
+        compile_slab_tariff([(100, 3.0), (100, 4.0), (None, 5.0)])
+    with pytest.raises(ValueError):
+        compile_slab_tariff([(100, 3.0), (200, 4.0)])
+
+
+def test_unknown_provider_falls_back_to_flat_tariff(app):
+    assert estimate_monthly_units_from_bill(1_600.0, "no-such-provider") == pytest.approx(
+        1_600.0 / DEFAULT_PROVIDER_TARIFF
+    )
+    assert estimate_monthly_units_from_bill(None, "no-such-provider") is None
+    assert estimate_monthly_units_from_bill(0.0, "no-such-provider") is None
+
+
+def test_batch_estimate_marks_missing_bills_nan(app):
+    bills = np.array([0.0, 1_600.0, -5.0, np.nan, 800.0])
+    units = estimate_monthly_units_from_bills(bills, ["no-such-provider"] * bills.size)
+
+    assert math.isnan(units[0]) and math.isnan(units[2]) and math.isnan(units[3])
+    np.testing.assert_allclose(units[[1, 4]], [1_600.0 / DEFAULT_PROVIDER_TARIFF, 800.0 / DEFAULT_PROVIDER_TARIFF])
+    for bill, unit in zip(bills[[0, 1, 2, 4]], units[[0, 1, 2, 4]]):
+        scalar = estimate_monthly_units_from_bill(float(bill), "no-such-provider")
+        assert (scalar is None and math.isnan(unit)) or scalar == pytest.approx(unit)
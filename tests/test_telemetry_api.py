@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+import pytest
+
+from app.extensions import db
+from app.models import EnergyLog
+from app.utils.energy_rollup import find_rollup_drift, load_rollup_totals
+from app.utils.telemetry import issue_api_token
+
+
+@pytest.fixture()
+def token(app, user):
+    _record, token = issue_api_token(user.id, "roof logger")
+    db.session.commit()
+    return token
+
+
+def _post(client, readings, token=None):
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    return client.post("/api/v1/telemetry", json={"readings": readings}, headers=headers)
+
+
+def _reading(key: str, day: str = "2024-02-01", kwh: float = 4.2, **extra) -> dict:
+    return {"idempotency_key": key, "date": day, "kwh": kwh, **extra}
+
+
+def test_missing_or_unknown_token_is_rejected(app, token):
+    client = app.test_client()
+
+    missing = _post(client, [_reading("a")])
+    unknown = _post(client, [_reading("a")], token="slr_not-a-real-token")
+
+    assert missing.status_code == 401
+    assert missing.headers["WWW-Authenticate"].startswith("Bearer")
+    assert unknown.status_code == 401
+    assert EnergyLog.query.count() == 0
+
+
+def test_revoked_token_is_rejected(app, user, token):
+    for record in user.api_tokens:
+        record.revoked_at = datetime.utcnow()
+    db.session.commit()
+
+    assert _post(app.test_client(), [_reading("a")], token=token).status_code == 401
+
+
+def test_counts_accepted_duplicate_and_rejected_readings(app, user, token):
+    response = _post(
+        app.test_client(),
+        [
+            _reading("a"),
+            _reading("b", kwh=1.3, entry_type="consumption"),
+            _reading("a"),  # repeated within the batch
+            _reading("c", day="2024-02-01garbage"),
+            _reading("", kwh=2.0),
+            _reading("d", kwh="lots"),
+        ],
+        token=token,
+    )
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["accepted"] == 2
+    assert body["duplicates"] == 1
+    assert [item["index"] for item in body["rejected"]] == [3, 4, 5]
+    assert body["rejected"][0]["errors"] == ["date must be YYYY-MM-DD or an ISO 8601 datetime"]
+    assert EnergyLog.query.filter_by(user_id=user.id).count() == 2
+
+
+def test_replaying_a_batch_is_idempotent(app, user, token):
+    client = app.test_client()
+    readings = [_reading(f"k{n}", day=f"2024-02-{n + 1:02d}") for n in range(5)]
+
+    first = _post(client, readings, token=token).get_json()
+    replay = _post(client, readings, token=token).get_json()
+
+    assert (first["accepted"], first["duplicates"]) == (5, 0)
+    assert (replay["accepted"], replay["duplicates"]) == (0, 5)
+    assert EnergyLog.query.filter_by(user_id=user.id).count() == 5
+
+
+def test_all_rejected_batch_returns_422(app, token):
+    response = _post(app.test_client(), [_reading("a", kwh=0)], token=token)
+
+    assert response.status_code == 422
+    assert response.get_json()["accepted"] == 0
+
+
+def test_ingest_updates_the_daily_rollup(app, user, token):
+    _post(
+        app.test_client(),
+        [
+            _reading("g1", kwh=4.0),
+            _reading("g2", kwh=2.5, panel_id="east"),
+            _reading("x1", kwh=1.5, entry_type="export", revenue=6.75),
+            _reading("g3", day="2024-02-02T09:30:00+05:30", kwh=3.0),
+        ],
+        token=token,
+    )
+
+    totals = load_rollup_totals(user.id)
+    assert totals["2024-02-01"] == {"generation": 6.5, "consumption": 0.0, "export": 1.5, "revenue": 6.75}
+    assert totals["2024-02-02"]["generation"] == 3.0
+    assert find_rollup_drift(user.id) == []
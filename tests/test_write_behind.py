@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import threading
+from datetime import date, datetime
+
+import pytest
+
+from app.extensions import db
+from app.models import EnergyDailyRollup, EnergyLog
+from app.utils.energy_rollup import find_rollup_drift
+from app.utils.write_behind import EnergyWriteQueue, WriteTicket
+
+
+@pytest.fixture()
+def write_queue(app, monkeypatch):
+    # The suite runs with write-behind off; build a live queue outside app.testing.
+    monkeypatch.setitem(app.config, "ENERGY_WRITE_BEHIND", True)
+    monkeypatch.setitem(app.config, "TESTING", False)
+    queue = EnergyWriteQueue(app)
+    monkeypatch.setitem(app.config, "TESTING", True)
+    queue.flush_interval = 0.05
+    queue.wait_timeout = 0.2
+    assert queue.enabled
+    yield queue
+    queue.shutdown()
+
+
+def _row(user_id: int, day: int = 1, kwh: float = 1.5) -> dict:
+    return {
+        "user_id": user_id,
+        "entry_type": "generation",
+        "kwh": kwh,
+        "date": date(2024, 3, day),
+        "created_at": datetime.utcnow(),
+    }
+
+
+def _log_count() -> int:
+    db.session.rollback()  # end the test session's read transaction
+    return EnergyLog.query.count()
+
+
+def _stall(monkeypatch, queue: EnergyWriteQueue, attribute: str) -> threading.Event:
+    """Block the flusher thread in ``attribute`` until the returned event is set."""
+    gate = threading.Event()
+    original = getattr(queue, attribute)
+
+    def stalled(*args):
+        if threading.current_thread().name == "energy-write-behind":
+            gate.wait(5)
+        return original(*args)
+
+    monkeypatch.setattr(queue, attribute, stalled)
+    return gate
+
+
+def test_concurrent_submits_keep_rows_and_rollup_consistent(write_queue, user):
+    user_id = user.id
+
+    def submitter(n: int) -> None:
+        for i in range(25):
+            write_queue.submit([_row(user_id, day=1 + (n + i) % 5)] * 2)
+
+    threads = [threading.Thread(target=submitter, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    write_queue.flush(timeout=5)
+
+    assert _log_count() == 8 * 25 * 2
+    assert find_rollup_drift(user_id) == []
+    generation = sum(float(rollup.generation) for rollup in EnergyDailyRollup.query.filter_by(user_id=user_id))
+    assert generation == pytest.approx(8 * 25 * 2 * 1.5)
+
+
+def test_waiting_submit_returns_after_commit(write_queue, user):
+    write_queue.flush_interval = 5.0  # a waiting ticket must not linger for this
+
+    ticket = write_queue.submit([_row(user.id)], wait=True)
+
+    assert ticket.done and ticket.error is None
+    assert _log_count() == 1
+
+
+def test_stalled_flusher_falls_back_to_an_inline_write(write_queue, user, monkeypatch):
+    gate = _stall(monkeypatch, write_queue, "_write_batch")
+    write_queue.submit([_row(user.id)])  # the flusher takes this and stalls
+
+    ticket = write_queue.submit([_row(user.id, day=2)], wait=True)
+
+    assert ticket.done and ticket._cancelled
+    assert _log_count() == 1  # written inline; the stalled batch is still pending
+    gate.set()
+    write_queue.flush(timeout=5)
+    assert _log_count() == 2  # the cancelled ticket is not written twice
+    assert find_rollup_drift(user.id) == []
+
+
+def test_claimed_ticket_times_out_instead_of_hanging(write_queue, user, monkeypatch):
+    gate = _stall(monkeypatch, write_queue, "_insert")
+
+    with pytest.raises(TimeoutError):
+        write_queue.submit([_row(user.id)], wait=True)
+
+    gate.set()
+    write_queue.flush(timeout=5)
+    assert _log_count() == 1
+
+
+def test_ticket_cannot_be_cancelled_once_claimed():
+    ticket = WriteTicket([])
+    assert ticket._claim()
+    assert not ticket._cancel()
+
+    cancelled = WriteTicket([])
+    assert cancelled._cancel()
+    assert not cancelled._claim()
+
+
+def test_shutdown_writes_everything_queued(write_queue, user):
+    write_queue.flush_interval = 5.0
+    for day in range(1, 11):
+        write_queue.submit([_row(user.id, day=day)])
+
+    write_queue.shutdown()
+
+    assert write_queue._thread is None
+    assert _log_count() == 10
+    assert find_rollup_drift(user.id) == []